@@ -0,0 +1,138 @@
+"""Compare index sizes and query latency before and after archiving old school years.
+
+Usage (from the frontend folder):
+    python benchmarks/archive_benchmark.py --rows-per-year 100000 --years 5
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data.api.fake_client import FakeApiClient  # noqa: E402
+from data.fake.fake_data import initialize_fake_database  # noqa: E402
+
+
+def _inflate(db_path: Path, years: int, rows_per_year: int) -> int:
+    """Add `years` closed school years with `rows_per_year` payments each"""
+    rng = random.Random(42)
+    with sqlite3.connect(db_path) as connection:
+        cursor = connection.cursor()
+        cursor.execute("UPDATE school_years SET is_active = 0")
+        first_year = date.today().year - years
+        for offset in range(years + 1):
+            start = date(first_year + offset, 9, 1)
+            cursor.execute(
+                "INSERT INTO school_years (name, start_date, end_date, is_active) VALUES (?, ?, ?, ?)",
+                (
+                    f"{start.year}-{start.year + 1}",
+                    start.isoformat(),
+                    (start + timedelta(days=365)).isoformat(),
+                    int(offset == years),
+                ),
+            )
+            year_id = cursor.lastrowid
+            count = rows_per_year if offset < years else rows_per_year // 10
+            payments = []
+            for _ in range(count):
+                day = (start + timedelta(days=rng.randint(0, 300))).isoformat()
+                payments.append((rng.randint(1, 24), year_id, 1, 250.0, day, 1))
+            cursor.executemany(
+                "INSERT INTO payments (student_id, school_year_id, payment_type_id, amount, payment_date, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+                payments,
+            )
+            cursor.executemany(
+                "INSERT INTO cash_register (school_year_id, date, type, description, amount, user_id) VALUES (?, ?, 'Entrée', 'Paiement', ?, ?)",
+                [(p[1], p[4], p[3], p[5]) for p in payments],
+            )
+        connection.commit()
+        return cursor.execute(
+            "SELECT id_school_year FROM school_years WHERE is_active = 1"
+        ).fetchone()[0]
+
+
+def _sizes(db_path: Path) -> dict:
+    """Main database file size and the size of the year indexes"""
+    with sqlite3.connect(db_path) as connection:
+        try:
+            rows = connection.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name LIKE 'idx_%' GROUP BY name"
+            ).fetchall()
+            index_bytes = sum(size for _, size in rows)
+        except sqlite3.OperationalError:
+            index_bytes = -1  # SQLite compilé sans dbstat
+    return {"file_bytes": db_path.stat().st_size, "index_bytes": index_bytes}
+
+
+async def _latency(client: FakeApiClient, school_year_id: int, repeat: int) -> dict:
+    timings = {}
+    for label, call in (
+        (
+            "list_payments(current)",
+            lambda: client.list_payments(school_year_id=school_year_id),
+        ),
+        (
+            "list_cash_register(current)",
+            lambda: client.list_cash_register_entries(school_year_id=school_year_id),
+        ),
+        (
+            "cash_statistics(current)",
+            lambda: client.get_cash_register_statistics(school_year_id),
+        ),
+        ("dashboard_summary", client.get_dashboard_summary),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await call()
+        timings[label] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+async def main(rows_per_year: int, years: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        initialize_fake_database(db_path, seed=1)
+        active_year_id = _inflate(db_path, years, rows_per_year)
+        client = FakeApiClient(db_path=db_path, auto_seed=False)
+
+        before_sizes = _sizes(db_path)
+        before = await _latency(client, active_year_id, repeat)
+
+        closed_years = [
+            year.id_school_year
+            for year in await client.list_school_years()
+            if not year.is_active
+        ]
+        start = time.perf_counter()
+        for year_id in closed_years:
+            await client.archive_school_year(year_id)
+        archive_seconds = time.perf_counter() - start
+
+        after_sizes = _sizes(db_path)
+        after = await _latency(client, active_year_id, repeat)
+        historical = len(await client.list_payments())
+        await client.close()
+
+    print(f"Archived {len(closed_years)} school years in {archive_seconds:.2f}s")
+    print(f"Historical payments still readable through the UNION view: {historical}")
+    print(f"{'metric':32} {'before':>12} {'after':>12}")
+    for key in before_sizes:
+        print(f"{key:32} {before_sizes[key]:>12} {after_sizes[key]:>12}")
+    for key in before:
+        print(f"{key + ' (ms)':32} {before[key]:>12.2f} {after[key]:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows-per-year", type=int, default=50_000)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows_per_year, args.years, args.repeat))
@@ -0,0 +1,128 @@
+"""Startup time and resident memory: eager screen construction vs ScreenRegistry.
+
+Each strategy runs in a fresh interpreter so the RSS figures are comparable.
+The build time of every screen is listed too. The screens need the flet
+version pinned in pyproject.toml: with flet 0.80+ the Students, Payments and
+Admin screens fail to build (Dropdown `on_change` became `on_select`) and are
+reported as errors instead of being timed.
+
+Usage (from the frontend folder):
+    python benchmarks/screens_benchmark.py
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+SCREEN_NAMES = ["dashboard", "students", "payments", "checkout", "reports", "admin"]
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux), peak RSS elsewhere"""
+    try:
+        with open("/proc/self/statm") as statm:
+            import os
+
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def _run(strategy: str) -> dict:
+    # Les imports font partie du coût de démarrage commun aux deux stratégies
+    from core import AppState
+    from screens import (
+        AdminScreen,
+        CheckoutScreen,
+        DashboardScreen,
+        PaymentScreen,
+        ReportsScreen,
+        ScreenRegistry,
+        StudentsScreen,
+    )
+
+    app_state = AppState()
+    registry = ScreenRegistry(max_alive=3, pinned=("dashboard",))
+    factories = {
+        "dashboard": lambda: DashboardScreen(appState=app_state, page=None),
+        "students": lambda: StudentsScreen(app_state=app_state, page=None),
+        "payments": lambda: PaymentScreen(app_state=app_state, page=None),
+        "checkout": lambda: CheckoutScreen(appState=app_state, page=None),
+        "reports": lambda: ReportsScreen(app_state=app_state, page=None),
+        "admin": lambda: AdminScreen(app_state=app_state, page=None),
+    }
+    for name, factory in factories.items():
+        registry.register(name, factory)
+
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    errors = {}
+    screen_ms = {}
+    start = time.perf_counter()
+    names = SCREEN_NAMES if strategy == "eager" else ["dashboard"]
+    kept = []
+    for name in names:
+        screen_start = time.perf_counter()
+        try:
+            # eager: tous les écrans restent référencés comme dans l'ancien MainAppp
+            kept.append(
+                factories[name]() if strategy == "eager" else registry.get(name)
+            )
+            screen_ms[name] = (time.perf_counter() - screen_start) * 1000
+        except Exception as e:
+            errors[name] = repr(e)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await app_state.api_client.close()
+    return {
+        "strategy": strategy,
+        "startup_ms": elapsed_ms,
+        "python_alloc_kb": peak / 1024,
+        "rss_delta_kb": (_rss_bytes() - rss_before) / 1024,
+        "screens_built": len(kept),
+        "screen_ms": screen_ms,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    results = []
+    for strategy in ("eager", "lazy"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", strategy],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(
+        f"{'strategy':10} {'screens':>8} {'startup ms':>12} {'alloc KB':>10} {'RSS KB':>10}"
+    )
+    for result in results:
+        print(
+            f"{result['strategy']:10} {result['screens_built']:>8} "
+            f"{result['startup_ms']:>12.2f} {result['python_alloc_kb']:>10.0f} "
+            f"{result['rss_delta_kb']:>10.0f}"
+        )
+        for name, elapsed_ms in result["screen_ms"].items():
+            print(f"  {name:10} {elapsed_ms:>8.2f} ms")
+        for name, error in result["errors"].items():
+            print(f"  {result['strategy']}: {name} failed: {error}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(asyncio.run(_run(sys.argv[2]))))
+    else:
+        main()
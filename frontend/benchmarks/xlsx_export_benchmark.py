@@ -0,0 +1,129 @@
+"""Compare the former JSON dump with the streaming XLSX export on payment rows.
+
+"before" materialises every payment as a dict and dumps it with indent=2
+(the previous export_to_excel placeholder); "after" streams the rows from a
+SQLite cursor into an .xlsx workbook through exports.XlsxWriter.
+
+Usage (from the frontend folder):
+    python benchmarks/xlsx_export_benchmark.py --rows 500000
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from exports import ExportColumn, XlsxWriter  # noqa: E402
+
+COLUMNS = [
+    ExportColumn("id_payment", "ID", ExportColumn.INTEGER),
+    ExportColumn("student_name", "Élève", ExportColumn.TEXT),
+    ExportColumn("classroom", "Classe", ExportColumn.TEXT),
+    ExportColumn("fee", "Frais", ExportColumn.TEXT),
+    ExportColumn("payment_date", "Date", ExportColumn.DATE),
+    ExportColumn("amount", "Montant", ExportColumn.AMOUNT),
+]
+
+QUERY = "SELECT id_payment, student_name, classroom, fee, payment_date, amount FROM payments ORDER BY id_payment"
+
+
+def _build_database(db_path: Path, rows: int) -> None:
+    rng = random.Random(42)
+    start = date(2024, 9, 1)
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE payments (id_payment INTEGER PRIMARY KEY, student_name TEXT, classroom TEXT, fee TEXT, payment_date TEXT, amount REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO payments (student_name, classroom, fee, payment_date, amount) VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    f"Élève {rng.randint(1, 5000)}",
+                    f"{rng.randint(1, 6)}ème {rng.choice('ABC')}",
+                    rng.choice(("Minerval", "Inscription", "Transport", "Cantine")),
+                    (start + timedelta(days=rng.randint(0, 300))).isoformat(),
+                    float(rng.randint(5, 500) * 1000),
+                )
+                for _ in range(rows)
+            ),
+        )
+        connection.commit()
+
+
+def _cursor_rows(db_path: Path):
+    """Rows as dicts, fetched in batches (never the whole table in memory)"""
+    with sqlite3.connect(db_path) as connection:
+        connection.row_factory = sqlite3.Row
+        cursor = connection.execute(QUERY)
+        while True:
+            batch = cursor.fetchmany(5000)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(row)
+
+
+def _before(db_path: Path, target: Path) -> int:
+    with sqlite3.connect(db_path) as connection:
+        connection.row_factory = sqlite3.Row
+        data = [dict(row) for row in connection.execute(QUERY)]
+    with open(target, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+    return len(data)
+
+
+def _after(db_path: Path, target: Path) -> int:
+    return XlsxWriter(target, COLUMNS, sheet_name="Paiements").write(
+        _cursor_rows(db_path)
+    )
+
+
+def _measure(function, db_path: Path, target: Path, trace_memory: bool) -> dict:
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    rows = function(db_path, target)
+    seconds = time.perf_counter() - start
+    peak = -1
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "peak_mb": peak / 1024 / 1024 if peak >= 0 else float("nan"),
+        "file_mb": target.stat().st_size / 1024 / 1024,
+    }
+
+
+def main(rows: int, trace_memory: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        _build_database(db_path, rows)
+        before = _measure(_before, db_path, Path(tmp) / "payments.json", trace_memory)
+        after = _measure(_after, db_path, Path(tmp) / "payments.xlsx", trace_memory)
+
+    print(f"{rows} payment rows")
+    print(f"{'metric':20} {'before (json)':>14} {'after (xlsx)':>14}")
+    for key in ("rows", "seconds", "peak_mb", "file_mb"):
+        print(f"{key:20} {before[key]:>14.2f} {after[key]:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip tracemalloc (faster, no peak memory column)",
+    )
+    args = parser.parse_args()
+    main(args.rows, not args.no_memory)
@@ -0,0 +1,17 @@
+"""Compile the langs/*.json catalogs and report missing keys.
+
+Run before `flet build` so missing translations are caught at build time:
+    python compile_translations.py
+"""
+
+import sys
+from pathlib import Path
+
+# core/i18n.py only needs the standard library; importing it through the
+# `core` package would pull in flet and the database client
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "core"))
+
+from i18n import check_catalogs  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(check_catalogs())
@@ -1,5 +1,51 @@
 from .appstate import AppState
 from .config import Config
 from .constants import Constants
+from .settings_store import SettingsStore
+from .reference_cache import ReferenceCache
+from .indexed_repository import IndexedRepository
+from .data_store import DataStore
+from .screen_loader import ScreenLoader
+from .prefetcher import Prefetcher
+from .report_cache import ReportCache, cached_report, normalize_params
+from .report_jobs import (
+    ProgressCallback,
+    ReportJob,
+    ReportJobCancelled,
+    ReportJobManager,
+    track_rows,
+)
+from .financial_comparison import compare_school_years, comparison_rows
+from .report_scheduler import CronSchedule, ReportScheduler, ScheduledReport
+from .warm_start import WarmStartSnapshot
+from .i18n import CatalogStore, TranslatedText, TranslationCatalog, Translator
 
-__all__ = ["AppState", "Config", "Constants"]
+__all__ = [
+    "AppState",
+    "Config",
+    "Constants",
+    "SettingsStore",
+    "ReferenceCache",
+    "IndexedRepository",
+    "DataStore",
+    "ScreenLoader",
+    "Prefetcher",
+    "ReportCache",
+    "cached_report",
+    "normalize_params",
+    "ProgressCallback",
+    "ReportJob",
+    "ReportJobCancelled",
+    "ReportJobManager",
+    "track_rows",
+    "compare_school_years",
+    "comparison_rows",
+    "CronSchedule",
+    "ReportScheduler",
+    "ScheduledReport",
+    "WarmStartSnapshot",
+    "CatalogStore",
+    "TranslatedText",
+    "TranslationCatalog",
+    "Translator",
+]
@@ -1,13 +1,23 @@
 """État global de l'application"""
 
 import asyncio
-import pathlib
 
 import flet as ft
 from data.api.fake_client import FakeApiClient
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Iterable
 from models.user_model import UserModel
+from .config import Config
 from .constants import Constants
+from .settings_store import SettingsStore
+from .reference_cache import ReferenceCache
+from .indexed_repository import IndexedRepository
+from .data_store import DataStore
+from .screen_loader import ScreenLoader
+from .report_jobs import ReportJobManager
+from .report_cache import REPORT_CACHE_DIR, ReportCache
+from .report_scheduler import ReportScheduler
+from .warm_start import WarmStartSnapshot
+from .i18n import CatalogStore, TranslationCatalog, Translator
 
 
 class AppState:
@@ -15,6 +25,33 @@ class AppState:
 
     def __init__(self, show_notifications: Callable | Awaitable | None = None):
         self.api_client: FakeApiClient = FakeApiClient()
+        self.settings: SettingsStore = SettingsStore(self.api_client)
+        self.reference_data: ReferenceCache = ReferenceCache(self.api_client)
+        # Index des listes chargées, partagés par les écrans (voir IndexedRepository)
+        self.repository: IndexedRepository = IndexedRepository()
+        # Élèves, classes et inscriptions partagés par tous les écrans
+        self.store: DataStore = DataStore(self)
+        # Une tâche de chargement suivie par écran (annulée à la navigation)
+        self.loader: ScreenLoader = ScreenLoader()
+        # Dernier tableau de bord et listes de référence, pour un démarrage instantané
+        self.warm_start: WarmStartSnapshot = WarmStartSnapshot(self)
+        # Rapports générés en arrière-plan et derniers résultats
+        self.report_jobs: ReportJobManager = ReportJobManager(
+            Config.REPORT_JOBS_MAX_WORKERS, Config.REPORT_JOBS_RECENT
+        )
+        # Rapports calculés, clés : type, filtres et versions des tables lues
+        self.report_cache: ReportCache = ReportCache(
+            self.api_client,
+            Config.REPORT_CACHE_SIZE,
+            REPORT_CACHE_DIR if Config.REPORT_CACHE_ON_DISK else None,
+            Config.REPORT_CACHE_DISK_MAX_FILES,
+        )
+        # Rapports planifiés écrits sur disque (démarré par MainAppp)
+        self.report_scheduler: ReportScheduler = ReportScheduler(
+            Config.SCHEDULED_REPORTS_DIR,
+            retention_days=Config.SCHEDULED_REPORTS_RETENTION_DAYS,
+            catch_up_hours=Config.SCHEDULED_REPORTS_CATCH_UP_HOURS,
+        )
         self.current_user: UserModel | None = None
         self.current_user_role: str | None = None
         self.current_page: str = "login"
@@ -24,18 +61,38 @@ class AppState:
         self.current_school_year_id: int | None = None
         self.current_school_year_name: str | None = None
         self.current_language: str = "fr"
-        self.translations: dict = self.load_translations(self.current_language)
+        # Seule la langue par défaut est chargée au démarrage
+        self.catalogs: CatalogStore = CatalogStore()
+        self.translator: Translator = Translator()
+        self.translator.catalog.replace(self.load_translations(self.current_language))
+        # Même objet que le catalogue : mis à jour sur place au changement de langue
+        self.translations: TranslationCatalog = self.translator.catalog
         self.is_logged_in: bool = False
 
     def is_authenticated(self):
         """Vérifier si l'utilisateur est connecté"""
         return self.current_user is not None
 
-    def close_connexion(self):
+    def end_session(self):
+        """Oublier tout ce qui appartient à l'utilisateur (déconnexion)
+
+        Le client API reste ouvert : la connexion suivante le réutilise.
+        """
         self.current_user = None
         self.current_user_role = None
         self.current_school_year_name = None
         self.current_school_year_id = None
+        self.settings.invalidate()
+        self.reference_data.invalidate()
+        self.repository.clear()
+        self.store.clear()
+        self.loader.cancel_all()
+        self.report_jobs.clear()
+        self.report_cache.clear()
+        self.report_scheduler.stop()
+
+    def close_connexion(self):
+        self.end_session()
         try:
             asyncio.create_task(self.api_client.close())
         except Exception as e:
@@ -50,28 +107,68 @@ class AppState:
             self.current_user_role = role.role_name if role else None
         return self.current_user_role
 
+    async def get_active_school_year_id(self) -> int | None:
+        """Identifiant de l'année scolaire active (mis en cache)"""
+        school_year = await self.reference_data.get_active_school_year()
+        self.current_school_year_id = (
+            school_year.id_school_year if school_year else None
+        )
+        self.current_school_year_name = school_year.name if school_year else None
+        return self.current_school_year_id
+
+    async def resolve_school_year_id(self, school_year_id: int | None = None):
+        """Année scolaire à utiliser pour filtrer les listes.
+
+        Par défaut `current_school_year_id` (l'année active si non définie).
+        """
+        if school_year_id is not None:
+            return school_year_id
+        if self.current_school_year_id is None:
+            return await self.get_active_school_year_id()
+        return self.current_school_year_id
+
+    def invalidate_reference_data(self, *keys: str) -> None:
+        """Invalider les données de référence après une modification admin"""
+        self.reference_data.invalidate(*keys)
+        if not keys or ReferenceCache.CLASSROOMS in keys:
+            self.store.invalidate(DataStore.CLASSROOMS)
+        if not keys or ReferenceCache.ACTIVE_SCHOOL_YEAR in keys:
+            self.current_school_year_id = None
+            self.current_school_year_name = None
+
+    def get_setting(self, key: str, default: str | None = None) -> str | None:
+        """Lire un paramètre depuis le cache (voir `SettingsStore`)"""
+        return self.settings.get(key, default)
+
+    def set_language(self, language: str, roots: Iterable = ()) -> int:
+        """Changer de langue et relibeller sur place les contrôles des `roots`.
+
+        Aucune requête n'est faite : les écrans gardent leurs données.
+        Retourne le nombre de libellés modifiés.
+        """
+        translations = self.load_translations(language)
+        if not translations:
+            return 0
+        self.current_language = (
+            language if language in Constants.AVAILABLE_LANGUAGES else "fr"
+        )
+        self.translations = self.translator.catalog
+        return self.translator.switch(translations, roots)
+
     def load_translations(self, language: str) -> dict:
-        """Changer la langue de l'application"""
+        """Catalogue compilé d'une langue (voir `CatalogStore`)"""
         if (language not in Constants.AVAILABLE_LANGUAGES) or (not language):
-            language = "fr"  # Langue par défaut
+            language = CatalogStore.DEFAULT_LANGUAGE
         else:
             language = language.lower()
         try:
-            import json
-
-            # get the path to the current file
-            current_dir = pathlib.Path(__file__).parent
-            # construct the full path to the language file
-            lang_file_path = current_dir / ".." / "langs" / f"{language}.json"
-
-            with open(lang_file_path.resolve(), encoding="utf-8") as f:
-                translations = f.read()
-                self.translations = json.loads(translations)
-                return json.loads(translations)
+            return self.catalogs.load(language)
         except FileNotFoundError:
             print(f"Le fichier de traduction pour '{language}' n'a pas été trouvé.")
             return {}
-        # return {}
+        except ValueError as e:
+            print(f"Le fichier de traduction pour '{language}' est invalide : {e}")
+            return {}
 
     # def has_permission(self, permission: str):
     #     """Vérifier si l'utilisateur a une permission spécifique"""
@@ -26,6 +26,75 @@ class Config:
     MAX_PAGE_SIZE = 100
     CLOSE_BANNER_TIME = 3  # in secs
 
+    # Search
+    # Délai (secondes) sans frappe avant de lancer une recherche
+    SEARCH_DEBOUNCE_DELAY = 0.3
+
+    # Import d'élèves (CSV / Excel) : lignes lues, validées et insérées à la fois
+    STUDENT_IMPORT_CHUNK_SIZE = 500
+    # Lignes rejetées gardées pour être affichées (les suivantes sont seulement comptées)
+    STUDENT_IMPORT_MAX_ERRORS = 100
+
+    # Screens
+    # Nombre maximal d'écrans principaux gardés en mémoire (éviction LRU)
+    MAX_ALIVE_SCREENS = 3
+    # Préchargement des écrans probables pendant l'inactivité
+    PREFETCH_IDLE_DELAY = 1.0  # in secs
+    PREFETCH_MEMORY_BUDGET_MB = 64
+    PREFETCH_DEPTH = 2
+    # Tableau de bord : années scolaires tracées sur la courbe des recettes
+    DASHBOARD_TREND_YEARS = 3
+
+    # -------- Rapports --------
+    # Dossier où sont écrits les rapports exportés (Excel, PDF...)
+    REPORTS_EXPORT_DIR = "rapports"
+    # Rapports générés en arrière-plan en même temps (les suivants attendent)
+    REPORT_JOBS_MAX_WORKERS = 2
+    # Nombre de rapports récents gardés en mémoire pour être ré-exportés
+    REPORT_JOBS_RECENT = 10
+    # Rapports déjà calculés, réutilisés tant que leurs tables n'ont pas changé
+    REPORT_CACHE_SIZE = 32  # entrées en mémoire
+    REPORT_CACHE_ON_DISK = True  # aussi dans data/cache/reports (survit au redémarrage)
+    REPORT_CACHE_DISK_MAX_FILES = 200
+    # Rapport comparatif : nombre d'années scolaires comparées (les plus récentes)
+    FINANCIAL_COMPARISON_YEARS = 5
+    # Lignes affichées par page dans l'aperçu d'un rapport
+    REPORT_PREVIEW_PAGE_SIZE = 25
+    # Export CSV : « ; » et virgule décimale comme l'attend Excel en français,
+    # BOM UTF-8 (utf-8-sig) pour que les accents s'affichent correctement
+    CSV_DELIMITER = ";"
+    CSV_DECIMAL_SEPARATOR = ","
+    CSV_ENCODING = "utf-8-sig"
+    # Lignes lues à la fois dans la base (fetchmany) lors d'un export en flux
+    EXPORT_BATCH_SIZE = 500
+    # Export du grand livre (Parquet / Arrow) : lignes par lot = un row group
+    LEDGER_EXPORT_BATCH_SIZE = 20_000
+    # Rapports générés automatiquement après les heures de cours, dans
+    # SCHEDULED_REPORTS_DIR/<AAAA-MM-JJ>/<nom>.<format>
+    SCHEDULED_REPORTS_ENABLED = True
+    SCHEDULED_REPORTS_DIR = "rapports/planifies"
+    SCHEDULED_REPORTS_RETENTION_DAYS = 30  # dossiers datés plus anciens supprimés
+    # Occurrences manquées (application fermée) rattrapées au démarrage
+    SCHEDULED_REPORTS_CATCH_UP_HOURS = 24
+    # cron : "minute heure jour mois jour_semaine" ; période : day, previous_day,
+    # current_month ou previous_month ; format : csv, xlsx ou pdf
+    SCHEDULED_REPORTS = (
+        {
+            "name": "caisse_du_jour",
+            "report_type": "cash_register",
+            "cron": "30 18 * * 1-6",
+            "period": "day",
+            "format": "xlsx",
+        },
+        {
+            "name": "finances_du_mois",
+            "report_type": "financial_classroom",
+            "cron": "45 18 * * 1-6",
+            "period": "current_month",
+            "format": "pdf",
+        },
+    )
+
     # -------- Impression / Reçus --------
     # Chemin vers le logo (utilisé dans les PDF et tickets si supporté)
     RECEIPT_LOGO_PATH = "src/assets/icon.png"
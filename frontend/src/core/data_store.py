@@ -0,0 +1,245 @@
+"""Magasin central des collections partagées entre les écrans"""
+
+import asyncio
+import inspect
+import sys
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from models.classroom_model import ClassroomModel
+from models.enrollment_model import EnrollmentModel
+from models.payment_model import PaymentModel
+from models.student_model import StudentModel
+
+
+class DataStore:
+    """Élèves, classes, inscriptions et paiements chargés une seule fois pour tous les écrans.
+
+    Chaque collection a son verrou et son état de chargement. Les écrans
+    reçoivent la même liste (à traiter en lecture seule) au lieu d'en garder
+    chacun une copie, et peuvent s'abonner à une collection pour être
+    prévenus quand elle est rechargée après une modification.
+    Les index de `IndexedRepository` sont mis à jour à chaque chargement.
+    """
+
+    STUDENTS = "students"
+    CLASSROOMS = "classrooms"
+    ENROLLMENTS = "enrollments"
+    PAYMENTS = "payments"
+
+    COLLECTIONS = (STUDENTS, CLASSROOMS, ENROLLMENTS, PAYMENTS)
+
+    # États de chargement
+    IDLE = "idle"
+    LOADING = "loading"
+    LOADED = "loaded"
+    ERROR = "error"
+
+    def __init__(self, app_state) -> None:
+        self.app_state = app_state
+        self._values: Dict[str, List[Any]] = {}
+        # Année scolaire des collections filtrées par année (inscriptions, paiements)
+        self._years: Dict[str, Optional[int]] = {}
+        self._states: Dict[str, str] = {name: self.IDLE for name in self.COLLECTIONS}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {
+            name: asyncio.Lock() for name in self.COLLECTIONS
+        }
+        self._subscribers: Dict[str, List[Callable]] = {}
+
+    # ------------------------------------------------------------------
+    # États
+    def state(self, collection: str) -> str:
+        return self._states[collection]
+
+    def is_loaded(self, collection: str) -> bool:
+        return collection in self._values
+
+    def last_error(self, collection: str) -> Optional[str]:
+        return self._errors.get(collection)
+
+    def peek(self, collection: str) -> List[Any]:
+        """Valeur en mémoire sans chargement (liste vide si absente)"""
+        return self._values.get(collection, [])
+
+    # ------------------------------------------------------------------
+    # Collections
+    async def get_students(self, force: bool = False) -> List[StudentModel]:
+        return await self._get(
+            self.STUDENTS,
+            self.app_state.api_client.list_students,
+            self.app_state.repository.set_students,
+            force,
+        )
+
+    async def get_classrooms(self, force: bool = False) -> List[ClassroomModel]:
+        return await self._get(
+            self.CLASSROOMS,
+            self.app_state.reference_data.get_classrooms,
+            self.app_state.repository.set_classrooms,
+            force,
+        )
+
+    async def get_enrollments(
+        self, school_year_id: int | None = None, force: bool = False
+    ) -> List[EnrollmentModel]:
+        return await self._get_for_year(
+            self.ENROLLMENTS,
+            self.app_state.api_client.list_enrollments,
+            self.app_state.repository.set_enrollments,
+            school_year_id,
+            force,
+        )
+
+    async def get_payments(
+        self, school_year_id: int | None = None, force: bool = False
+    ) -> List[PaymentModel]:
+        return await self._get_for_year(
+            self.PAYMENTS,
+            self.app_state.api_client.list_payments,
+            None,
+            school_year_id,
+            force,
+        )
+
+    async def _get_for_year(
+        self,
+        collection: str,
+        fetch: Callable[..., Awaitable[List[Any]]],
+        on_loaded: Optional[Callable[[List[Any]], None]],
+        school_year_id: int | None,
+        force: bool,
+    ) -> List[Any]:
+        """Collection d'une année scolaire (rechargée si l'année change)"""
+        school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+        if self._years.get(collection) != school_year_id:
+            force = True
+
+        async def loader():
+            values = await fetch(school_year_id=school_year_id)
+            self._years[collection] = school_year_id
+            return values
+
+        return await self._get(collection, loader, on_loaded, force)
+
+    async def _get(
+        self,
+        collection: str,
+        loader: Callable[[], Awaitable[List[Any]]],
+        on_loaded: Optional[Callable[[List[Any]], None]],
+        force: bool,
+    ) -> List[Any]:
+        if self._states[collection] == self.LOADED and not force:
+            return self._values[collection]
+        async with self._locks[collection]:
+            # Un appel concurrent a pu charger la collection entre-temps
+            if self._states[collection] == self.LOADED and not force:
+                return self._values[collection]
+            reload = collection in self._values
+            previous_state = self._states[collection]
+            self._states[collection] = self.LOADING
+            try:
+                values = list(await loader())
+            except asyncio.CancelledError:
+                # Chargement d'écran annulé (ScreenLoader) : la valeur en
+                # mémoire reste valable, le prochain `get_*` relancera la requête
+                self._states[collection] = previous_state
+                raise
+            except Exception as e:
+                self._states[collection] = self.ERROR
+                self._errors[collection] = str(e)
+                print(f"Erreur lors du chargement de '{collection}' : {e}")
+                return self._values.get(collection, [])
+            self._values[collection] = values
+            self._states[collection] = self.LOADED
+            self._errors.pop(collection, None)
+            if on_loaded is not None:
+                on_loaded(values)
+
+        if reload:
+            await self._notify(collection, values)
+        return values
+
+    def invalidate(self, *collections: str) -> None:
+        """Marquer des collections comme périmées (toutes si aucune précisée).
+
+        La valeur actuelle reste lisible par `peek` ; le prochain `get_*`
+        recharge depuis la base et prévient les abonnés.
+        """
+        for collection in collections or self.COLLECTIONS:
+            if collection in self._values:
+                self._states[collection] = self.IDLE
+
+    def clear(self) -> None:
+        """Vider toutes les collections (déconnexion)"""
+        self._values.clear()
+        self._errors.clear()
+        self._years.clear()
+        for collection in self.COLLECTIONS:
+            self._states[collection] = self.IDLE
+
+    def is_stale(self, collection: str) -> bool:
+        return collection in self._values and self._states[collection] == self.IDLE
+
+    # ------------------------------------------------------------------
+    # Abonnements
+    def subscribe(self, collection: str, callback: Callable) -> Callable[[], None]:
+        """S'abonner aux rechargements d'une collection.
+
+        Le callback reçoit `(collection, values)` et peut être synchrone ou
+        async. Les méthodes liées sont gardées par référence faible : un écran
+        libéré par `ScreenRegistry` n'est pas retenu par le magasin.
+        Retourne une fonction de désabonnement.
+        """
+        reference = (
+            weakref.WeakMethod(callback)
+            if inspect.ismethod(callback)
+            else (lambda: callback)
+        )
+        self._subscribers.setdefault(collection, []).append(reference)
+
+        def unsubscribe() -> None:
+            references = self._subscribers.get(collection, [])
+            if reference in references:
+                references.remove(reference)
+
+        return unsubscribe
+
+    async def _notify(self, collection: str, values: List[Any]) -> None:
+        references = self._subscribers.get(collection, [])
+        # Oublier les abonnés dont l'écran a été libéré
+        references[:] = [reference for reference in references if reference()]
+        for reference in list(references):
+            callback = reference()
+            if callback is None:
+                continue
+            try:
+                result = callback(collection, values)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Erreur dans un abonné à '{collection}' : {e}")
+
+    # ------------------------------------------------------------------
+    # Mémoire
+    def memory_report(self) -> Dict[str, Dict[str, Any]]:
+        """Nombre d'éléments et taille approximative (octets) par collection"""
+        report = {}
+        for collection in self.COLLECTIONS:
+            values = self._values.get(collection, [])
+            report[collection] = {
+                "state": self._states[collection],
+                "count": len(values),
+                "bytes": sys.getsizeof(values)
+                + sum(self._object_size(value) for value in values),
+            }
+        return report
+
+    @staticmethod
+    def _object_size(obj: Any) -> int:
+        size = sys.getsizeof(obj)
+        attributes = getattr(obj, "__dict__", None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+            size += sum(sys.getsizeof(value) for value in attributes.values())
+        return size
@@ -0,0 +1,146 @@
+"""Comparaison financière de plusieurs années scolaires, mois par mois"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Sources du cube financier : les paiements du personnel sont des dépenses
+INCOME_SOURCES = ("payment",)
+EXPENSE_SOURCES = ("expense", "staff_payment")
+SOURCES = INCOME_SOURCES + EXPENSE_SOURCES
+
+METRICS = ("income", "expenses", "net")
+
+
+def month_range(start_date: str, end_date: str) -> List[str]:
+    """Mois (« AAAA-MM ») de `start_date` à `end_date` inclus"""
+    year, month = int(start_date[:4]), int(start_date[5:7])
+    last = end_date[:7]
+    months = []
+    while (current := f"{year:04d}-{month:02d}") <= last:
+        months.append(current)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def growth_rate(current: float, previous: Optional[float]) -> Optional[float]:
+    """Variation en pourcentage (None si la valeur précédente est nulle ou absente)"""
+    if not previous:
+        return None
+    return round((current - previous) / abs(previous) * 100, 1)
+
+
+def _deltas(
+    values: Sequence[float], previous: Sequence[Optional[float]]
+) -> tuple[List[Optional[float]], List[Optional[float]]]:
+    """Écarts et taux de variation de `values` par rapport à `previous`, position par position"""
+    deltas, rates = [], []
+    for value, before in zip(values, previous):
+        deltas.append(None if before is None else round(value - before, 2))
+        rates.append(growth_rate(value, before))
+    return deltas, rates
+
+
+def compare_school_years(
+    totals: Iterable[Dict[str, Any]],
+    school_years: Iterable[Any],
+    until: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Séries mensuelles alignées des recettes, dépenses et soldes par année scolaire.
+
+    `totals` : lignes de `get_financial_totals` groupées par `source`,
+    `school_year_id` et `month` (sources SOURCES). `school_years` : objets
+    ayant `id_school_year`, `name`, `start_date` et `end_date`.
+
+    Les mois sont alignés sur leur position dans l'année scolaire (le
+    premier mois de chaque année est la position 0) : la position i d'une
+    année se compare à la position i de l'année précédente (variation
+    annuelle, « yoy ») et à la position i - 1 de la même année (variation
+    mensuelle, « mom »). Les mois postérieurs à `until` (année en cours)
+    sont ignorés pour ne pas comparer des mois encore vides.
+
+    Retourne {"positions": nombre de mois de l'année la plus longue,
+    "years": [...]} avec les années de la plus ancienne à la plus récente ;
+    pour chaque année, les séries `months`, `income`, `expenses`, `net`,
+    leurs `<série>_mom`, `<série>_mom_growth`, `<série>_yoy`,
+    `<série>_yoy_growth` et les `totals` de l'année avec leur variation
+    annuelle.
+    """
+    last_month = until.isoformat()[:7] if until else None
+    amounts: Dict[tuple, float] = {}
+    for row in totals:
+        metric = "income" if row["source"] in INCOME_SOURCES else "expenses"
+        key = (row["school_year_id"], row["month"], metric)
+        amounts[key] = amounts.get(key, 0.0) + (row["total_amount"] or 0.0)
+
+    years: List[Dict[str, Any]] = []
+    previous: Optional[Dict[str, Any]] = None
+    for school_year in sorted(school_years, key=lambda year: year.start_date):
+        year_id = school_year.id_school_year
+        months = month_range(school_year.start_date, school_year.end_date)
+        if last_month is not None:
+            months = [month for month in months if month <= last_month]
+        if not months:
+            continue
+
+        series: Dict[str, Any] = {
+            "school_year_id": year_id,
+            "school_year": school_year.name,
+            "months": months,
+            "income": [
+                round(amounts.get((year_id, month, "income"), 0.0), 2)
+                for month in months
+            ],
+            "expenses": [
+                round(amounts.get((year_id, month, "expenses"), 0.0), 2)
+                for month in months
+            ],
+        }
+        series["net"] = [
+            round(income - expenses, 2)
+            for income, expenses in zip(series["income"], series["expenses"])
+        ]
+
+        year_totals: Dict[str, Any] = {}
+        for metric in METRICS:
+            values = series[metric]
+            series[f"{metric}_mom"], series[f"{metric}_mom_growth"] = _deltas(
+                values, [None, *values[:-1]]
+            )
+            before = previous[metric] if previous else []
+            series[f"{metric}_yoy"], series[f"{metric}_yoy_growth"] = _deltas(
+                values,
+                [before[i] if i < len(before) else None for i in range(len(values))],
+            )
+
+            total = round(sum(values), 2)
+            year_totals[metric] = total
+            # Sur les mêmes positions que l'année précédente (année en cours incomplète)
+            previous_total = round(sum(before[: len(values)]), 2) if previous else None
+            year_totals[f"{metric}_yoy"] = (
+                None if previous_total is None else round(total - previous_total, 2)
+            )
+            year_totals[f"{metric}_yoy_growth"] = growth_rate(total, previous_total)
+        series["totals"] = year_totals
+
+        years.append(series)
+        previous = series
+
+    return {
+        "positions": max((len(year["months"]) for year in years), default=0),
+        "years": years,
+    }
+
+
+def comparison_rows(comparison: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Une ligne par année et par mois (export du rapport comparatif)"""
+    rows = []
+    for year in comparison.get("years", []):
+        for i, month in enumerate(year["months"]):
+            row = {"school_year": year["school_year"], "month": month}
+            for metric in METRICS:
+                row[metric] = year[metric][i]
+                row[f"{metric}_mom_growth"] = year[f"{metric}_mom_growth"][i]
+                row[f"{metric}_yoy"] = year[f"{metric}_yoy"][i]
+                row[f"{metric}_yoy_growth"] = year[f"{metric}_yoy_growth"][i]
+            rows.append(row)
+    return rows
@@ -0,0 +1,343 @@
+"""Traductions réactives : changement de langue sans reconstruire les écrans"""
+
+import json
+import os
+import pickle
+import weakref
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class TranslatedText(str):
+    """Chaîne traduite qui garde la clé dont elle provient.
+
+    Se comporte comme un `str` ordinaire (affichage, sérialisation) ; la clé
+    permet de retrouver le libellé dans la nouvelle langue.
+    """
+
+    key: str
+
+    def __new__(cls, value: str, key: str) -> "TranslatedText":
+        text = super().__new__(cls, value)
+        text.key = key
+        return text
+
+    def __reduce__(self):
+        return (TranslatedText, (str(self), self.key))
+
+
+class TranslationCatalog(dict):
+    """Dictionnaire clé -> `TranslatedText`.
+
+    Les catalogues compilés contiennent déjà toutes les clés de la langue par
+    défaut ; une clé inconnue retourne tout de même un `TranslatedText`, que
+    le changement de langue relibellera si la clé existe dans la nouvelle.
+    """
+
+    def __init__(self, translations: Optional[Dict[str, str]] = None) -> None:
+        super().__init__()
+        if translations:
+            self.replace(translations)
+
+    def replace(self, translations: Dict[str, str]) -> None:
+        """Remplacer le contenu sur place (les références existantes suivent)"""
+        self.clear()
+        self.update(
+            (key, TranslatedText(str(value), key))
+            for key, value in translations.items()
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            if isinstance(default, str):
+                return TranslatedText(default, key)
+            return default
+
+
+class CatalogStore:
+    """Catalogues `langs/*.json` compilés une fois puis servis depuis un cache.
+
+    Chaque langue est compilée à la première demande en un dictionnaire
+    complété par la langue par défaut (les clés manquantes sont connues dès
+    la compilation), puis sérialisé avec pickle dans `langs/__pycache__`.
+    Le cache est invalidé par la date de modification et la taille du JSON.
+    """
+
+    DEFAULT_LANGUAGE = "fr"
+    CACHE_FORMAT = 1
+
+    def __init__(
+        self, langs_dir: Optional[Path] = None, cache_dir: Optional[Path] = None
+    ) -> None:
+        self.langs_dir = Path(langs_dir or Path(__file__).parent.parent / "langs")
+        self.cache_dir = Path(cache_dir or self.langs_dir / "__pycache__")
+        self._catalogs: Dict[str, Dict[str, str]] = {}
+        self._missing: Dict[str, List[str]] = {}
+
+    def available_languages(self) -> List[str]:
+        return sorted(path.stem for path in self.langs_dir.glob("*.json"))
+
+    def is_loaded(self, language: str) -> bool:
+        return language in self._catalogs
+
+    def load(self, language: str) -> Dict[str, str]:
+        """Catalogue complet d'une langue (chargé une seule fois)"""
+        if language not in self._catalogs:
+            compiled = self._read_cache(language)
+            if compiled is None:
+                compiled = self.compile(language)
+            self._catalogs[language] = compiled["translations"]
+            self._missing[language] = compiled["missing"]
+        return self._catalogs[language]
+
+    def missing_keys(self, language: str) -> List[str]:
+        """Clés de la langue par défaut absentes du fichier de `language`"""
+        self.load(language)
+        return self._missing[language]
+
+    def compile(self, language: str) -> Dict[str, Any]:
+        """Lire le JSON, compléter avec la langue par défaut et écrire le cache"""
+        source = self._source_path(language)
+        with open(source, encoding="utf-8") as f:
+            translations = json.load(f)
+
+        missing: List[str] = []
+        if language != self.DEFAULT_LANGUAGE:
+            default = self.load(self.DEFAULT_LANGUAGE)
+            missing = sorted(key for key in default if key not in translations)
+            translations = {**default, **translations}
+
+        compiled = {
+            "format": self.CACHE_FORMAT,
+            "source": self._stamp(source),
+            "translations": translations,
+            "missing": missing,
+        }
+        if language != self.DEFAULT_LANGUAGE:
+            # Le catalogue dépend aussi de la langue par défaut
+            compiled["default"] = self._stamp(self._source_path(self.DEFAULT_LANGUAGE))
+        self._write_cache(language, compiled)
+        return compiled
+
+    def compile_all(self) -> Dict[str, List[str]]:
+        """Compiler toutes les langues et retourner leurs clés manquantes"""
+        self._catalogs.clear()
+        self._missing.clear()
+        report = {}
+        for language in self.available_languages():
+            compiled = self.compile(language)
+            self._catalogs[language] = compiled["translations"]
+            self._missing[language] = report[language] = compiled["missing"]
+        return report
+
+    # ------------------------------------------------------------------
+    def _source_path(self, language: str) -> Path:
+        return self.langs_dir / f"{language}.json"
+
+    def _cache_path(self, language: str) -> Path:
+        return self.cache_dir / f"{language}.pickle"
+
+    @staticmethod
+    def _stamp(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_cache(self, language: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._cache_path(language), "rb") as f:
+                compiled = pickle.load(f)
+            if compiled.get("format") != self.CACHE_FORMAT or compiled.get(
+                "source"
+            ) != self._stamp(self._source_path(language)):
+                return None
+            if language != self.DEFAULT_LANGUAGE and compiled.get(
+                "default"
+            ) != self._stamp(self._source_path(self.DEFAULT_LANGUAGE)):
+                return None
+            return compiled
+        except (OSError, pickle.PickleError, EOFError, AttributeError, TypeError):
+            return None
+
+    def _write_cache(self, language: str, compiled: Dict[str, Any]) -> None:
+        # Installation en lecture seule : on se contente du catalogue en mémoire
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self._cache_path(language).with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._cache_path(language))
+        except OSError as e:
+            print(f"Impossible d'écrire le cache de traduction '{language}' : {e}")
+
+
+class Translator:
+    """Met à jour sur place les libellés des contrôles lors d'un changement de langue.
+
+    Deux mécanismes :
+    - les propriétés contenant un `TranslatedText` (retourné par `get_text`)
+      sont retrouvées en parcourant les contrôles des écrans vivants ;
+    - `bind` enregistre les libellés composés (ex. "Connecté : admin") avec
+      une fonction de formatage.
+    """
+
+    # Attributs jamais parcourus : références vers le haut de l'arbre ou l'état
+    SKIPPED_ATTRIBUTES = frozenset(("page", "parent", "app_state", "appState", "data"))
+    # Objets Python (non contrôles) parcourus : écrans et leurs modules d'aide
+    WALKED_MODULES = ("screens", "__main__", "main")
+
+    def __init__(self) -> None:
+        self.catalog = TranslationCatalog()
+        self._bindings: List[
+            Tuple[weakref.ref, str, str, Optional[Callable[[str], Any]]]
+        ] = []
+        self._listeners: List[Callable[[], None]] = []
+
+    def text(self, key: str) -> str:
+        return self.catalog.get(key, key)
+
+    def bind(
+        self,
+        control: Any,
+        attribute: str,
+        key: str,
+        formatter: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """Lier `control.attribute` à une clé de traduction et l'affecter"""
+        self._bindings.append((weakref.ref(control), attribute, key, formatter))
+        self._apply_binding(control, attribute, key, formatter)
+        return control
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Être prévenu après chaque changement de langue"""
+        self._listeners.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+        return unsubscribe
+
+    def switch(self, translations: Dict[str, str], roots: Iterable[Any] = ()) -> int:
+        """Charger une nouvelle langue et relibeller les contrôles des `roots`.
+
+        Retourne le nombre de propriétés modifiées.
+        """
+        self.catalog.replace(translations)
+        changed = self._refresh_bindings()
+        seen: set[int] = set()
+        for root in roots:
+            if root is not None:
+                changed += self._relabel(root, seen)
+
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Erreur dans un abonné au changement de langue : {e}")
+        return changed
+
+    # ------------------------------------------------------------------
+    def _apply_binding(self, control, attribute, key, formatter) -> bool:
+        text = self.text(key)
+        value = formatter(text) if formatter else text
+        if getattr(control, attribute, None) == value:
+            return False
+        setattr(control, attribute, value)
+        return True
+
+    def _refresh_bindings(self) -> int:
+        changed = 0
+        alive = []
+        for binding in self._bindings:
+            control = binding[0]()
+            if control is None:
+                continue
+            alive.append(binding)
+            changed += self._apply_binding(control, *binding[1:])
+        self._bindings = alive
+        return changed
+
+    def _translate(self, value: TranslatedText) -> TranslatedText:
+        return self.catalog.get(value.key, value)
+
+    def _relabel(self, root: Any, seen: set[int]) -> int:
+        """Parcours itératif des contrôles, listes et objets d'écran"""
+        changed = 0
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+
+            if isinstance(obj, list):
+                for index, item in enumerate(obj):
+                    if isinstance(item, TranslatedText):
+                        translated = self._translate(item)
+                        if translated != item:
+                            obj[index] = translated
+                            changed += 1
+                    elif self._is_walkable(item):
+                        stack.append(item)
+                continue
+            if isinstance(obj, dict):
+                for name, item in obj.items():
+                    if isinstance(item, TranslatedText):
+                        translated = self._translate(item)
+                        if translated != item:
+                            obj[name] = translated
+                            changed += 1
+                    elif self._is_walkable(item):
+                        stack.append(item)
+                continue
+            if isinstance(obj, tuple):
+                stack.extend(item for item in obj if self._is_walkable(item))
+                continue
+
+            if is_dataclass(obj):
+                names = [field.name for field in fields(obj)]
+            else:
+                names = list(vars(obj))
+            for name in names:
+                if name.startswith("_") or name in self.SKIPPED_ATTRIBUTES:
+                    continue
+                value = getattr(obj, name, None)
+                if isinstance(value, TranslatedText):
+                    translated = self._translate(value)
+                    if translated != value:
+                        setattr(obj, name, translated)
+                        changed += 1
+                elif self._is_walkable(value):
+                    stack.append(value)
+        return changed
+
+    @classmethod
+    def _is_walkable(cls, value: Any) -> bool:
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return False
+        if isinstance(value, (list, tuple, dict)):
+            return True
+        if isinstance(value, type) or callable(value):
+            return False
+        module = type(value).__module__
+        if is_dataclass(value):
+            # Contrôles Flet (et leurs styles) ou contrôles propres aux écrans
+            return module.startswith(("flet",) + cls.WALKED_MODULES)
+        return hasattr(value, "__dict__") and module.startswith(cls.WALKED_MODULES)
+
+
+def check_catalogs() -> int:
+    """Compiler les catalogues et signaler les clés manquantes (étape de build).
+
+    Retourne 1 si une langue n'est pas complète (voir `compile_translations.py`).
+    """
+    report = CatalogStore().compile_all()
+    for language, missing in report.items():
+        status = f"{len(missing)} missing key(s)" if missing else "complete"
+        print(f"{language}: {status}")
+        for key in missing:
+            print(f"  - {key}")
+    return 1 if any(report.values()) else 0
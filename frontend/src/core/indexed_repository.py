@@ -0,0 +1,118 @@
+"""Index en mémoire des listes chargées par les écrans (recherches en O(1))"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from models.classroom_model import ClassroomModel
+from models.enrollment_model import EnrollmentModel
+from models.fee_model import FeeModel
+from models.staff_model import StaffModel
+from models.student_model import StudentModel
+
+
+class IndexedRepository:
+    """Dictionnaires d'index partagés entre les écrans.
+
+    Les services y déposent les listes qu'ils chargent (`set_*`) ; les index
+    sont reconstruits une fois par chargement, puis chaque ligne de tableau
+    fait ses recherches (nom d'un élève, classe actuelle, frais...) en O(1)
+    au lieu de parcourir les listes.
+
+    Les index sont remplacés d'un bloc (jamais modifiés sur place) pour que
+    les recherches faites depuis un thread (voir `Debouncer`) restent sûres.
+    """
+
+    def __init__(self) -> None:
+        self.students_by_id: Dict[int, StudentModel] = {}
+        self.classrooms_by_id: Dict[int, ClassroomModel] = {}
+        self.fees_by_id: Dict[int, FeeModel] = {}
+        self.staff_by_id: Dict[int, StaffModel] = {}
+        # Élève -> inscription de l'année chargée (la plus récente en cas de doublon)
+        self.enrollment_by_student: Dict[int, EnrollmentModel] = {}
+        # Classe -> identifiants des élèves inscrits (multi-dictionnaire)
+        self.students_by_classroom: Dict[int, Set[int]] = {}
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Synchronisation avec les listes chargées
+    def set_students(self, students: Iterable[StudentModel]) -> None:
+        self.students_by_id = {student.id_student: student for student in students}
+
+    def set_classrooms(self, classrooms: Iterable[ClassroomModel]) -> None:
+        self.classrooms_by_id = {
+            classroom.id_classroom: classroom for classroom in classrooms
+        }
+
+    def set_fees(self, fees: Iterable[FeeModel]) -> None:
+        self.fees_by_id = {fee.id_fee: fee for fee in fees}
+
+    def set_staff(self, staff: Iterable[StaffModel]) -> None:
+        self.staff_by_id = {member.id_staff: member for member in staff}
+
+    def set_enrollments(self, enrollments: Iterable[EnrollmentModel]) -> None:
+        by_student: Dict[int, EnrollmentModel] = {}
+        for enrollment in enrollments:
+            current = by_student.get(enrollment.student_id)
+            if current is None or enrollment.id_enrollment > current.id_enrollment:
+                by_student[enrollment.student_id] = enrollment
+
+        by_classroom: Dict[int, Set[int]] = {}
+        for student_id, enrollment in by_student.items():
+            by_classroom.setdefault(enrollment.classroom_id, set()).add(student_id)
+
+        self.enrollment_by_student = by_student
+        self.students_by_classroom = by_classroom
+
+    # ------------------------------------------------------------------
+    # Recherches
+    def get_student(self, student_id: int) -> Optional[StudentModel]:
+        return self.students_by_id.get(student_id)
+
+    def get_classroom(self, classroom_id: int) -> Optional[ClassroomModel]:
+        return self.classrooms_by_id.get(classroom_id)
+
+    def get_fee(self, fee_id: int) -> Optional[FeeModel]:
+        return self.fees_by_id.get(fee_id)
+
+    def get_staff(self, staff_id: int) -> Optional[StaffModel]:
+        return self.staff_by_id.get(staff_id)
+
+    def get_enrollment(self, student_id: int) -> Optional[EnrollmentModel]:
+        return self.enrollment_by_student.get(student_id)
+
+    def get_student_classroom(self, student_id: int) -> Optional[ClassroomModel]:
+        enrollment = self.enrollment_by_student.get(student_id)
+        if enrollment is None:
+            return None
+        return self.classrooms_by_id.get(enrollment.classroom_id)
+
+    def get_classroom_student_ids(self, classroom_id: int) -> Set[int]:
+        return self.students_by_classroom.get(classroom_id, set())
+
+    def get_classroom_students(self, classroom_id: int) -> List[StudentModel]:
+        return [
+            self.students_by_id[student_id]
+            for student_id in self.get_classroom_student_ids(classroom_id)
+            if student_id in self.students_by_id
+        ]
+
+    # ------------------------------------------------------------------
+    # Libellés pour l'affichage
+    def student_name(self, student_id: int, default: str = "N/A") -> str:
+        student = self.students_by_id.get(student_id)
+        if student is None:
+            return default
+        return f"{student.first_name} {student.last_name} {student.surname}".strip()
+
+    def classroom_name_for_student(self, student_id: int, default: str = "N/A") -> str:
+        classroom = self.get_student_classroom(student_id)
+        return classroom.name if classroom else default
+
+    def fee_name(self, fee_id: int, default: str = "N/A") -> str:
+        fee = self.fees_by_id.get(fee_id)
+        return fee.name if fee else default
+
+    def staff_name(self, staff_id: int, default: str = "Unknown") -> str:
+        staff = self.staff_by_id.get(staff_id)
+        return f"{staff.first_name} {staff.last_name}" if staff else default
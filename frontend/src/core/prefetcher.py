@@ -0,0 +1,96 @@
+"""Préchargement en tâche de fond des données des écrans probables"""
+
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class Prefetcher:
+    """Réchauffe le cache partagé (`DataStore`, `ReferenceCache`) pendant l'inactivité.
+
+    Après chaque navigation, une fois le chargement de l'écran courant terminé,
+    les données des écrans les plus probables sont chargées une requête à la
+    fois. La prédiction s'appuie sur l'historique des navigations (transitions
+    les plus fréquentes depuis l'écran courant), complété par l'ordre du menu.
+
+    Le préchargement cède la place au premier plan : il attend que
+    `ScreenLoader` soit inactif avant chaque requête, il est annulé à la
+    navigation suivante et s'arrête dès que le budget mémoire est atteint.
+    """
+
+    STATIC_ORDER = ("dashboard", "students", "payments", "checkout", "reports", "admin")
+
+    def __init__(
+        self,
+        app_state,
+        idle_delay: float = 1.0,
+        memory_budget_bytes: int = 64 * 1024 * 1024,
+        depth: int = 2,
+    ) -> None:
+        self.app_state = app_state
+        self.idle_delay = idle_delay
+        self.memory_budget_bytes = memory_budget_bytes
+        self.depth = depth
+        self._warmers: Dict[str, List[Callable[[], Awaitable]]] = {}
+        self._transitions: Dict[str, Counter] = {}
+        self._current: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, screen: str, *steps: Callable[[], Awaitable]) -> None:
+        """Requêtes qui préparent les données d'un écran"""
+        self._warmers[screen] = list(steps)
+
+    def on_navigation(self, screen: str) -> None:
+        """Enregistrer la navigation et planifier le préchargement suivant"""
+        if self._current is not None and self._current != screen:
+            self._transitions.setdefault(self._current, Counter())[screen] += 1
+        self._current = screen
+        self.stop()
+        self._task = asyncio.create_task(self._run(screen))
+
+    def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def predict(self, screen: str) -> List[str]:
+        """Écrans suivants les plus probables depuis `screen`"""
+        ranked = [
+            name
+            for name, _ in self._transitions.get(screen, Counter()).most_common()
+            if name != screen
+        ]
+        if screen in self.STATIC_ORDER:
+            # Ordre du menu à partir de l'écran courant
+            start = self.STATIC_ORDER.index(screen) + 1
+            static = self.STATIC_ORDER[start:] + self.STATIC_ORDER[:start]
+        else:
+            static = self.STATIC_ORDER
+        for name in static:
+            if name != screen and name not in ranked:
+                ranked.append(name)
+        return [name for name in ranked if self._warmers.get(name)][: self.depth]
+
+    def memory_used(self) -> int:
+        report = self.app_state.store.memory_report()
+        return sum(collection["bytes"] for collection in report.values())
+
+    async def _run(self, screen: str) -> None:
+        for name in self.predict(screen):
+            for step in self._warmers[name]:
+                await self._wait_until_idle()
+                if self.memory_used() >= self.memory_budget_bytes:
+                    return
+                try:
+                    await step()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Erreur lors du préchargement de '{name}' : {e}")
+
+    async def _wait_until_idle(self) -> None:
+        """Attendre que plus aucun chargement d'écran ne soit en cours"""
+        while True:
+            await asyncio.sleep(self.idle_delay)
+            if not self.app_state.loader.is_busy():
+                return
@@ -0,0 +1,81 @@
+"""Cache des données de référence liées à l'année scolaire"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from models.classroom_model import ClassroomModel
+from models.fee_model import FeeModel
+from models.role_model import RoleModel
+from models.school_year_model import SchoolYearModel
+
+
+class ReferenceCache:
+    """Mémorise les années scolaires, les classes, les frais et les rôles.
+
+    Ces données changent rarement (quelques fois par an) : elles sont lues
+    une seule fois puis servies depuis la mémoire. Seul l'écran
+    d'administration invalide le cache lorsqu'il modifie ces références.
+    Une valeur absente (`None`, ex. aucune année active) n'est pas gardée :
+    elle est relue au prochain appel.
+    """
+
+    ACTIVE_SCHOOL_YEAR = "active_school_year"
+    SCHOOL_YEARS = "school_years"
+    CLASSROOMS = "classrooms"
+    FEES = "fees"
+    ROLES = "roles"
+
+    KEYS = (ACTIVE_SCHOOL_YEAR, SCHOOL_YEARS, CLASSROOMS, FEES, ROLES)
+
+    def __init__(self, api_client) -> None:
+        self.api_client = api_client
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, asyncio.Lock] = {
+            key: asyncio.Lock() for key in self.KEYS
+        }
+
+    async def _get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if key in self._values:
+            return self._values[key]
+        async with self._locks[key]:
+            # Un autre appel concurrent a pu remplir le cache entre-temps
+            if key not in self._values:
+                value = await loader()
+                if value is None:
+                    return None
+                self._values[key] = value
+        return self._values[key]
+
+    def is_cached(self, key: str) -> bool:
+        return key in self._values
+
+    def seed(self, key: str, value: Any) -> None:
+        """Pré-remplir une clé (instantané de démarrage) sans écraser le cache"""
+        if value is not None:
+            self._values.setdefault(key, value)
+
+    def invalidate(self, *keys: str) -> None:
+        """Invalider les clés données (toutes si aucune n'est précisée)"""
+        for key in keys or self.KEYS:
+            self._values.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Accesseurs
+    async def get_active_school_year(self) -> Optional[SchoolYearModel]:
+        return await self._get(
+            self.ACTIVE_SCHOOL_YEAR, self.api_client.get_active_school_year
+        )
+
+    async def get_school_years(self) -> List[SchoolYearModel]:
+        return list(
+            await self._get(self.SCHOOL_YEARS, self.api_client.list_school_years)
+        )
+
+    async def get_classrooms(self) -> List[ClassroomModel]:
+        return list(await self._get(self.CLASSROOMS, self.api_client.list_classrooms))
+
+    async def get_fees(self) -> List[FeeModel]:
+        return list(await self._get(self.FEES, self.api_client.list_fees))
+
+    async def get_roles(self) -> List[RoleModel]:
+        return list(await self._get(self.ROLES, self.api_client.list_roles))
@@ -0,0 +1,236 @@
+"""Cache des rapports générés, invalidé par les versions des tables sources"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+REPORT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "reports"
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """Forme canonique des filtres d'un rapport.
+
+    Les valeurs vides sont ignorées, les dates ramenées au format ISO et les
+    nombres en texte convertis : `{"classroom_id": "3", "end_date": None}`
+    et `{"classroom_id": 3}` donnent la même clé.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if value is None or value == "" or value == "all":
+            continue
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()[:10]
+        elif isinstance(value, str):
+            value = value.strip()
+            if value.lstrip("-").isdigit():
+                value = int(value)
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+class ReportCache:
+    """Résultats de rapports réutilisés tant que leurs tables sources n'ont pas changé.
+
+    La clé d'un rapport réunit son type, ses filtres normalisés et la
+    version de chaque table lue (`get_data_versions`, incrémentée par un
+    trigger à chaque écriture). Relancer le même rapport ne coûte donc
+    qu'une petite requête sur `data_versions` ; dès qu'un paiement, une
+    dépense ou une inscription change, la clé change et le rapport est
+    recalculé.
+
+    Les `max_entries` derniers rapports sont gardés en mémoire (LRU). Si
+    `disk_dir` est donné, les résultats sont aussi écrits en JSON sur le
+    disque (au plus `max_disk_entries` fichiers) et survivent au
+    redémarrage. Les résultats partagés ne doivent pas être modifiés.
+    """
+
+    FORMAT = 1
+
+    def __init__(
+        self,
+        api_client,
+        max_entries: int = 32,
+        disk_dir: Path | str | None = None,
+        max_disk_entries: int = 200,
+    ) -> None:
+        self.api_client = api_client
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Clés
+    async def make_key(
+        self, report_type: str, params: Dict[str, Any], tables: Iterable[str]
+    ) -> str:
+        versions = await self.api_client.get_data_versions(sorted(tables))
+        raw = json.dumps(
+            [report_type, normalize_params(params), sorted(versions.items())]
+        )
+        return f"{report_type}-{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    async def get_or_compute(
+        self,
+        report_type: str,
+        params: Dict[str, Any],
+        tables: Iterable[str],
+        compute: Callable[[], Awaitable[Tuple[bool, Any]]],
+    ) -> Tuple[bool, Any]:
+        """Résultat en cache du rapport, sinon `compute()` (services : (succès, données)).
+
+        Seuls les résultats réussis et non vides sont mémorisés. Les versions
+        sont lues *avant* le calcul : une écriture pendant celui-ci rend
+        l'entrée aussitôt obsolète plutôt que de servir des données périmées.
+        """
+        try:
+            key = await self.make_key(report_type, params, tables)
+        except Exception as e:
+            print(f"Erreur lors de la lecture des versions de données : {e}")
+            return await compute()
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            # Deux demandes identiques simultanées ne calculent qu'une fois
+            async with lock:
+                found, value = await self._lookup(key)
+                if found:
+                    self.hits += 1
+                    return (True, value)
+                self.misses += 1
+                success, value = await compute()
+                if success and value:
+                    await self._store(key, value)
+                return (success, value)
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    async def _lookup(self, key: str) -> Tuple[bool, Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return (True, self._entries[key])
+        if self.disk_dir is None:
+            return (False, None)
+        value = await asyncio.to_thread(self._read_disk, key)
+        if value is None:
+            return (False, None)
+        self._remember(key, value)
+        return (True, value)
+
+    async def _store(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self.disk_dir is None:
+            return
+        try:
+            await asyncio.to_thread(self._write_disk, key, value)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Erreur lors de l'écriture du rapport en cache : {e}")
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Niveau disque
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Rapport en cache illisible : {e}")
+            return None
+        if entry.get("format") != self.FORMAT or entry.get("key") != key:
+            return None
+        # Marque le fichier comme récemment utilisé pour l'élagage
+        os.utime(path)
+        return entry.get("result")
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temporary = path.with_suffix(".tmp")
+        with temporary.open("w", encoding="utf-8") as file:
+            json.dump(
+                {"format": self.FORMAT, "key": key, "result": value},
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(temporary, path)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Supprimer les fichiers les moins récemment utilisés au-delà de la limite"""
+        files = sorted(
+            self.disk_dir.glob("*.json"), key=lambda path: path.stat().st_mtime
+        )
+        for path in files[: max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    def invalidate(self, report_type: str | None = None) -> None:
+        """Oublier les rapports en mémoire (d'un type, ou tous)"""
+        for key in list(self._entries):
+            if report_type is None or key.startswith(f"{report_type}-"):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Vider la mémoire et le disque"""
+        self._entries.clear()
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+
+def cached_report(report_type: str, tables: Iterable[str]):
+    """Servir une méthode `generate_*` de service depuis `app_state.report_cache`.
+
+    Les arguments de l'appel (sauf `progress`) et l'année scolaire courante
+    forment les filtres de la clé ; `tables` sont les tables lues par le
+    rapport.
+    """
+    tables = tuple(tables)
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {
+                name: value
+                for name, value in bound.arguments.items()
+                if name not in ("self", "progress")
+            }
+            params["school_year_id"] = await self.app_state.resolve_school_year_id()
+            return await self.app_state.report_cache.get_or_compute(
+                report_type,
+                params,
+                tables,
+                lambda: method(self, *args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,294 @@
+"""File d'attente des rapports générés en arrière-plan"""
+
+import asyncio
+import inspect
+import itertools
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ReportJobCancelled(Exception):
+    """Levée par le suivi de progression d'un travail annulé (arrête un export en thread)"""
+
+
+class ReportJob:
+    """Un rapport demandé par l'utilisateur et son état d'avancement"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    def __init__(
+        self,
+        job_id: int,
+        report_type: str,
+        title: str,
+        params: Dict[str, Any] | None = None,
+    ) -> None:
+        self.id = job_id
+        self.report_type = report_type
+        self.title = title
+        self.params: Dict[str, Any] = params or {}
+        self.status = self.QUEUED
+        self.rows_done = 0
+        self.rows_total = 0
+        self.error: Optional[str] = None
+        # Résultat gardé pour ré-exporter sans recalculer
+        self.rows: List[Any] = []
+        self.summary: Dict[str, Any] = {}
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._manager: Optional["ReportJobManager"] = None
+        # Session du gestionnaire (voir ReportJobManager.clear)
+        self._generation = 0
+
+    def __repr__(self) -> str:
+        return f"<ReportJob {self.id} {self.report_type} {self.status} {self.percent}%>"
+
+    @property
+    def percent(self) -> int:
+        if self.status == self.DONE:
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(100, self.rows_done * 100 // self.rows_total)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.status == self.CANCELLED
+
+    def set_progress(self, rows_done: int, rows_total: int | None = None) -> None:
+        """Avancement en lignes traitées (depuis la boucle d'événements)"""
+        if self.is_cancelled:
+            return
+        before = self.percent
+        self.rows_done = rows_done
+        if rows_total is not None:
+            self.rows_total = rows_total
+        if self._manager is not None and self.percent != before:
+            self._manager._notify(self)
+
+    def thread_progress(self, rows_total: int) -> Callable[[int], None]:
+        """Callback de progression utilisable depuis un thread d'export.
+
+        La mise à jour est renvoyée sur la boucle d'événements ; si le travail
+        a été annulé, le callback lève `ReportJobCancelled` pour arrêter
+        l'écriture en cours.
+        """
+        loop = asyncio.get_running_loop()
+
+        def progress(rows_done: int) -> None:
+            if self.is_cancelled:
+                raise ReportJobCancelled(self.id)
+            loop.call_soon_threadsafe(self.set_progress, rows_done, rows_total)
+
+        return progress
+
+
+async def track_rows(
+    items: Iterable[Any],
+    progress: ProgressCallback | None = None,
+    chunk_size: int = 500,
+    start: int = 0,
+    total: int | None = None,
+) -> AsyncIterator[Any]:
+    """Parcourir `items` en signalant l'avancement toutes les `chunk_size` lignes.
+
+    La boucle rend la main à l'interface à chaque paquet : la barre de
+    progression est redessinée et l'annulation prend effet rapidement.
+    `start` et `total` permettent d'enchaîner plusieurs listes dans une
+    même progression.
+    """
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    end = start + len(items)
+    total = end if total is None else total
+    for index, item in enumerate(items, start=1):
+        yield item
+        if index % chunk_size == 0:
+            if progress is not None:
+                progress(start + index, total)
+            await asyncio.sleep(0)
+    if progress is not None:
+        progress(end, total)
+
+
+class ReportJobManager:
+    """Génère les rapports en arrière-plan, au plus `max_workers` à la fois.
+
+    `submit` retourne immédiatement : le travail attend son tour (ordre
+    d'arrivée) puis s'exécute pendant que l'utilisateur continue à
+    naviguer. Les abonnés sont prévenus à chaque changement d'état et de
+    pourcentage. Les `keep_recent` derniers travaux terminés restent
+    disponibles (panneau « rapports récents ») avec leurs lignes.
+    """
+
+    def __init__(self, max_workers: int = 2, keep_recent: int = 10) -> None:
+        self.max_workers = max(1, max_workers)
+        self.keep_recent = keep_recent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ids = itertools.count(1)
+        self._active: Dict[int, ReportJob] = {}
+        self._recent: Deque[ReportJob] = deque(maxlen=keep_recent)
+        self._subscribers: List[Callable] = []
+        # Incrémenté par `clear` : les travaux d'une session précédente ne
+        # reviennent pas dans les rapports récents en se terminant
+        self._generation = 0
+
+    # ------------------------------------------------------------------
+    # Travaux
+    def submit(
+        self,
+        report_type: str,
+        run: Callable[[ReportJob], Awaitable[Any]],
+        title: str | None = None,
+        params: Dict[str, Any] | None = None,
+    ) -> ReportJob:
+        """Mettre un rapport en file d'attente.
+
+        `run(job)` produit le rapport ; il peut appeler `job.set_progress` et
+        remplit `job.rows` / `job.summary` (ou retourne les lignes).
+        """
+        if self._semaphore is None:
+            # Créé ici pour appartenir à la boucle d'événements de l'application
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        job = ReportJob(next(self._ids), report_type, title or report_type, params)
+        job._manager = self
+        job._generation = self._generation
+        self._active[job.id] = job
+        job._task = asyncio.create_task(self._run(job, run))
+        self._notify(job)
+        return job
+
+    async def _run(
+        self, job: ReportJob, run: Callable[[ReportJob], Awaitable[Any]]
+    ) -> None:
+        try:
+            async with self._semaphore:
+                if job.is_cancelled:
+                    return
+                job.status = ReportJob.RUNNING
+                self._notify(job)
+                result = await run(job)
+                if result is not None:
+                    job.rows = list(result)
+                if not job.is_cancelled:
+                    job.status = ReportJob.DONE
+        except (asyncio.CancelledError, ReportJobCancelled):
+            job.status = ReportJob.CANCELLED
+        except Exception as e:
+            job.status = ReportJob.FAILED
+            job.error = str(e)
+            print(f"Erreur lors de la génération du rapport '{job.title}' : {e}")
+        finally:
+            job.finished_at = datetime.now()
+            self._active.pop(job.id, None)
+            if job._generation == self._generation:
+                self._recent.appendleft(job)
+            self._notify(job)
+
+    def cancel(self, job_id: int) -> bool:
+        job = self._active.get(job_id)
+        if job is None or job.is_finished:
+            return False
+        # Le statut est posé avant l'annulation pour arrêter aussi un export en thread
+        job.status = ReportJob.CANCELLED
+        if job._task is not None:
+            job._task.cancel()
+        return True
+
+    def cancel_all(self) -> None:
+        for job_id in list(self._active):
+            self.cancel(job_id)
+
+    def remove(self, job_id: int) -> None:
+        """Retirer un travail terminé de la liste des rapports récents"""
+        for job in list(self._recent):
+            if job.id == job_id:
+                self._recent.remove(job)
+                self._notify(job)
+
+    def clear(self) -> None:
+        """Annuler les travaux en cours et oublier les résultats (déconnexion)"""
+        self._generation += 1
+        self.cancel_all()
+        self._recent.clear()
+
+    def get(self, job_id: int) -> Optional[ReportJob]:
+        job = self._active.get(job_id)
+        if job is not None:
+            return job
+        return next((job for job in self._recent if job.id == job_id), None)
+
+    @property
+    def active_jobs(self) -> List[ReportJob]:
+        return list(self._active.values())
+
+    @property
+    def recent_jobs(self) -> List[ReportJob]:
+        return list(self._recent)
+
+    @property
+    def jobs(self) -> List[ReportJob]:
+        """Travaux en cours puis terminés, du plus récent au plus ancien"""
+        return sorted(self._active.values(), key=lambda job: -job.id) + list(
+            self._recent
+        )
+
+    # ------------------------------------------------------------------
+    # Abonnements
+    def subscribe(self, callback: Callable[[ReportJob], Any]) -> Callable[[], None]:
+        """S'abonner aux changements des travaux (callback synchrone ou async).
+
+        Les méthodes liées sont gardées par référence faible, comme dans
+        `DataStore`. Retourne une fonction de désabonnement.
+        """
+        reference = (
+            weakref.WeakMethod(callback)
+            if inspect.ismethod(callback)
+            else (lambda: callback)
+        )
+        self._subscribers.append(reference)
+
+        def unsubscribe() -> None:
+            if reference in self._subscribers:
+                self._subscribers.remove(reference)
+
+        return unsubscribe
+
+    def _notify(self, job: ReportJob) -> None:
+        self._subscribers[:] = [
+            reference for reference in self._subscribers if reference()
+        ]
+        for reference in list(self._subscribers):
+            callback = reference()
+            if callback is None:
+                continue
+            try:
+                result = callback(job)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                print(f"Erreur dans un abonné aux rapports : {e}")
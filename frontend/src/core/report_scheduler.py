@@ -0,0 +1,288 @@
+"""Génération planifiée de rapports sur disque (expressions de type cron)"""
+
+import asyncio
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# run(dossier daté, heure planifiée) -> fichier écrit
+ScheduledRun = Callable[[Path, datetime], Awaitable[Optional[Path]]]
+
+
+class CronSchedule:
+    """Expression cron à cinq champs : « minute heure jour mois jour_semaine ».
+
+    Chaque champ accepte `*`, une valeur, une liste (`1,15`), un intervalle
+    (`1-5`) et un pas (`*/15`, `8-18/2`). Le jour de la semaine va de 0
+    (dimanche) à 6, 7 étant aussi accepté pour dimanche. Comme cron, si le
+    jour du mois et le jour de la semaine sont tous deux restreints, une
+    date qui correspond à l'un des deux suffit.
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str) -> None:
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expression cron invalide : {expression!r}")
+        self.expression = expression
+        fields = [
+            self._parse_field(part, low, high)
+            for part, (low, high) in zip(parts, self.FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        # 7 et 0 désignent tous deux le dimanche
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse_field(text: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in text.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Pas cron invalide : {text!r}")
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_text, end_text = item.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high):
+                raise ValueError(f"Valeur cron hors limites : {text!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        # date.weekday() : lundi = 0 ; cron : dimanche = 0
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def _times(self, day: date) -> List[datetime]:
+        return [
+            datetime(day.year, day.month, day.day, hour, minute)
+            for hour in sorted(self.hours)
+            for minute in sorted(self.minutes)
+        ]
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Première occurrence strictement après `moment`"""
+        day = moment.date()
+        # Une expression valide se produit au moins une fois en 8 ans (29 février)
+        for _ in range(366 * 8):
+            if self.matches_day(day):
+                for candidate in self._times(day):
+                    if candidate > moment:
+                        return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Expression cron sans occurrence : {self.expression!r}")
+
+    def previous_before(self, moment: datetime) -> datetime:
+        """Dernière occurrence au plus tard à `moment`"""
+        day = moment.date()
+        for _ in range(366 * 8):
+            if self.matches_day(day):
+                for candidate in reversed(self._times(day)):
+                    if candidate <= moment:
+                        return candidate
+            day -= timedelta(days=1)
+        raise ValueError(f"Expression cron sans occurrence : {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"<CronSchedule {self.expression}>"
+
+
+class ScheduledReport:
+    """Un rapport planifié : son nom (nom du fichier), sa planification et sa génération"""
+
+    def __init__(self, name: str, cron: str, run: ScheduledRun) -> None:
+        self.name = name
+        self.schedule = CronSchedule(cron)
+        self.run = run
+        self.last_run: Optional[datetime] = None
+        self.last_output: Optional[Path] = None
+        self.last_error: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"<ScheduledReport {self.name} {self.schedule.expression}>"
+
+
+class ReportScheduler:
+    """Génère les rapports planifiés en tâche de fond, dans un dossier par jour.
+
+    Chaque occurrence écrit `<output_dir>/<AAAA-MM-JJ>/<nom>.<ext>` (date de
+    l'heure planifiée). Au démarrage, les occurrences manquées depuis moins
+    de `catch_up_hours` (application fermée la nuit) sont rattrapées si leur
+    fichier n'existe pas. Les dossiers datés de plus de `retention_days`
+    jours sont supprimés après chaque passage.
+
+    La boucle dort jusqu'à la prochaine occurrence, par tranches d'au plus
+    `max_sleep` secondes pour suivre un changement d'horloge ou une mise
+    en veille. Les rapports s'exécutent l'un après l'autre ; une erreur est
+    affichée et n'arrête pas la planification.
+    """
+
+    FOLDER_FORMAT = "%Y-%m-%d"
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        retention_days: int = 30,
+        catch_up_hours: float = 24,
+        max_sleep: float = 300,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.retention_days = retention_days
+        self.catch_up_hours = catch_up_hours
+        self.max_sleep = max_sleep
+        self.clock = clock
+        self._reports: Dict[str, ScheduledReport] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Rapports
+    def add(self, name: str, cron: str, run: ScheduledRun) -> ScheduledReport:
+        report = ScheduledReport(name, cron, run)
+        self._reports[name] = report
+        return report
+
+    @property
+    def reports(self) -> List[ScheduledReport]:
+        return list(self._reports.values())
+
+    def folder_for(self, moment: datetime) -> Path:
+        return self.output_dir / moment.strftime(self.FOLDER_FORMAT)
+
+    def output_exists(self, report: ScheduledReport, moment: datetime) -> bool:
+        folder = self.folder_for(moment)
+        return folder.is_dir() and any(folder.glob(f"{report.name}.*"))
+
+    async def run_report(
+        self, report: ScheduledReport, scheduled_at: Optional[datetime] = None
+    ) -> Optional[Path]:
+        """Générer un rapport maintenant (dans le dossier de `scheduled_at`)"""
+        scheduled_at = scheduled_at or self.clock()
+        folder = self.folder_for(scheduled_at)
+        try:
+            await asyncio.to_thread(folder.mkdir, parents=True, exist_ok=True)
+            report.last_output = await report.run(folder, scheduled_at)
+            report.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            report.last_error = str(e)
+            print(f"Erreur lors du rapport planifié '{report.name}' : {e}")
+        report.last_run = self.clock()
+        return report.last_output
+
+    # ------------------------------------------------------------------
+    # Boucle
+    def start(self) -> None:
+        """Démarrer la planification (depuis la boucle d'événements)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def next_run(
+        self, now: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], List[ScheduledReport]]:
+        """Prochaine heure planifiée et rapports à générer à cette heure"""
+        now = now or self.clock()
+        upcoming: Dict[datetime, List[ScheduledReport]] = {}
+        for report in self._reports.values():
+            upcoming.setdefault(report.schedule.next_after(now), []).append(report)
+        if not upcoming:
+            return None, []
+        moment = min(upcoming)
+        return moment, upcoming[moment]
+
+    async def catch_up(self) -> None:
+        """Générer les occurrences récentes manquées (fichier absent)"""
+        now = self.clock()
+        oldest = now - timedelta(hours=self.catch_up_hours)
+        for report in list(self._reports.values()):
+            moment = report.schedule.previous_before(now)
+            if moment >= oldest and not await asyncio.to_thread(
+                self.output_exists, report, moment
+            ):
+                await self.run_report(report, moment)
+
+    async def _loop(self) -> None:
+        await self.catch_up()
+        await asyncio.to_thread(self.cleanup)
+        while True:
+            moment, due = self.next_run()
+            if moment is None:
+                return
+            while (delay := (moment - self.clock()).total_seconds()) > 0:
+                await asyncio.sleep(min(delay, self.max_sleep))
+            for report in due:
+                await self.run_report(report, moment)
+            await asyncio.to_thread(self.cleanup)
+
+    # ------------------------------------------------------------------
+    # Dossiers
+    def dated_folders(self) -> List[Tuple[date, Path]]:
+        """Dossiers de sortie datés, du plus récent au plus ancien"""
+        folders = []
+        if not self.output_dir.is_dir():
+            return folders
+        for path in self.output_dir.iterdir():
+            try:
+                day = datetime.strptime(path.name, self.FOLDER_FORMAT).date()
+            except ValueError:
+                continue
+            if path.is_dir():
+                folders.append((day, path))
+        return sorted(folders, reverse=True)
+
+    def latest_outputs(self) -> Tuple[Optional[date], List[Path]]:
+        """Fichiers du dossier daté le plus récent (vue du matin)"""
+        for day, folder in self.dated_folders():
+            files = sorted(
+                path
+                for path in folder.iterdir()
+                if path.is_file() and not path.name.startswith(".")
+            )
+            if files:
+                return day, files
+        return None, []
+
+    def cleanup(self, today: Optional[date] = None) -> List[Path]:
+        """Supprimer les dossiers datés de plus de `retention_days` jours"""
+        if self.retention_days <= 0:
+            return []
+        today = today or self.clock().date()
+        limit = today - timedelta(days=self.retention_days)
+        removed = []
+        for day, folder in self.dated_folders():
+            if day < limit:
+                shutil.rmtree(folder, ignore_errors=True)
+                removed.append(folder)
+        return removed
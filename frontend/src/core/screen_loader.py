@@ -0,0 +1,93 @@
+"""Chargements d'écrans suivis, annulables et protégés contre les résultats périmés"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+class ScreenLoader:
+    """Une tâche de chargement au plus par écran.
+
+    Lancer le chargement d'un écran annule le précédent chargement du même
+    écran (et, avec `exclusive=True`, ceux des autres écrans : l'utilisateur
+    a changé d'onglet). Une tâche annulée s'arrête à son prochain `await`,
+    donc un résultat arrivé trop tard n'est jamais affiché dans un écran
+    qui n'est plus visible.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._completed: Set[str] = set()
+
+    def load(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        exclusive: bool = False,
+    ) -> asyncio.Task:
+        """Lancer `loader()` pour l'écran `name` en remplaçant le chargement en cours"""
+        if exclusive:
+            for other in list(self._tasks):
+                if other != name:
+                    self.cancel(other)
+        self.cancel(name)
+        self._completed.discard(name)
+        task = asyncio.create_task(self._run(name, loader))
+        self._tasks[name] = task
+        return task
+
+    async def _run(self, name: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await loader()
+            if self._tasks.get(name) is asyncio.current_task():
+                self._completed.add(name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Erreur lors du chargement de l'écran '{name}' : {e}")
+        finally:
+            if self._tasks.get(name) is asyncio.current_task():
+                del self._tasks[name]
+
+    def cancel(self, name: str) -> None:
+        task = self._tasks.pop(name, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def cancel_all(self) -> None:
+        for name in list(self._tasks):
+            self.cancel(name)
+        self._completed.clear()
+
+    def is_loading(self, name: str) -> bool:
+        task = self._tasks.get(name)
+        return task is not None and not task.done()
+
+    def is_busy(self) -> bool:
+        """Au moins un écran est en cours de chargement"""
+        return any(not task.done() for task in self._tasks.values())
+
+    def has_loaded(self, name: str) -> bool:
+        """Le dernier chargement de l'écran est allé jusqu'au bout"""
+        return name in self._completed
+
+    def current_task(self, name: str) -> Optional[asyncio.Task]:
+        return self._tasks.get(name)
+
+    @staticmethod
+    async def gather(
+        *queries: Awaitable[Any], fallback: Any = (False, [])
+    ) -> List[Any]:
+        """Lancer des requêtes indépendantes en parallèle.
+
+        Une requête en erreur est remplacée par `fallback` (le `(bool, data)`
+        des services) au lieu de faire échouer tout le chargement. Si le
+        chargement est annulé, toutes les requêtes le sont aussi.
+        """
+        results = await asyncio.gather(*queries, return_exceptions=True)
+        for index, result in enumerate(results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                print(f"Erreur lors d'une requête de chargement : {result}")
+                results[index] = fallback
+        return results
@@ -0,0 +1,137 @@
+"""Cache en mémoire des paramètres de l'application (table `settings`)"""
+
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List
+
+from models.settings_model import SettingsModel
+
+
+class SettingsStore:
+    """Cache des paramètres avec écriture immédiate (write-through) vers l'API.
+
+    Toutes les lignes de `list_settings` sont chargées une seule fois, puis
+    les lectures sont servies depuis la mémoire. `set` écrit d'abord en base
+    puis met à jour le cache et prévient les abonnés de la clé modifiée.
+    """
+
+    ALL_KEYS = "*"
+
+    _TRUE_VALUES = ("1", "true", "yes", "oui", "on")
+
+    def __init__(self, api_client) -> None:
+        self.api_client = api_client
+        self._settings: Dict[str, SettingsModel] = {}
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._loaded: bool = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self, force: bool = False) -> None:
+        """Charger tous les paramètres en une seule requête"""
+        if self._loaded and not force:
+            return
+        async with self._load_lock:
+            if self._loaded and not force:
+                return
+            try:
+                settings = await self.api_client.list_settings()
+            except Exception as e:
+                print(f"Erreur lors du chargement des paramètres : {e}")
+                return
+            self._settings = {setting.key: setting for setting in settings}
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        """Vider le cache (le prochain `load` relira la base)"""
+        self._settings.clear()
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Lecture
+    def get(self, key: str, default: str | None = None) -> str | None:
+        setting = self._settings.get(key)
+        return setting.value if setting else default
+
+    def get_str(self, key: str, default: str = "") -> str:
+        value = self.get(key)
+        return value if value is not None else default
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        try:
+            return int(self.get(key))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        try:
+            return float(self.get(key))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in self._TRUE_VALUES
+
+    def as_dict(self) -> Dict[str, str]:
+        return {key: setting.value for key, setting in self._settings.items()}
+
+    # ------------------------------------------------------------------
+    # Écriture
+    async def set(self, key: str, value: Any, description: str = "") -> bool:
+        """Enregistrer un paramètre en base puis mettre à jour le cache"""
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        value = str(value)
+
+        previous = self._settings.get(key)
+        if not description and previous:
+            description = previous.description or ""
+
+        success = await self.api_client.set_setting(key, value, description)
+        if not success:
+            return False
+
+        self._settings[key] = SettingsModel(
+            id_settings=previous.id_settings if previous else 0,
+            key=key,
+            value=value,
+            description=description,
+        )
+        if previous is None or previous.value != value:
+            await self._notify(key, value)
+        return True
+
+    # ------------------------------------------------------------------
+    # Abonnements
+    def subscribe(self, key: str, callback: Callable) -> Callable[[], None]:
+        """S'abonner aux changements d'une clé (ou de toutes avec `ALL_KEYS`).
+
+        Le callback reçoit `(key, value)` et peut être synchrone ou async.
+        Retourne une fonction de désabonnement.
+        """
+        self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+        return unsubscribe
+
+    async def _notify(self, key: str, value: str) -> None:
+        callbacks = self._subscribers.get(key, []) + self._subscribers.get(
+            self.ALL_KEYS, []
+        )
+        for callback in list(callbacks):
+            try:
+                result = callback(key, value)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Erreur dans un abonné au paramètre '{key}' : {e}")
@@ -0,0 +1,188 @@
+"""Instantané local du tableau de bord pour un démarrage instantané"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from models.classroom_model import ClassroomModel
+from models.fee_model import FeeModel
+from models.school_year_model import SchoolYearModel
+
+from .reference_cache import ReferenceCache
+
+SNAPSHOT_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "cache" / "warm_start.json"
+)
+
+
+class WarmStartSnapshot:
+    """Dernier résumé du tableau de bord et listes de référence, sur disque.
+
+    Après chaque chargement réussi, le résumé, les classes, les frais, les
+    années scolaires et les versions des tables lues (`get_data_versions`)
+    sont écrits dans un fichier JSON. Au lancement suivant, le tableau de
+    bord s'affiche tout de suite depuis ce fichier et le cache de référence
+    en est pré-rempli ; `revalidate` compare ensuite les versions avec la
+    base (une seule petite requête) et seules les données dont une table a
+    changé sont rechargées.
+    """
+
+    FORMAT = 1
+
+    # Tables lues par `get_dashboard_summary` et par les listes de référence
+    TABLES = (
+        "school_years",
+        "classrooms",
+        "students",
+        "enrollments",
+        "fees",
+        "payments",
+        "expenses",
+        "staff_payments",
+    )
+
+    # Clés de `ReferenceCache` à invalider quand une table a changé
+    REFERENCE_KEYS = {
+        "school_years": (
+            ReferenceCache.ACTIVE_SCHOOL_YEAR,
+            ReferenceCache.SCHOOL_YEARS,
+        ),
+        "classrooms": (ReferenceCache.CLASSROOMS,),
+        "fees": (ReferenceCache.FEES,),
+    }
+
+    def __init__(self, app_state, path: Path | str | None = None) -> None:
+        self.app_state = app_state
+        self.path = Path(path) if path else SNAPSHOT_PATH
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._read = False
+
+    # ------------------------------------------------------------------
+    # Lecture
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if not self._read:
+            self._read = True
+            try:
+                with self.path.open("r", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+            except FileNotFoundError:
+                snapshot = None
+            except (OSError, ValueError) as e:
+                print(f"Instantané de démarrage illisible : {e}")
+                snapshot = None
+            if snapshot is not None and snapshot.get("format") != self.FORMAT:
+                snapshot = None
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def restore(self) -> Optional[Dict[str, Any]]:
+        """Résumé du tableau de bord de l'instantané (None si absent).
+
+        Le cache de référence est pré-rempli avec les listes de l'instantané
+        (sans écraser des valeurs déjà chargées).
+        """
+        snapshot = self._load()
+        if snapshot is None:
+            return None
+        reference = snapshot.get("reference", {})
+        reference_data = self.app_state.reference_data
+        try:
+            active = reference.get("active_school_year")
+            reference_data.seed(
+                ReferenceCache.ACTIVE_SCHOOL_YEAR,
+                SchoolYearModel.from_dict(active) if active else None,
+            )
+            reference_data.seed(
+                ReferenceCache.SCHOOL_YEARS,
+                [SchoolYearModel.from_dict(data) for data in reference["school_years"]],
+            )
+            reference_data.seed(
+                ReferenceCache.CLASSROOMS,
+                [ClassroomModel.from_dict(data) for data in reference["classrooms"]],
+            )
+            reference_data.seed(
+                ReferenceCache.FEES,
+                [FeeModel.from_dict(data) for data in reference["fees"]],
+            )
+        except (KeyError, TypeError) as e:
+            print(f"Instantané de démarrage incomplet : {e}")
+            reference_data.invalidate()
+            self._snapshot = None
+            return None
+        return snapshot.get("dashboard_summary")
+
+    # ------------------------------------------------------------------
+    # Revalidation
+    async def fetch_versions(self) -> Dict[str, int]:
+        return await self.app_state.api_client.get_data_versions(self.TABLES)
+
+    async def revalidate(self) -> bool:
+        """Comparer les versions de l'instantané à celles de la base.
+
+        Retourne True si l'instantané est à jour. Sinon, les données de
+        référence des tables modifiées sont invalidées pour être relues.
+        """
+        snapshot = self._load()
+        if snapshot is None:
+            return False
+        saved = snapshot.get("versions", {})
+        try:
+            current = await self.fetch_versions()
+        except Exception as e:
+            print(f"Erreur lors de la lecture des versions de données : {e}")
+            return False
+        changed = [
+            table for table in self.TABLES if saved.get(table) != current.get(table)
+        ]
+        keys = [key for table in changed for key in self.REFERENCE_KEYS.get(table, ())]
+        if keys:
+            self.app_state.invalidate_reference_data(*keys)
+        return not changed
+
+    # ------------------------------------------------------------------
+    # Écriture
+    async def save(self, summary: Dict[str, Any], versions: Dict[str, int]) -> None:
+        """Enregistrer le résumé avec les versions lues *avant* son chargement"""
+        reference_data = self.app_state.reference_data
+        active = await reference_data.get_active_school_year()
+        snapshot = {
+            "format": self.FORMAT,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "versions": versions,
+            "dashboard_summary": summary,
+            "reference": {
+                "active_school_year": active.to_dict() if active else None,
+                "school_years": [
+                    school_year.to_dict()
+                    for school_year in await reference_data.get_school_years()
+                ],
+                "classrooms": [
+                    classroom.to_dict()
+                    for classroom in await reference_data.get_classrooms()
+                ],
+                "fees": [fee.to_dict() for fee in await reference_data.get_fees()],
+            },
+        }
+        try:
+            await asyncio.to_thread(self._write, snapshot)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Erreur lors de l'écriture de l'instantané de démarrage : {e}")
+            return
+        self._snapshot = snapshot
+        self._read = True
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        with temporary.open("w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False)
+        # Remplacement atomique : jamais de fichier à moitié écrit
+        os.replace(temporary, self.path)
+
+    def clear(self) -> None:
+        self._snapshot = None
+        self._read = True
+        self.path.unlink(missing_ok=True)
@@ -3,14 +3,28 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from collections import defaultdict
+from calendar import monthrange
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
 import aiosqlite
 from aiosqlite import Connection, Row
 
-from data.fake.fake_data import FAKE_DB_PATH, initialize_fake_database
+from data.fake.fake_data import (
+    DATA_VERSION_TABLES,
+    DATA_VERSIONS_SCRIPT,
+    FAKE_DB_PATH,
+    FINANCIAL_CUBE_SCRIPT,
+    FINANCIAL_CUBE_SOURCES,
+    SCHOOL_YEAR_INDEXES,
+    SCHOOL_YEAR_INDEXES_SCRIPT,
+    classroom_of,
+    financial_cube_rebuild_statements,
+    initialize_fake_database,
+)
 from models.cash_register_model import CashRegisterModel
 from models.classroom_model import ClassroomModel
 from models.enrollment_model import EnrollmentModel
@@ -31,6 +45,21 @@ from models.audit_log_model import AuditLogModel
 class FakeApiClient:
     """Client simulant des endpoints REST pour les besoins de développement."""
 
+    # Tables "chaudes" dont les années clôturées sont déplacées dans l'archive
+    ARCHIVE_TABLES = ("payments", "cash_register", "enrollments", "audit_logs")
+    ARCHIVE_SCHEMA = "archive"
+    # Dimensions de regroupement de get_financial_totals
+    FINANCIAL_DIMENSIONS = (
+        "source",
+        "school_year_id",
+        "month",
+        "classroom_id",
+        "payment_type_id",
+        "student_id",
+    )
+    # Tables du grand livre exportées pour l'analyse (stream_ledger)
+    LEDGER_TABLES = ("payments", "expenses", "staff_payments", "cash_register")
+
     def __init__(
         self,
         db_path: Path | str | None = None,
@@ -38,11 +67,18 @@ class FakeApiClient:
         auto_seed: bool = True,
     ) -> None:
         self._db_path = Path(db_path) if db_path else FAKE_DB_PATH
+        self._archive_path = self._db_path.with_name(
+            f"{self._db_path.stem}_archive{self._db_path.suffix}"
+        )
         if auto_seed or not self._db_path.exists():
             initialize_fake_database(self._db_path, seed=seed)
+            # Une archive issue d'un ancien jeu de données n'a plus de sens
+            self._archive_path.unlink(missing_ok=True)
 
         self._connection: Optional[Connection] = None
         self._connection_lock = asyncio.Lock()
+        self._archive_attached = False
+        self._archived_year_ids: set[int] = set()
 
     # ------------------------------------------------------------------
     # Lifecycle helpers
@@ -59,11 +95,14 @@ class FakeApiClient:
         if self._connection is not None:
             await self._connection.close()
             self._connection = None
+            self._archive_attached = False
 
     async def reset(self, seed: int | None = None) -> None:
         """Re-génère la base de données avec un nouveau jeu de données."""
         await self.close()
         initialize_fake_database(self._db_path, seed=seed)
+        self._archive_path.unlink(missing_ok=True)
+        self._archived_year_ids = set()
 
     async def _ensure_connection(self) -> Connection:
         """Crée une connexion aiosqlite si nécessaire et la réutilise."""
@@ -73,9 +112,86 @@ class FakeApiClient:
                 if self._connection is None:
                     connection = await aiosqlite.connect(self._db_path)
                     connection.row_factory = Row
+                    await connection.executescript(SCHOOL_YEAR_INDEXES_SCRIPT)
+                    await connection.executescript(DATA_VERSIONS_SCRIPT)
+                    await connection.executescript(FINANCIAL_CUBE_SCRIPT)
+                    if self._archive_path.exists():
+                        await self._attach_archive(connection)
+                    async with connection.execute(
+                        "SELECT 1 FROM financial_cube LIMIT 1"
+                    ) as cursor:
+                        cube_filled = await cursor.fetchone() is not None
+                    if not cube_filled:
+                        # Base créée avant le cube : calcul initial depuis les tables
+                        await self._rebuild_financial_cube(connection)
                     self._connection = connection
         return self._connection
 
+    async def _attach_archive(self, connection: Connection) -> None:
+        """Attache la base d'archive et crée les vues UNION (chaude + archive)."""
+
+        schema = self.ARCHIVE_SCHEMA
+        await connection.execute(
+            f"ATTACH DATABASE ? AS {schema}", (str(self._archive_path),)
+        )
+        for table in self.ARCHIVE_TABLES:
+            async with connection.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ) as cursor:
+                row = await cursor.fetchone()
+            # Même définition que la table chaude pour garder l'ordre des colonnes
+            await connection.execute(
+                row[0].replace(
+                    f"CREATE TABLE {table}",
+                    f"CREATE TABLE IF NOT EXISTS {schema}.{table}",
+                    1,
+                )
+            )
+            # Les vues permanentes ne peuvent pas référencer une autre base
+            await connection.execute(
+                f"""
+                CREATE TEMP VIEW IF NOT EXISTS {table}_all AS
+                SELECT * FROM main.{table} UNION ALL SELECT * FROM {schema}.{table}
+                """
+            )
+        for statement in SCHOOL_YEAR_INDEXES:
+            table = statement.split(" ON ")[1].split()[0]
+            if table in self.ARCHIVE_TABLES:
+                await connection.execute(
+                    statement.replace("EXISTS ", f"EXISTS {schema}.", 1)
+                )
+        await connection.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {schema}.archived_school_years (
+                school_year_id INTEGER PRIMARY KEY,
+                archived_at TEXT NOT NULL,
+                row_counts TEXT NOT NULL
+            )
+            """
+        )
+        await connection.commit()
+        async with connection.execute(
+            f"SELECT school_year_id FROM {schema}.archived_school_years"
+        ) as cursor:
+            self._archived_year_ids = {row[0] for row in await cursor.fetchall()}
+        self._archive_attached = True
+
+    async def _get_source_table(self, table: str, school_year_id: int | None) -> str:
+        """
+        Returns the table (or view) to read for a school year.
+        Active years stay on the hot table, archived years are read from the
+        archive database and school_year_id=None reads the UNION view.
+        """
+        await self._ensure_connection()
+        if not self._archived_year_ids or table not in self.ARCHIVE_TABLES:
+            return table
+        if school_year_id is None:
+            return f"{table}_all"
+        if school_year_id in self._archived_year_ids:
+            return f"{self.ARCHIVE_SCHEMA}.{table}"
+        return table
+
     def _get_deletion_filter(self, deletion_status: str, table_alias: str = "") -> str:
         """
         Returns the SQL filter condition based on deletion_status.
@@ -88,6 +204,18 @@ class FakeApiClient:
             return f"{prefix}is_deleted = 1"
         return "1=1"  # No filter
 
+    def _get_school_year_filter(
+        self, school_year_id: int | None, table_alias: str = ""
+    ) -> tuple[str, tuple]:
+        """
+        Returns the SQL filter condition and parameters restricting rows to a school year.
+        school_year_id: None means every school year.
+        """
+        if school_year_id is None:
+            return "1=1", ()
+        prefix = f"{table_alias}." if table_alias else ""
+        return f"{prefix}school_year_id = ?", (school_year_id,)
+
     # ------------------------------------------------------------------
     # Users & Roles
     async def list_roles(self, deletion_status: str = "active") -> List[RoleModel]:
@@ -260,11 +388,14 @@ class FakeApiClient:
         return [StudentModel(**dict(row)) for row in rows]
 
     async def list_enrollments(
-        self, deletion_status: str = "active"
+        self, deletion_status: str = "active", school_year_id: int | None = None
     ) -> List[EnrollmentModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
+        source = await self._get_source_table("enrollments", school_year_id)
         rows = await self._fetch_all(
-            f"SELECT * FROM enrollments WHERE {filter_clause} ORDER BY id_enrollment"
+            f"SELECT * FROM {source} WHERE {year_clause} AND {filter_clause} ORDER BY id_enrollment",
+            year_params,
         )
         return [EnrollmentModel(**dict(row)) for row in rows]
 
@@ -272,8 +403,9 @@ class FakeApiClient:
         self, student_id: int, deletion_status: str = "active"
     ) -> List[EnrollmentModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        source = await self._get_source_table("enrollments", None)
         rows = await self._fetch_all(
-            f"SELECT * FROM enrollments WHERE student_id = ? AND {filter_clause} ORDER BY id_enrollment",
+            f"SELECT * FROM {source} WHERE student_id = ? AND {filter_clause} ORDER BY id_enrollment",
             (student_id,),
         )
         return [EnrollmentModel(**dict(row)) for row in rows]
@@ -342,11 +474,14 @@ class FakeApiClient:
         return [PaymentTypeModel(**dict(row)) for row in rows]
 
     async def list_payments(
-        self, deletion_status: str = "active"
+        self, deletion_status: str = "active", school_year_id: int | None = None
     ) -> List[PaymentModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
+        source = await self._get_source_table("payments", school_year_id)
         rows = await self._fetch_all(
-            f"SELECT * FROM payments WHERE {filter_clause} ORDER BY payment_date DESC"
+            f"SELECT * FROM {source} WHERE {year_clause} AND {filter_clause} ORDER BY payment_date DESC",
+            year_params,
         )
         return [PaymentModel(**dict(row)) for row in rows]
 
@@ -354,8 +489,9 @@ class FakeApiClient:
         self, student_id: int, deletion_status: str = "active"
     ) -> List[PaymentModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        source = await self._get_source_table("payments", None)
         rows = await self._fetch_all(
-            f"SELECT * FROM payments WHERE student_id = ? AND {filter_clause} ORDER BY payment_date DESC",
+            f"SELECT * FROM {source} WHERE student_id = ? AND {filter_clause} ORDER BY payment_date DESC",
             (student_id,),
         )
         return [PaymentModel(**dict(row)) for row in rows]
@@ -391,11 +527,13 @@ class FakeApiClient:
     # ------------------------------------------------------------------
     # Expenses & staff
     async def list_expenses(
-        self, deletion_status: str = "active"
+        self, deletion_status: str = "active", school_year_id: int | None = None
     ) -> List[ExpenseModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
         rows = await self._fetch_all(
-            f"SELECT * FROM expenses WHERE {filter_clause} ORDER BY expense_date DESC"
+            f"SELECT * FROM expenses WHERE {year_clause} AND {filter_clause} ORDER BY expense_date DESC",
+            year_params,
         )
         return [ExpenseModel(**dict(row)) for row in rows]
 
@@ -407,14 +545,49 @@ class FakeApiClient:
         return [StaffModel(**dict(row)) for row in rows]
 
     async def list_staff_payments(
-        self, deletion_status: str = "active"
+        self, deletion_status: str = "active", school_year_id: int | None = None
     ) -> List[StaffPaymentModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
         rows = await self._fetch_all(
-            f"SELECT * FROM staff_payments WHERE {filter_clause} ORDER BY payment_date DESC"
+            f"SELECT * FROM staff_payments WHERE {year_clause} AND {filter_clause} ORDER BY payment_date DESC",
+            year_params,
         )
         return [StaffPaymentModel(**dict(row)) for row in rows]
 
+    async def stream_staff_payments(
+        self,
+        school_year_id: int | None = None,
+        staff_id: int | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Staff payments joined with the staff name, read `batch_size` rows at a time"""
+        year_clause, parameters = self._get_school_year_filter(school_year_id, "sp")
+        conditions = [year_clause, self._get_deletion_filter("active", "sp")]
+        parameters = list(parameters)
+        if staff_id is not None:
+            conditions.append("sp.staff_id = ?")
+            parameters.append(staff_id)
+        if start_date:
+            conditions.append("sp.payment_date >= ?")
+            parameters.append(start_date)
+        if end_date:
+            conditions.append("sp.payment_date <= ?")
+            parameters.append(end_date)
+        query = f"""
+            SELECT sp.id_staff_payment AS id,
+                   COALESCE(s.first_name || ' ' || s.last_name, '') AS staff_name,
+                   sp.payment_date, sp.amount
+            FROM staff_payments sp
+            LEFT JOIN staff s ON s.id_staff = sp.staff_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY sp.payment_date DESC, sp.id_staff_payment DESC
+        """
+        async for row in self._stream_rows(query, parameters, batch_size):
+            yield row
+
     async def list_staff_payments_by_staff(
         self, staff_id: int, deletion_status: str = "active"
     ) -> List[StaffPaymentModel]:
@@ -470,14 +643,44 @@ class FakeApiClient:
     # ------------------------------------------------------------------
     # Cash register & dashboard
     async def list_cash_register_entries(
-        self, deletion_status: str = "active"
+        self, deletion_status: str = "active", school_year_id: int | None = None
     ) -> List[CashRegisterModel]:
         filter_clause = self._get_deletion_filter(deletion_status)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
+        source = await self._get_source_table("cash_register", school_year_id)
         rows = await self._fetch_all(
-            f"SELECT * FROM cash_register WHERE {filter_clause} ORDER BY date DESC"
+            f"SELECT * FROM {source} WHERE {year_clause} AND {filter_clause} ORDER BY date DESC",
+            year_params,
         )
         return [CashRegisterModel(**dict(row)) for row in rows]
 
+    async def stream_cash_register_entries(
+        self,
+        school_year_id: int | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Cash register entries of a period, read `batch_size` rows at a time"""
+        source = await self._get_source_table("cash_register", school_year_id)
+        year_clause, parameters = self._get_school_year_filter(school_year_id)
+        conditions = [year_clause, self._get_deletion_filter("active")]
+        parameters = list(parameters)
+        if start_date:
+            conditions.append("date >= ?")
+            parameters.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            parameters.append(end_date)
+        query = f"""
+            SELECT id_cash AS id, date, type, description, amount
+            FROM {source}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY date DESC, id_cash DESC
+        """
+        async for row in self._stream_rows(query, parameters, batch_size):
+            yield row
+
     async def create_cash_register_entry(
         self,
         school_year_id: int,
@@ -527,21 +730,22 @@ class FakeApiClient:
     ) -> Dict[str, float]:
         """Get cash register statistics"""
         # Assuming we only want active entries for statistics
+        source = await self._get_source_table("cash_register", school_year_id)
         if school_year_id:
             total_in = await self._scalar(
-                "SELECT SUM(amount) FROM cash_register WHERE type = 'Entrée' AND school_year_id = ? AND is_deleted = 0",
+                f"SELECT SUM(amount) FROM {source} WHERE type = 'Entrée' AND school_year_id = ? AND is_deleted = 0",
                 (school_year_id,),
             )
             total_out = await self._scalar(
-                "SELECT SUM(amount) FROM cash_register WHERE type = 'Sortie' AND school_year_id = ? AND is_deleted = 0",
+                f"SELECT SUM(amount) FROM {source} WHERE type = 'Sortie' AND school_year_id = ? AND is_deleted = 0",
                 (school_year_id,),
             )
         else:
             total_in = await self._scalar(
-                "SELECT SUM(amount) FROM cash_register WHERE type = 'Entrée' AND is_deleted = 0"
+                f"SELECT SUM(amount) FROM {source} WHERE type = 'Entrée' AND is_deleted = 0"
             )
             total_out = await self._scalar(
-                "SELECT SUM(amount) FROM cash_register WHERE type = 'Sortie' AND is_deleted = 0"
+                f"SELECT SUM(amount) FROM {source} WHERE type = 'Sortie' AND is_deleted = 0"
             )
 
         balance = (total_in or 0.0) - (total_out or 0.0)
@@ -650,35 +854,207 @@ class FakeApiClient:
             user_id=user_id,
         )
 
-    async def get_dashboard_summary(self) -> Dict[str, float]:
+    async def get_data_versions(
+        self, tables: Iterable[str] | None = None
+    ) -> Dict[str, int]:
+        """Version courante des tables données (toutes si non précisées).
+
+        Une version change à chaque écriture dans la table : deux lectures
+        égales garantissent que son contenu n'a pas changé entre-temps.
+        """
+        tables = list(tables) if tables is not None else list(DATA_VERSION_TABLES)
+        if not tables:
+            return {}
+        placeholders = ", ".join("?" for _ in tables)
+        rows = await self._fetch_all(
+            f"SELECT table_name, version FROM data_versions WHERE table_name IN ({placeholders})",
+            tables,
+        )
+        return {row["table_name"]: row["version"] for row in rows}
+
+    # ------------------------------------------------------------------
+    # Cube financier
+    def _rows_table(self, table: str) -> str:
+        """Table ou vue contenant toutes les lignes (chaudes et archivées)"""
+        if self._archived_year_ids and table in self.ARCHIVE_TABLES:
+            return f"{table}_all"
+        return table
+
+    async def _rebuild_financial_cube(
+        self, connection: Connection, school_year_id: int | None = None
+    ) -> None:
+        sources = {
+            table: self._rows_table(table)
+            for table, *_ in FINANCIAL_CUBE_SOURCES.values()
+        }
+        for statement in financial_cube_rebuild_statements(
+            sources, self._rows_table("enrollments"), school_year_id
+        ):
+            await connection.execute(statement)
+        await connection.commit()
+
+    async def rebuild_financial_cube(self, school_year_id: int | None = None) -> bool:
+        """Recalculer le cube financier (d'une année, ou en entier) depuis les tables sources"""
+        connection = await self._ensure_connection()
+        try:
+            await self._rebuild_financial_cube(connection, school_year_id)
+            return True
+        except Exception as e:
+            print(f"Error rebuilding financial cube: {e}")
+            await connection.rollback()
+            return False
+
+    async def get_financial_totals(
+        self,
+        group_by: Iterable[str] = (),
+        sources: Iterable[str] = ("payment",),
+        school_year_id: int | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        classroom_id: int | None = None,
+        student_id: int | None = None,
+        count_students: bool = False,
+    ) -> List[Dict]:
+        """
+        Sums and counts of the financial cube grouped by the given dimensions
+        (see FINANCIAL_DIMENSIONS). Returns one dict per group with
+        total_amount, entry_count and, with count_students, student_count.
+
+        Whole months of the period are read from the cube; partial months at
+        its edges are added from the source rows, so any date range is exact.
+        Student dimensions (student_id, count_students) only cover payments.
+        """
+        group_by = list(group_by)
+        unknown = set(group_by) - set(self.FINANCIAL_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown financial dimensions: {sorted(unknown)}")
+        by_student = (
+            count_students or student_id is not None or "student_id" in group_by
+        )
+        sources = ["payment"] if by_student else list(sources)
+        await self._ensure_connection()
+
+        months, edges = _split_period(start_date, end_date)
+        year_clause, year_params = self._get_school_year_filter(school_year_id)
+        source_marks = ", ".join("?" for _ in sources)
+        parts: List[str] = []
+        parameters: List = []
+
+        if months is not None:
+            first_month, last_month = months
+            month_clause = ""
+            month_params: List = []
+            if first_month:
+                month_clause += " AND month >= ?"
+                month_params.append(first_month)
+            if last_month:
+                month_clause += " AND month <= ?"
+                month_params.append(last_month)
+            if by_student:
+                parts.append(
+                    "SELECT 'payment' AS source, school_year_id, month, classroom_id, 0 AS payment_type_id, student_id, total_amount, entry_count "
+                    f"FROM financial_cube_students WHERE entry_count > 0 AND {year_clause}{month_clause}"
+                )
+            else:
+                parts.append(
+                    "SELECT source, school_year_id, month, classroom_id, payment_type_id, NULL AS student_id, total_amount, entry_count "
+                    f"FROM financial_cube WHERE entry_count > 0 AND source IN ({source_marks}) AND {year_clause}{month_clause}"
+                )
+                parameters += sources
+            parameters += [*year_params, *month_params]
+
+        for source in sources:
+            table, date_column, payment_type, student = FINANCIAL_CUBE_SOURCES[source]
+            table = await self._get_source_table(table, school_year_id)
+            enrollments = await self._get_source_table("enrollments", school_year_id)
+            classroom = (
+                classroom_of("t.student_id", "t.school_year_id", enrollments)
+                if student
+                else "0"
+            )
+            payment_type = f"t.{payment_type}" if payment_type != "0" else "0"
+            student = f"t.{student}" if student else "NULL"
+            raw_year_clause, _ = self._get_school_year_filter(school_year_id, "t")
+            for edge_start, edge_end in edges:
+                parts.append(
+                    f"SELECT '{source}' AS source, t.school_year_id, substr(t.{date_column}, 1, 7) AS month, {classroom} AS classroom_id, "
+                    f"{payment_type} AS payment_type_id, {student} AS student_id, t.amount AS total_amount, 1 AS entry_count "
+                    f"FROM {table} t WHERE t.is_deleted = 0 AND {raw_year_clause} "
+                    f"AND substr(t.{date_column}, 1, 10) BETWEEN ? AND ?"
+                )
+                parameters += [*year_params, edge_start, edge_end]
+
+        if not parts:
+            return []
+        filters = []
+        if classroom_id is not None:
+            filters.append("classroom_id = ?")
+            parameters.append(classroom_id)
+        if student_id is not None:
+            filters.append("student_id = ?")
+            parameters.append(student_id)
+        columns = ", ".join(group_by)
+        query = (
+            f"SELECT {columns + ', ' if columns else ''}SUM(total_amount) AS total_amount, SUM(entry_count) AS entry_count"
+            f"{', COUNT(DISTINCT student_id) AS student_count' if count_students else ''} "
+            f"FROM ({' UNION ALL '.join(parts)}) "
+            f"WHERE {' AND '.join(filters) or '1=1'}"
+            f"{' GROUP BY ' + columns if columns else ''}"
+            f"{' ORDER BY ' + columns if columns else ''}"
+        )
+        rows = await self._fetch_all(query, parameters)
+        return [dict(row) for row in rows if row["entry_count"]]
+
+    async def get_dashboard_summary(
+        self, active_school_year: SchoolYearModel | None = None
+    ) -> Dict[str, float]:
         summary: Dict[str, float] = {
             "total_students": await self._scalar(
                 "SELECT COUNT(*) FROM students WHERE is_deleted = 0"
             ),
-            "total_payments": await self._scalar(
-                "SELECT COUNT(*) FROM payments WHERE is_deleted = 0"
-            ),
-            "total_expenses": await self._scalar(
-                "SELECT COUNT(*) FROM expenses WHERE is_deleted = 0"
-            ),
         }
-        summary["amount_payments"] = (
-            await self._scalar("SELECT SUM(amount) FROM payments WHERE is_deleted = 0")
-            or 0.0
-        )
-        summary["amount_expenses"] = (
-            await self._scalar("SELECT SUM(amount) FROM expenses WHERE is_deleted = 0")
-            or 0.0
+        # Totaux lus dans le cube (années non archivées, comme les tables chaudes)
+        await self._ensure_connection()
+        archived = sorted(self._archived_year_ids)
+        rows = await self._fetch_all(
+            "SELECT source, SUM(total_amount) AS total_amount, SUM(entry_count) AS entry_count "
+            "FROM financial_cube WHERE source IN ('payment', 'expense') "
+            f"AND school_year_id NOT IN ({', '.join('?' for _ in archived)}) "
+            "GROUP BY source",
+            archived,
         )
+        totals = {row["source"]: row for row in rows}
+        payments, expenses = totals.get("payment"), totals.get("expense")
+        summary["total_payments"] = float(payments["entry_count"]) if payments else 0.0
+        summary["total_expenses"] = float(expenses["entry_count"]) if expenses else 0.0
+        summary["amount_payments"] = payments["total_amount"] if payments else 0.0
+        summary["amount_expenses"] = expenses["total_amount"] if expenses else 0.0
         summary["cash_balance"] = (
             summary["amount_payments"] - summary["amount_expenses"]
         )
 
-        active_school_year = await self.get_active_school_year()
+        if active_school_year is None:
+            active_school_year = await self.get_active_school_year()
         summary["active_school_year"] = (
             active_school_year.name if active_school_year else "N/A"
         )
 
+        # Recettes et dépenses (dont le personnel) par mois de l'année active
+        monthly: Dict[str, Dict[str, float]] = {}
+        if active_school_year is not None:
+            for row in await self.get_financial_totals(
+                group_by=("month", "source"),
+                sources=("payment", "expense", "staff_payment"),
+                school_year_id=active_school_year.id_school_year,
+            ):
+                month = monthly.setdefault(
+                    row["month"],
+                    {"month": row["month"], "income": 0.0, "expenses": 0.0},
+                )
+                key = "income" if row["source"] == "payment" else "expenses"
+                month[key] += row["total_amount"]
+        summary["monthly_finances"] = list(monthly.values())
+
         # Nombre d'eleves par classe : {class : student}
         students_per_classroom = await self.list_students_per_classroom(
             deletion_status="active"
@@ -704,12 +1080,18 @@ class FakeApiClient:
         totals["payments_count"] = float(len(payments))
         return totals
 
-    async def create_student(self, student: StudentModel, classroom_id: int) -> bool:
-        """Create a new student"""
+    async def create_student(
+        self,
+        student: StudentModel,
+        classroom_id: int,
+        school_year_id: int | None = None,
+    ) -> bool:
+        """Create a new student (enrolled in the given or active school year)"""
         connection = await self._ensure_connection()
         try:
-            school_year = await self.get_active_school_year()
-            school_year_id = school_year.id_school_year if school_year else None
+            if school_year_id is None:
+                school_year = await self.get_active_school_year()
+                school_year_id = school_year.id_school_year if school_year else None
             if school_year_id is None:
                 return False
 
@@ -743,66 +1125,73 @@ class FakeApiClient:
             return False
 
     async def import_students(
-        self, students_list: List[StudentModel], classroom_id: int
+        self,
+        students_list: List[StudentModel],
+        classroom_id: int,
+        school_year_id: int | None = None,
     ) -> tuple[bool, int]:
-        """Import multiple students and enroll them in a classroom"""
+        """
+        Import multiple students and enroll them in a classroom.
+
+        The students are inserted in one executemany (ids allocated after the
+        current maximum) and enrolled in a second one, then committed: a
+        chunk of an import is written as a whole or not at all.
+        """
         connection = await self._ensure_connection()
-        imported_count = 0
+        students_list = list(students_list)
+        if not students_list:
+            return True, 0
 
         try:
-            # Get active school year
-            active_year = await self.get_active_school_year()
-            if not active_year:
-                return False, 0
-
-            for student in students_list:
-                try:
-                    # Insert student
-                    cursor = await connection.execute(
-                        """
-                        INSERT INTO students (first_name, last_name, surname, gender, 
-                                             date_of_birth, address, parent_contact)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            student.first_name,
-                            student.last_name,
-                            student.surname,
-                            student.gender,
-                            student.date_of_birth,
-                            student.address,
-                            student.parent_contact,
-                        ),
-                    )
-                    student_id = cursor.lastrowid
-
-                    # Create enrollment
-                    await connection.execute(
-                        """
-                        INSERT INTO enrollments (student_id, classroom_id, school_year_id, status)
-                        VALUES (?, ?, ?, ?)
-                        """,
-                        (
-                            student_id,
-                            classroom_id,
-                            active_year.id_school_year,
-                            "admitted",
-                        ),
-                    )
-
-                    imported_count += 1
-                except Exception as e:
-                    print(
-                        f"Error importing student {student.first_name} {student.last_name}: {e}"
+            # Get active school year (unless the caller already knows it)
+            if school_year_id is None:
+                active_year = await self.get_active_school_year()
+                if not active_year:
+                    return False, 0
+                school_year_id = active_year.id_school_year
+
+            # Identifiants explicites : les inscriptions sont créées sans relire les élèves
+            first_id = (
+                int(await self._scalar("SELECT MAX(id_student) FROM students")) + 1
+            )
+            student_ids = range(first_id, first_id + len(students_list))
+            await connection.executemany(
+                """
+                INSERT INTO students (id_student, first_name, last_name, surname, gender,
+                                      date_of_birth, address, parent_contact)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        student_id,
+                        student.first_name,
+                        student.last_name,
+                        student.surname,
+                        student.gender,
+                        student.date_of_birth,
+                        student.address,
+                        student.parent_contact,
                     )
-                    continue
+                    for student_id, student in zip(student_ids, students_list)
+                ],
+            )
+            await connection.executemany(
+                """
+                INSERT INTO enrollments (student_id, classroom_id, school_year_id, status)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (student_id, classroom_id, school_year_id, "admitted")
+                    for student_id in student_ids
+                ],
+            )
 
             await connection.commit()
-            return True, imported_count
+            return True, len(students_list)
         except Exception as e:
             print(f"Error during import: {e}")
             await connection.rollback()
-            return False, imported_count
+            return False, 0
 
     async def update_student(
         self, student: StudentModel, new_classroom_id: int
@@ -889,6 +1278,26 @@ class FakeApiClient:
         async with connection.execute(query, tuple(parameters or ())) as cursor:
             return await cursor.fetchone()
 
+    async def _stream_rows(
+        self, query: str, parameters: Iterable | None = None, batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Rows of a query as dicts, fetched `batch_size` at a time (constant memory)"""
+        async for rows in self._stream_batches(query, parameters, batch_size):
+            for row in rows:
+                yield row
+
+    async def _stream_batches(
+        self, query: str, parameters: Iterable | None = None, batch_size: int = 500
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Rows of a query as lists of at most `batch_size` dicts (fetchmany)"""
+        connection = await self._ensure_connection()
+        async with connection.execute(query, tuple(parameters or ())) as cursor:
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+
     async def _scalar(self, query: str, parameters: Iterable | None = None) -> float:
         connection = await self._ensure_connection()
         async with connection.execute(query, tuple(parameters or ())) as cursor:
@@ -947,12 +1356,141 @@ class FakeApiClient:
             print(f"Error logging action: {e}")
             return False
 
-    async def list_audit_logs(self, limit: int = 100) -> List[AuditLogModel]:
+    async def list_audit_logs(
+        self, limit: int = 100, include_archived: bool = False
+    ) -> List[AuditLogModel]:
+        source = "audit_logs"
+        if include_archived:
+            source = await self._get_source_table("audit_logs", None)
         rows = await self._fetch_all(
-            f"SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT {limit}"
+            f"SELECT * FROM {source} ORDER BY timestamp DESC LIMIT {limit}"
         )
         return [AuditLogModel(**dict(row)) for row in rows]
 
+    # ------------------------------------------------------------------
+    # Year-end archive
+    async def list_archived_school_years(self) -> List[int]:
+        await self._ensure_connection()
+        return sorted(self._archived_year_ids)
+
+    async def archive_school_year(
+        self, school_year_id: int, compact: bool = True
+    ) -> tuple[bool, Dict[str, int]]:
+        """
+        Move every row of a closed school year from the hot tables to the
+        attached archive database. Returns the number of rows moved per table.
+        """
+        connection = await self._ensure_connection()
+        year_row = await self._fetch_one(
+            "SELECT * FROM school_years WHERE id_school_year = ?", (school_year_id,)
+        )
+        if year_row is None or year_row["is_active"]:
+            print(f"School year {school_year_id} is unknown or still active")
+            return False, {}
+        if school_year_id in self._archived_year_ids:
+            return True, {}
+
+        if not self._archive_attached:
+            await self._attach_archive(connection)
+
+        schema = self.ARCHIVE_SCHEMA
+        moved: Dict[str, int] = {}
+        try:
+            for table in self.ARCHIVE_TABLES:
+                if table == "audit_logs":
+                    # Pas de school_year_id : on archive par période de l'année
+                    condition = (
+                        "substr(timestamp, 1, 10) >= ? AND substr(timestamp, 1, 10) <= ?"
+                    )
+                    parameters = (year_row["start_date"], year_row["end_date"])
+                else:
+                    condition = "school_year_id = ?"
+                    parameters = (school_year_id,)
+                await connection.execute(
+                    f"INSERT INTO {schema}.{table} SELECT * FROM main.{table} WHERE {condition}",
+                    parameters,
+                )
+                async with connection.execute(
+                    f"DELETE FROM main.{table} WHERE {condition}", parameters
+                ) as cursor:
+                    moved[table] = cursor.rowcount
+            await connection.execute(
+                f"INSERT INTO {schema}.archived_school_years (school_year_id, archived_at, row_counts) VALUES (?, ?, ?)",
+                (school_year_id, datetime.now().isoformat(), json.dumps(moved)),
+            )
+            await connection.commit()
+        except Exception as e:
+            print(f"Error archiving school year {school_year_id}: {e}")
+            await connection.rollback()
+            return False, {}
+
+        self._archived_year_ids.add(school_year_id)
+        # Les DELETE ont retiré l'année du cube : recalcul depuis l'archive
+        await self._rebuild_financial_cube(connection, school_year_id)
+        if compact:
+            # Rend au système les pages libérées par les DELETE
+            await connection.execute("VACUUM main")
+        return True, moved
+
+    # ------------------------------------------------------------------
+    # Ledger export
+    async def _ledger_query(self, table: str, school_year_id: int) -> str:
+        """SELECT of one ledger table for a school year, dimensions joined"""
+        source = await self._get_source_table(table, school_year_id)
+        if table == "payments":
+            enrollments = await self._get_source_table("enrollments", school_year_id)
+            return f"""
+                SELECT p.id_payment, p.payment_date, p.amount, p.period,
+                       p.student_id, s.first_name || ' ' || s.last_name AS student_name,
+                       s.gender AS student_gender,
+                       c.id_classroom AS classroom_id, c.name AS classroom_name,
+                       c.level AS classroom_level,
+                       p.payment_type_id, pt.name AS payment_type_name,
+                       pt.amount_defined AS payment_type_amount,
+                       p.user_id, p.is_deleted
+                FROM (
+                    SELECT *, {classroom_of("student_id", "school_year_id", enrollments)} AS classroom_key
+                    FROM {source} WHERE school_year_id = ?
+                ) p
+                LEFT JOIN students s ON s.id_student = p.student_id
+                LEFT JOIN classrooms c ON c.id_classroom = p.classroom_key
+                LEFT JOIN payment_types pt ON pt.id_payment_type = p.payment_type_id
+                ORDER BY p.id_payment
+            """
+        if table == "expenses":
+            return f"""
+                SELECT id_expense, expense_date, description, amount, user_id, is_deleted
+                FROM {source} WHERE school_year_id = ? ORDER BY id_expense
+            """
+        if table == "staff_payments":
+            return f"""
+                SELECT sp.id_staff_payment, sp.payment_date, sp.amount,
+                       sp.staff_id, st.first_name || ' ' || st.last_name AS staff_name,
+                       st.position AS staff_position, sp.user_id, sp.is_deleted
+                FROM {source} sp
+                LEFT JOIN staff st ON st.id_staff = sp.staff_id
+                WHERE sp.school_year_id = ? ORDER BY sp.id_staff_payment
+            """
+        if table == "cash_register":
+            return f"""
+                SELECT id_cash, date, type, description, amount, user_id, is_deleted
+                FROM {source} WHERE school_year_id = ? ORDER BY id_cash
+            """
+        raise ValueError(f"Unknown ledger table: {table}")
+
+    async def stream_ledger(
+        self, table: str, school_year_id: int, batch_size: int = 10_000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Every row (deleted ones included) of a ledger table for a school year.
+
+        Rows come in batches of `batch_size` dicts read with fetchmany, with
+        the student, classroom, payment type and staff names joined in.
+        Archived school years are read from the archive database.
+        """
+        query = await self._ledger_query(table, school_year_id)
+        async for rows in self._stream_batches(query, (school_year_id,), batch_size):
+            yield rows
+
     # ------------------------------------------------------------------
     # Fees Management
     async def list_fees(self, deletion_status: str = "active") -> List[FeeModel]:
@@ -1040,3 +1578,46 @@ class FakeApiClient:
         except Exception as e:
             print(f"Error deleting fee: {e}")
             return False
+
+
+def _split_period(
+    start_date: str | None, end_date: str | None
+) -> tuple[tuple[str | None, str | None] | None, List[tuple[str, str]]]:
+    """
+    Split a date range into whole months (first, last as YYYY-MM, None when
+    open-ended; None if the range holds no whole month) and the partial
+    months at its edges as (start, end) day ranges.
+    """
+    start = date.fromisoformat(start_date[:10]) if start_date else None
+    end = date.fromisoformat(end_date[:10]) if end_date else None
+    if start and end and start > end:
+        return None, []
+
+    def month_end(day: date) -> date:
+        return day.replace(day=monthrange(day.year, day.month)[1])
+
+    start_partial = start is not None and start.day != 1
+    end_partial = end is not None and end != month_end(end)
+    if (
+        start
+        and end
+        and (start.year, start.month) == (end.year, end.month)
+        and (start_partial or end_partial)
+    ):
+        return None, [(start.isoformat(), end.isoformat())]
+
+    edges: List[tuple[str, str]] = []
+    first_month = last_month = None
+    if start:
+        if start_partial:
+            edges.append((start.isoformat(), month_end(start).isoformat()))
+            start = month_end(start) + timedelta(days=1)
+        first_month = start.strftime("%Y-%m")
+    if end:
+        if end_partial:
+            edges.append((end.replace(day=1).isoformat(), end.isoformat()))
+            end = end.replace(day=1) - timedelta(days=1)
+        last_month = end.strftime("%Y-%m")
+    if first_month and last_month and first_month > last_month:
+        return None, edges
+    return (first_month, last_month), edges
@@ -29,6 +29,279 @@ from models.user_model import UserModel
 
 FAKE_DB_PATH = Path(__file__).resolve().parent / "fake_api.db"
 
+# Index composites (année scolaire, suppression, tri) utilisés par les listes
+# filtrées par année : le volume lu reste constant quand les années s'accumulent.
+SCHOOL_YEAR_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_enrollments_year ON enrollments (school_year_id, is_deleted, student_id);",
+    "CREATE INDEX IF NOT EXISTS idx_payments_year ON payments (school_year_id, is_deleted, payment_date);",
+    "CREATE INDEX IF NOT EXISTS idx_expenses_year ON expenses (school_year_id, is_deleted, expense_date);",
+    "CREATE INDEX IF NOT EXISTS idx_staff_payments_year ON staff_payments (school_year_id, is_deleted, payment_date);",
+    "CREATE INDEX IF NOT EXISTS idx_cash_register_year ON cash_register (school_year_id, is_deleted, date);",
+]
+SCHOOL_YEAR_INDEXES_SCRIPT = "\n".join(SCHOOL_YEAR_INDEXES)
+
+# Version de données par table, incrémentée par des triggers à chaque écriture.
+# La valeur initiale (horodatage en ms) change à chaque reconstruction de la base,
+# pour qu'un instantané pris sur un ancien jeu de données ne soit jamais reconnu.
+DATA_VERSION_TABLES = (
+    "roles",
+    "users",
+    "school_years",
+    "classrooms",
+    "students",
+    "enrollments",
+    "fees",
+    "payment_types",
+    "payments",
+    "expenses",
+    "staff",
+    "staff_payments",
+    "cash_register",
+)
+
+
+def _data_versions_statements() -> List[str]:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS data_versions (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL);"
+    ]
+    for table in DATA_VERSION_TABLES:
+        statements.append(
+            "INSERT OR IGNORE INTO data_versions (table_name, version) VALUES "
+            f"('{table}', CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER));"
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version "
+                f"AFTER {event} ON {table} BEGIN "
+                f"UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}'; "
+                "END;"
+            )
+    return statements
+
+
+DATA_VERSIONS = _data_versions_statements()
+DATA_VERSIONS_SCRIPT = "\n".join(DATA_VERSIONS)
+
+
+# Cube financier pré-agrégé, tenu à jour par des triggers à chaque écriture.
+# financial_cube : montants et nombres par source ('payment', 'expense',
+# 'staff_payment'), année scolaire, mois (AAAA-MM), classe et type de paiement
+# (0 quand la dimension ne s'applique pas). financial_cube_students : les
+# paiements d'élèves par élève, pour les rapports par élève et le nombre
+# d'élèves distincts par classe. La classe d'un paiement est celle de la
+# dernière inscription active de l'élève pour l'année (0 si aucune).
+FINANCIAL_CUBE_SOURCES = {
+    # source -> (table, colonne de date, type de paiement, élève)
+    "payment": ("payments", "payment_date", "payment_type_id", "student_id"),
+    "expense": ("expenses", "expense_date", "0", None),
+    "staff_payment": ("staff_payments", "payment_date", "0", None),
+}
+
+FINANCIAL_CUBE_TABLES = ("financial_cube", "financial_cube_students")
+
+
+def classroom_of(
+    student: str, school_year: str, enrollments: str = "enrollments"
+) -> str:
+    """Expression SQL : classe d'un élève pour une année scolaire (0 si non inscrit)"""
+    return (
+        f"COALESCE((SELECT e.classroom_id FROM {enrollments} e "
+        f"WHERE e.student_id = {student} AND e.school_year_id = {school_year} "
+        "AND e.is_deleted = 0 ORDER BY e.id_enrollment DESC LIMIT 1), 0)"
+    )
+
+
+def _cube_upsert(table: str) -> str:
+    keys = (
+        "school_year_id, student_id, month, classroom_id"
+        if table == "financial_cube_students"
+        else "source, school_year_id, month, classroom_id, payment_type_id"
+    )
+    return (
+        f"ON CONFLICT ({keys}) DO UPDATE SET "
+        "total_amount = total_amount + excluded.total_amount, "
+        "entry_count = entry_count + excluded.entry_count;"
+    )
+
+
+def _cube_row_statements(source: str, row: str, sign: int) -> List[str]:
+    """Ajouter (sign=1) ou retirer (sign=-1) une ligne source du cube"""
+    _, date_column, payment_type, student = FINANCIAL_CUBE_SOURCES[source]
+    month = f"substr({row}.{date_column}, 1, 7)"
+    payment_type = f"{row}.{payment_type}" if payment_type != "0" else "0"
+    classroom = (
+        classroom_of(f"{row}.student_id", f"{row}.school_year_id") if student else "0"
+    )
+    statements = [
+        "INSERT INTO financial_cube (source, school_year_id, month, classroom_id, payment_type_id, total_amount, entry_count) "
+        f"SELECT '{source}', {row}.school_year_id, {month}, {classroom}, {payment_type}, {sign} * {row}.amount, {sign} "
+        f"WHERE {row}.is_deleted = 0 " + _cube_upsert("financial_cube"),
+        "DELETE FROM financial_cube WHERE entry_count = 0 AND "
+        f"source = '{source}' AND school_year_id = {row}.school_year_id AND month = {month};",
+    ]
+    if student:
+        statements += [
+            "INSERT INTO financial_cube_students (school_year_id, student_id, month, classroom_id, total_amount, entry_count) "
+            f"SELECT {row}.school_year_id, {row}.student_id, {month}, {classroom}, {sign} * {row}.amount, {sign} "
+            f"WHERE {row}.is_deleted = 0 " + _cube_upsert("financial_cube_students"),
+            "DELETE FROM financial_cube_students WHERE entry_count = 0 AND "
+            f"school_year_id = {row}.school_year_id AND student_id = {row}.student_id;",
+        ]
+    return statements
+
+
+def _cube_student_statements(row: str, sign: int, condition: str = "1") -> List[str]:
+    """Ajouter / retirer tous les paiements d'un élève pour une année (changement d'inscription)"""
+    match = (
+        f"p.student_id = {row}.student_id AND p.school_year_id = {row}.school_year_id "
+        f"AND p.is_deleted = 0 AND {condition}"
+    )
+    classroom = classroom_of("p.student_id", "p.school_year_id")
+    month = "substr(p.payment_date, 1, 7)"
+    return [
+        "INSERT INTO financial_cube (source, school_year_id, month, classroom_id, payment_type_id, total_amount, entry_count) "
+        f"SELECT 'payment', p.school_year_id, {month}, {classroom}, p.payment_type_id, {sign} * SUM(p.amount), {sign} * COUNT(*) "
+        f"FROM payments p WHERE {match} GROUP BY 2, 3, 4, 5 "
+        + _cube_upsert("financial_cube"),
+        "INSERT INTO financial_cube_students (school_year_id, student_id, month, classroom_id, total_amount, entry_count) "
+        f"SELECT p.school_year_id, p.student_id, {month}, {classroom}, {sign} * SUM(p.amount), {sign} * COUNT(*) "
+        f"FROM payments p WHERE {match} GROUP BY 1, 2, 3, 4 "
+        + _cube_upsert("financial_cube_students"),
+        "DELETE FROM financial_cube WHERE entry_count = 0 AND source = 'payment' "
+        f"AND school_year_id = {row}.school_year_id;",
+        "DELETE FROM financial_cube_students WHERE entry_count = 0 "
+        f"AND school_year_id = {row}.school_year_id AND student_id = {row}.student_id;",
+    ]
+
+
+def _trigger(name: str, timing: str, body: Iterable[str]) -> str:
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {timing} BEGIN {' '.join(body)} END;"
+
+
+def _financial_cube_statements() -> List[str]:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS financial_cube (source TEXT NOT NULL, school_year_id INTEGER NOT NULL, month TEXT NOT NULL, classroom_id INTEGER NOT NULL DEFAULT 0, payment_type_id INTEGER NOT NULL DEFAULT 0, total_amount REAL NOT NULL DEFAULT 0, entry_count INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (source, school_year_id, month, classroom_id, payment_type_id)) WITHOUT ROWID;",
+        "CREATE TABLE IF NOT EXISTS financial_cube_students (school_year_id INTEGER NOT NULL, student_id INTEGER NOT NULL, month TEXT NOT NULL, classroom_id INTEGER NOT NULL DEFAULT 0, total_amount REAL NOT NULL DEFAULT 0, entry_count INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (school_year_id, student_id, month, classroom_id)) WITHOUT ROWID;",
+        # Paiements d'un élève pour une année : relus à chaque changement d'inscription
+        "CREATE INDEX IF NOT EXISTS idx_payments_student_year ON payments (student_id, school_year_id);",
+    ]
+    for source, (
+        table,
+        date_column,
+        payment_type,
+        student,
+    ) in FINANCIAL_CUBE_SOURCES.items():
+        columns = ["school_year_id", "amount", date_column, "is_deleted"]
+        if payment_type != "0":
+            columns.append(payment_type)
+        if student:
+            columns.append(student)
+        statements += [
+            _trigger(
+                f"trg_{table}_insert_cube",
+                f"AFTER INSERT ON {table}",
+                _cube_row_statements(source, "NEW", 1),
+            ),
+            _trigger(
+                f"trg_{table}_update_cube",
+                f"AFTER UPDATE OF {', '.join(columns)} ON {table}",
+                _cube_row_statements(source, "OLD", -1)
+                + _cube_row_statements(source, "NEW", 1),
+            ),
+            _trigger(
+                f"trg_{table}_delete_cube",
+                f"AFTER DELETE ON {table}",
+                _cube_row_statements(source, "OLD", -1),
+            ),
+        ]
+
+    # Inscriptions : les paiements de l'élève sont retirés de leur classe avant
+    # l'écriture puis rajoutés dans la classe résolue après
+    same_key = (
+        "(NEW.student_id = OLD.student_id AND NEW.school_year_id = OLD.school_year_id)"
+    )
+    statements += [
+        _trigger(
+            "trg_enrollments_before_insert_cube",
+            "BEFORE INSERT ON enrollments",
+            _cube_student_statements("NEW", -1),
+        ),
+        _trigger(
+            "trg_enrollments_after_insert_cube",
+            "AFTER INSERT ON enrollments",
+            _cube_student_statements("NEW", 1),
+        ),
+        _trigger(
+            "trg_enrollments_before_update_cube",
+            "BEFORE UPDATE OF student_id, school_year_id, classroom_id, is_deleted ON enrollments",
+            _cube_student_statements("OLD", -1)
+            + _cube_student_statements("NEW", -1, f"NOT {same_key}"),
+        ),
+        _trigger(
+            "trg_enrollments_after_update_cube",
+            "AFTER UPDATE OF student_id, school_year_id, classroom_id, is_deleted ON enrollments",
+            _cube_student_statements("OLD", 1)
+            + _cube_student_statements("NEW", 1, f"NOT {same_key}"),
+        ),
+        _trigger(
+            "trg_enrollments_before_delete_cube",
+            "BEFORE DELETE ON enrollments",
+            _cube_student_statements("OLD", -1),
+        ),
+        _trigger(
+            "trg_enrollments_after_delete_cube",
+            "AFTER DELETE ON enrollments",
+            _cube_student_statements("OLD", 1),
+        ),
+    ]
+    return statements
+
+
+def financial_cube_rebuild_statements(
+    sources: Dict[str, str],
+    enrollments: str = "enrollments",
+    school_year_id: int | None = None,
+) -> List[str]:
+    """Requêtes recalculant le cube depuis les tables sources.
+
+    `sources` associe chaque table source à la table (ou vue) à lire ;
+    `school_year_id` restreint le calcul (et la purge) à une année scolaire.
+    """
+    year_clause = (
+        "1" if school_year_id is None else f"school_year_id = {int(school_year_id)}"
+    )
+    statements = [
+        f"DELETE FROM {table} WHERE {year_clause};" for table in FINANCIAL_CUBE_TABLES
+    ]
+    for source, (
+        table,
+        date_column,
+        payment_type,
+        student,
+    ) in FINANCIAL_CUBE_SOURCES.items():
+        classroom = (
+            classroom_of("t.student_id", "t.school_year_id", enrollments)
+            if student
+            else "0"
+        )
+        payment_type = f"t.{payment_type}" if payment_type != "0" else "0"
+        statements.append(
+            "INSERT INTO financial_cube (source, school_year_id, month, classroom_id, payment_type_id, total_amount, entry_count) "
+            f"SELECT '{source}', t.school_year_id, substr(t.{date_column}, 1, 7), {classroom}, {payment_type}, SUM(t.amount), COUNT(*) "
+            f"FROM {sources[table]} t WHERE t.is_deleted = 0 AND {year_clause} GROUP BY 2, 3, 4, 5;"
+        )
+        if student:
+            statements.append(
+                "INSERT INTO financial_cube_students (school_year_id, student_id, month, classroom_id, total_amount, entry_count) "
+                f"SELECT t.school_year_id, t.student_id, substr(t.{date_column}, 1, 7), {classroom}, SUM(t.amount), COUNT(*) "
+                f"FROM {sources[table]} t WHERE t.is_deleted = 0 AND {year_clause} GROUP BY 1, 2, 3, 4;"
+            )
+    return statements
+
+
+FINANCIAL_CUBE = _financial_cube_statements()
+FINANCIAL_CUBE_SCRIPT = "\n".join(FINANCIAL_CUBE)
+
 
 @dataclass(frozen=True)
 class FakeDataset:
@@ -450,6 +723,9 @@ def _recreate_schema(cursor: sqlite3.Cursor) -> None:
         "DROP TABLE IF EXISTS roles;",
         "DROP TABLE IF EXISTS settings;",
         "DROP TABLE IF EXISTS audit_logs;",
+        "DROP TABLE IF EXISTS data_versions;",
+        "DROP TABLE IF EXISTS financial_cube;",
+        "DROP TABLE IF EXISTS financial_cube_students;",
         "CREATE TABLE roles (id_role INTEGER PRIMARY KEY, role_name TEXT NOT NULL, is_deleted INTEGER DEFAULT 0);",
         "CREATE TABLE users (id_user INTEGER PRIMARY KEY, username TEXT NOT NULL, email TEXT NOT NULL, password TEXT NOT NULL, role_id INTEGER NOT NULL, is_deleted INTEGER DEFAULT 0, FOREIGN KEY(role_id) REFERENCES roles(id_role));",
         "CREATE TABLE school_years (id_school_year INTEGER PRIMARY KEY, name TEXT NOT NULL, start_date TEXT NOT NULL, end_date TEXT NOT NULL, is_active INTEGER NOT NULL, is_deleted INTEGER DEFAULT 0);",
@@ -466,7 +742,7 @@ def _recreate_schema(cursor: sqlite3.Cursor) -> None:
         "CREATE TABLE settings (id_settings INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, value TEXT NOT NULL, description TEXT);",
         "CREATE TABLE audit_logs (id_log INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, action TEXT NOT NULL, table_name TEXT NOT NULL, record_id INTEGER NOT NULL, timestamp TEXT NOT NULL, details TEXT, FOREIGN KEY(user_id) REFERENCES users(id_user));",
     ]
-    for statement in schema_statements:
+    for statement in schema_statements + SCHOOL_YEAR_INDEXES:
         cursor.execute(statement)
 
 
@@ -0,0 +1,21 @@
+from .columns import ExportColumn
+from .csv_writer import CsvWriter, export_csv, write_csv
+from .xlsx_writer import XlsxWriter, export_xlsx, write_xlsx
+from .pdf_report import PdfReportWriter, export_pdf_report, write_pdf_report
+from .ledger_export import LEDGER_SCHEMAS, LedgerExporter, export_ledger
+
+__all__ = [
+    "ExportColumn",
+    "CsvWriter",
+    "export_csv",
+    "write_csv",
+    "XlsxWriter",
+    "export_xlsx",
+    "write_xlsx",
+    "PdfReportWriter",
+    "export_pdf_report",
+    "write_pdf_report",
+    "LEDGER_SCHEMAS",
+    "LedgerExporter",
+    "export_ledger",
+]
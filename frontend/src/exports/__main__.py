@@ -0,0 +1,77 @@
+"""Command line export of the ledger tables (see exports/ledger_export.py)"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Dict, Sequence
+
+from core.config import Config
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    from data.api.fake_client import FakeApiClient
+    from data.fake.fake_data import FAKE_DB_PATH
+
+    from .ledger_export import LedgerExporter, export_ledger
+
+    parser = argparse.ArgumentParser(
+        prog="python -m exports",
+        description="Export the ledger tables, partitioned by school year.",
+    )
+    parser.add_argument(
+        "--output",
+        default=str(Path(Config.REPORTS_EXPORT_DIR) / "ledger"),
+        help="output directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(LedgerExporter.FORMATS),
+        default="parquet",
+        help="file format (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=FakeApiClient.LEDGER_TABLES,
+        help="table to export (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--year",
+        action="append",
+        type=int,
+        help="school year id to export (repeatable, default: all)",
+    )
+    parser.add_argument("--db", default=str(FAKE_DB_PATH), help="SQLite database")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=Config.LEDGER_EXPORT_BATCH_SIZE,
+        help="rows read and written at a time (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    def report(table: str, school_year_id: int, rows: int) -> None:
+        print(f"{table} school_year_id={school_year_id}: {rows} rows")
+
+    async def run() -> Dict[str, int]:
+        async with FakeApiClient(db_path=args.db, auto_seed=False) as api_client:
+            return await export_ledger(
+                api_client,
+                args.output,
+                args.format,
+                tables=args.table,
+                school_year_ids=args.year,
+                batch_size=args.batch_size,
+                progress=report,
+            )
+
+    try:
+        totals = asyncio.run(run())
+    except (RuntimeError, ValueError) as e:
+        parser.exit(1, f"Error exporting ledger: {e}\n")
+    print(f"{sum(totals.values())} rows written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
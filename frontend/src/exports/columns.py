@@ -0,0 +1,58 @@
+from typing import Any, Callable
+
+
+class ExportColumn:
+    """One column of an exported report.
+
+    `key` is a dict key / attribute name of the row, or a callable receiving
+    the row. `kind` drives the cell type and number format in spreadsheets
+    and the alignment in printed reports. `total` columns are summed in the
+    totals rows of printed reports (amounts by default).
+    """
+
+    TEXT = "text"
+    INTEGER = "integer"
+    NUMBER = "number"
+    AMOUNT = "amount"  # Montant dans la devise de l'école (Constants.DEVISE)
+    DATE = "date"
+
+    KINDS = (TEXT, INTEGER, NUMBER, AMOUNT, DATE)
+
+    # Largeur relative par défaut (en caractères)
+    DEFAULT_WIDTHS = {
+        TEXT: 24,
+        INTEGER: 12,
+        NUMBER: 14,
+        AMOUNT: 18,
+        DATE: 14,
+    }
+
+    def __init__(
+        self,
+        key: str | Callable[[Any], Any],
+        title: str,
+        kind: str = TEXT,
+        width: int | None = None,
+        total: bool | None = None,
+    ) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown column kind: {kind}")
+        self.key = key
+        self.title = title
+        self.kind = kind
+        self.width = width or self.DEFAULT_WIDTHS[kind]
+        self.total = kind == self.AMOUNT if total is None else total
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.kind in (self.INTEGER, self.NUMBER, self.AMOUNT)
+
+    def value(self, row: Any) -> Any:
+        if callable(self.key):
+            return self.key(row)
+        if isinstance(row, dict):
+            return row.get(self.key)
+        return getattr(row, self.key, None)
+
+    def __repr__(self) -> str:
+        return f"<ExportColumn {self.title} ({self.kind})>"
@@ -0,0 +1,215 @@
+"""Streaming CSV writer"""
+
+import asyncio
+import csv
+import io
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, AsyncIterable, Callable, Iterable, List, Sequence
+
+from core.config import Config
+
+from .columns import ExportColumn
+
+
+class CsvWriter:
+    """Write a .csv file row by row, in constant memory.
+
+    Rows come from any iterable or async iterable (e.g. a database cursor
+    read with `fetchmany`). They are formatted into a small text buffer
+    that is flushed to the file every `BUFFER_ROWS` rows, so only one
+    buffer is held in memory whatever the size of the report.
+
+    `encoding="utf-8-sig"` (or `bom=True`) writes the UTF-8 byte order mark
+    Excel needs to detect accents; `decimal_separator=","` matches Excel
+    with a French locale, which also expects `;` as delimiter.
+
+    The file is written next to its destination and renamed at the end:
+    a failed or cancelled export leaves no truncated file behind.
+    """
+
+    BUFFER_ROWS = 2000
+
+    def __init__(
+        self,
+        path: Path | str,
+        columns: Sequence[ExportColumn],
+        delimiter: str = ",",
+        encoding: str = "utf-8",
+        bom: bool = False,
+        decimal_separator: str = ".",
+    ) -> None:
+        if not columns:
+            raise ValueError("At least one column is required")
+        if len(delimiter) != 1:
+            raise ValueError("The delimiter must be a single character")
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.delimiter = delimiter
+        if bom and encoding.replace("_", "-").lower() in ("utf-8", "utf8"):
+            encoding = "utf-8-sig"
+        self.encoding = encoding
+        self.decimal_separator = decimal_separator
+        self.rows_written = 0
+        self._formatters = [self._formatter(column) for column in self.columns]
+
+    # ------------------------------------------------------------------
+    # Cell formatting
+    def _formatter(self, column: ExportColumn) -> Callable[[Any], str]:
+        separator = self.decimal_separator
+
+        def number(value: Any, pattern: str) -> str:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return str(value)
+            text = format(value, pattern)
+            return text.replace(".", separator) if separator != "." else text
+
+        if column.kind == ExportColumn.AMOUNT:
+            return lambda value: number(value, ".2f")
+        if column.kind == ExportColumn.NUMBER:
+            return lambda value: number(value, "g")
+        if column.kind == ExportColumn.INTEGER:
+            return lambda value: number(value, ".0f")
+        if column.kind == ExportColumn.DATE:
+            return lambda value: (
+                value.isoformat()[:10]
+                if isinstance(value, (date, datetime))
+                else str(value)
+            )
+        return str
+
+    def _format_row(self, row: Any) -> List[str]:
+        cells = []
+        for column, formatter in zip(self.columns, self._formatters):
+            value = column.value(row)
+            cells.append("" if value is None else formatter(value))
+        return cells
+
+    def _new_buffer(self):
+        buffer = io.StringIO()
+        return buffer, csv.writer(
+            buffer, delimiter=self.delimiter, lineterminator="\r\n"
+        )
+
+    def _temporary_path(self) -> Path:
+        return self.path.with_name(f".{self.path.name}.tmp")
+
+    # ------------------------------------------------------------------
+    # Writing
+    def write(
+        self,
+        rows: Iterable[Any],
+        progress: Callable[[int], None] | None = None,
+        progress_every: int = 10_000,
+    ) -> int:
+        """Write every row of `rows` and return the number of data rows.
+
+        `progress(rows_written)` is called every `progress_every` rows.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._temporary_path()
+        self.rows_written = 0
+        try:
+            with temporary.open("w", encoding=self.encoding, newline="") as file:
+                buffer, writer = self._new_buffer()
+                writer.writerow([column.title for column in self.columns])
+                for row in rows:
+                    writer.writerow(self._format_row(row))
+                    self.rows_written += 1
+                    if self.rows_written % self.BUFFER_ROWS == 0:
+                        file.write(buffer.getvalue())
+                        buffer, writer = self._new_buffer()
+                    if progress is not None and (
+                        self.rows_written % progress_every == 0
+                    ):
+                        progress(self.rows_written)
+                file.write(buffer.getvalue())
+            os.replace(temporary, self.path)
+        finally:
+            temporary.unlink(missing_ok=True)
+        if progress is not None:
+            progress(self.rows_written)
+        return self.rows_written
+
+    async def write_async(
+        self,
+        rows: AsyncIterable[Any] | Iterable[Any],
+        progress: Callable[[int], None] | None = None,
+        progress_every: int = 10_000,
+    ) -> int:
+        """`write` for rows read from an async iterator.
+
+        Rows are formatted on the event loop as they arrive; each full
+        buffer is written to the file in a worker thread.
+        """
+        if not hasattr(rows, "__aiter__"):
+            return await asyncio.to_thread(self.write, rows, progress, progress_every)
+
+        await asyncio.to_thread(self.path.parent.mkdir, parents=True, exist_ok=True)
+        temporary = self._temporary_path()
+        self.rows_written = 0
+        file = await asyncio.to_thread(
+            temporary.open, "w", encoding=self.encoding, newline=""
+        )
+        try:
+            try:
+                buffer, writer = self._new_buffer()
+                writer.writerow([column.title for column in self.columns])
+                async for row in rows:
+                    writer.writerow(self._format_row(row))
+                    self.rows_written += 1
+                    if self.rows_written % self.BUFFER_ROWS == 0:
+                        await asyncio.to_thread(file.write, buffer.getvalue())
+                        buffer, writer = self._new_buffer()
+                    if progress is not None and (
+                        self.rows_written % progress_every == 0
+                    ):
+                        progress(self.rows_written)
+                await asyncio.to_thread(file.write, buffer.getvalue())
+            finally:
+                await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, temporary, self.path)
+        finally:
+            temporary.unlink(missing_ok=True)
+        if progress is not None:
+            progress(self.rows_written)
+        return self.rows_written
+
+
+def write_csv(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: Iterable[Any],
+    delimiter: str = Config.CSV_DELIMITER,
+    encoding: str = Config.CSV_ENCODING,
+    decimal_separator: str = Config.CSV_DECIMAL_SEPARATOR,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Write `rows` to a .csv file and return the number of data rows"""
+    return CsvWriter(
+        path,
+        columns,
+        delimiter=delimiter,
+        encoding=encoding,
+        decimal_separator=decimal_separator,
+    ).write(rows, progress)
+
+
+async def export_csv(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: AsyncIterable[Any] | Iterable[Any],
+    delimiter: str = Config.CSV_DELIMITER,
+    encoding: str = Config.CSV_ENCODING,
+    decimal_separator: str = Config.CSV_DECIMAL_SEPARATOR,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Write `rows` (iterable or async iterable) without blocking the event loop"""
+    return await CsvWriter(
+        path,
+        columns,
+        delimiter=delimiter,
+        encoding=encoding,
+        decimal_separator=decimal_separator,
+    ).write_async(rows, progress)
@@ -0,0 +1,325 @@
+"""Columnar export of the ledger tables, partitioned by school year
+
+Usage (from frontend/src):
+
+    python -m exports --output rapports/ledger --format parquet
+
+Each table is written to `<output>/<table>/school_year_id=<id>/<table>.<ext>`
+(Hive partitioning), readable as one dataset by pandas, pyarrow or DuckDB:
+
+    SELECT * FROM read_parquet('rapports/ledger/payments/*/*.parquet',
+                               hive_partitioning = true)
+
+Parquet and Arrow IPC need the optional `pyarrow` package; CSV (comma,
+decimal point, UTF-8, ISO dates) works everywhere.
+"""
+
+import abc
+import asyncio
+import csv
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.config import Config
+
+# Types des colonnes exportées (le school_year_id est la clé de partition)
+INT = "int"
+FLOAT = "float"
+TEXT = "text"
+DATE = "date"
+BOOL = "bool"
+
+LEDGER_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "payments": [
+        ("id_payment", INT),
+        ("payment_date", DATE),
+        ("amount", FLOAT),
+        ("period", TEXT),
+        ("student_id", INT),
+        ("student_name", TEXT),
+        ("student_gender", TEXT),
+        ("classroom_id", INT),
+        ("classroom_name", TEXT),
+        ("classroom_level", TEXT),
+        ("payment_type_id", INT),
+        ("payment_type_name", TEXT),
+        ("payment_type_amount", FLOAT),
+        ("user_id", INT),
+        ("is_deleted", BOOL),
+    ],
+    "expenses": [
+        ("id_expense", INT),
+        ("expense_date", DATE),
+        ("description", TEXT),
+        ("amount", FLOAT),
+        ("user_id", INT),
+        ("is_deleted", BOOL),
+    ],
+    "staff_payments": [
+        ("id_staff_payment", INT),
+        ("payment_date", DATE),
+        ("amount", FLOAT),
+        ("staff_id", INT),
+        ("staff_name", TEXT),
+        ("staff_position", TEXT),
+        ("user_id", INT),
+        ("is_deleted", BOOL),
+    ],
+    "cash_register": [
+        ("id_cash", INT),
+        ("date", DATE),
+        ("type", TEXT),
+        ("description", TEXT),
+        ("amount", FLOAT),
+        ("user_id", INT),
+        ("is_deleted", BOOL),
+    ],
+}
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    INT: lambda value: None if value is None else int(value),
+    FLOAT: lambda value: None if value is None else float(value),
+    TEXT: lambda value: None if value is None else str(value),
+    DATE: _to_date,
+    BOOL: lambda value: None if value is None else bool(value),
+}
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "pyarrow is required for Parquet and Arrow exports "
+            "(pip install pyarrow), or use the csv format"
+        ) from None
+    return pyarrow
+
+
+class _PartitionWriter(abc.ABC):
+    """One partition file, written batch by batch under a temporary name"""
+
+    def __init__(self, path: Path, schema: Sequence[Tuple[str, str]]) -> None:
+        self.path = path
+        self.schema = list(schema)
+        self.temporary = path.with_name(f".{path.name}.tmp")
+        self.rows_written = 0
+
+    @abc.abstractmethod
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Append a batch of rows to the temporary file"""
+
+    @abc.abstractmethod
+    def _close(self) -> None:
+        """Flush and close the temporary file"""
+
+    def close(self) -> None:
+        self._close()
+        os.replace(self.temporary, self.path)
+
+    def abort(self) -> None:
+        try:
+            self._close()
+        finally:
+            self.temporary.unlink(missing_ok=True)
+
+
+class _ArrowPartitionWriter(_PartitionWriter):
+    """Parquet (one row group per batch) or Arrow IPC file (one record batch per batch)"""
+
+    def __init__(
+        self, path: Path, schema: Sequence[Tuple[str, str]], file_format: str
+    ) -> None:
+        super().__init__(path, schema)
+        pa = self.pa = _load_pyarrow()
+        types = {
+            INT: pa.int64(),
+            FLOAT: pa.float64(),
+            TEXT: pa.string(),
+            DATE: pa.date32(),
+            BOOL: pa.bool_(),
+        }
+        self.arrow_schema = pa.schema(
+            [(name, types[kind]) for name, kind in self.schema]
+        )
+        if file_format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(
+                str(self.temporary), self.arrow_schema, compression="zstd"
+            )
+        else:
+            self._writer = pa.ipc.new_file(str(self.temporary), self.arrow_schema)
+        self._parquet = file_format == "parquet"
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        arrays = [
+            self.pa.array(
+                [_CONVERTERS[kind](row.get(name)) for row in rows],
+                type=self.arrow_schema.field(name).type,
+            )
+            for name, kind in self.schema
+        ]
+        batch = self.pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema)
+        if self._parquet:
+            self._writer.write_table(self.pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += len(rows)
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class _CsvPartitionWriter(_PartitionWriter):
+    """Machine-readable CSV: comma, decimal point, ISO dates, booleans as 0/1"""
+
+    def __init__(self, path: Path, schema: Sequence[Tuple[str, str]]) -> None:
+        super().__init__(path, schema)
+        self._file = self.temporary.open("w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file, lineterminator="\n")
+        self._writer.writerow([name for name, _ in self.schema])
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        cells = []
+        for row in rows:
+            line = []
+            for name, kind in self.schema:
+                value = _CONVERTERS[kind](row.get(name))
+                if value is None:
+                    value = ""
+                elif kind == BOOL:
+                    value = int(value)
+                line.append(value)
+            cells.append(line)
+        self._writer.writerows(cells)
+        self.rows_written += len(rows)
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class LedgerExporter:
+    """Export payments, expenses, staff payments and the cash register by school year.
+
+    Rows are read from the API client in batches (`stream_ledger`, SQLite
+    fetchmany) and each batch is converted and written in a worker thread
+    before the next one is read: memory stays bounded by `batch_size`
+    whatever the number of rows. Every batch becomes a Parquet row group
+    or an Arrow record batch.
+
+    Partition files are written under a temporary name and renamed when
+    complete; an existing partition is replaced.
+    """
+
+    FORMATS = ("parquet", "arrow", "csv")
+
+    def __init__(
+        self,
+        api_client,
+        output_dir: Path | str,
+        file_format: str = "parquet",
+        batch_size: int = Config.LEDGER_EXPORT_BATCH_SIZE,
+    ) -> None:
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unknown ledger export format: {file_format}")
+        if file_format != "csv":
+            # Échouer avant de lire la base si pyarrow manque
+            _load_pyarrow()
+        self.api_client = api_client
+        self.output_dir = Path(output_dir)
+        self.file_format = file_format
+        self.batch_size = max(1, batch_size)
+
+    def partition_path(self, table: str, school_year_id: int) -> Path:
+        return (
+            self.output_dir
+            / table
+            / f"school_year_id={school_year_id}"
+            / f"{table}.{self.file_format}"
+        )
+
+    def _open(self, path: Path, schema: Sequence[Tuple[str, str]]) -> _PartitionWriter:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.file_format == "csv":
+            return _CsvPartitionWriter(path, schema)
+        return _ArrowPartitionWriter(path, schema, self.file_format)
+
+    async def export_partition(self, table: str, school_year_id: int) -> int:
+        """Write one table for one school year and return its number of rows"""
+        path = self.partition_path(table, school_year_id)
+        writer: Optional[_PartitionWriter] = None
+        try:
+            async for rows in self.api_client.stream_ledger(
+                table, school_year_id, batch_size=self.batch_size
+            ):
+                if writer is None:
+                    writer = await asyncio.to_thread(
+                        self._open, path, LEDGER_SCHEMAS[table]
+                    )
+                await asyncio.to_thread(writer.write_batch, rows)
+        except BaseException:
+            if writer is not None:
+                await asyncio.to_thread(writer.abort)
+            raise
+        if writer is None:
+            # Pas de ligne : pas de fichier (un ancien export de l'année est retiré)
+            path.unlink(missing_ok=True)
+            return 0
+        await asyncio.to_thread(writer.close)
+        return writer.rows_written
+
+    async def export(
+        self,
+        tables: Iterable[str] | None = None,
+        school_year_ids: Iterable[int] | None = None,
+        progress: Callable[[str, int, int], None] | None = None,
+    ) -> Dict[str, int]:
+        """Export `tables` (all by default) for `school_year_ids` (all years).
+
+        `progress(table, school_year_id, rows)` is called after each
+        partition. Returns the number of rows written per table.
+        """
+        tables = list(tables or self.api_client.LEDGER_TABLES)
+        for table in tables:
+            if table not in LEDGER_SCHEMAS:
+                raise ValueError(f"Unknown ledger table: {table}")
+        if school_year_ids is None:
+            years = await self.api_client.list_school_years(deletion_status="all")
+            school_year_ids = [year.id_school_year for year in years]
+
+        totals: Dict[str, int] = {}
+        for table in tables:
+            totals[table] = 0
+            for school_year_id in school_year_ids:
+                rows = await self.export_partition(table, school_year_id)
+                totals[table] += rows
+                if progress is not None:
+                    progress(table, school_year_id, rows)
+        return totals
+
+
+async def export_ledger(
+    api_client,
+    output_dir: Path | str,
+    file_format: str = "parquet",
+    tables: Iterable[str] | None = None,
+    school_year_ids: Iterable[int] | None = None,
+    batch_size: int = Config.LEDGER_EXPORT_BATCH_SIZE,
+    progress: Callable[[str, int, int], None] | None = None,
+) -> Dict[str, int]:
+    """Export the ledger tables and return the number of rows per table"""
+    exporter = LedgerExporter(api_client, output_dir, file_format, batch_size)
+    return await exporter.export(tables, school_year_ids, progress)
@@ -0,0 +1,627 @@
+"""Paginated PDF report writer (no third-party dependency)"""
+
+import asyncio
+import struct
+import unicodedata
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.config import Config
+from core.constants import Constants
+
+from .columns import ExportColumn
+
+# Largeurs des glyphes ASCII 32..126 des polices standard (métriques AFM, /1000 em)
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)  # fmt: skip
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)  # fmt: skip
+
+_ELLIPSIS = "…"
+
+
+def _glyph_width(char: str, widths: Tuple[int, ...]) -> int:
+    code = ord(char)
+    if 32 <= code <= 126:
+        return widths[code - 32]
+    # Lettres accentuées : largeur de la lettre de base
+    base = unicodedata.normalize("NFD", char)[0]
+    if base != char and 32 <= ord(base) <= 126:
+        return widths[ord(base) - 32]
+    return 556
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    return sum(_glyph_width(char, widths) for char in text) * size / 1000
+
+
+def _fit(text: str, width: float, size: float, bold: bool = False) -> str:
+    """Truncate `text` with an ellipsis so it fits in `width` points"""
+    if text_width(text, size, bold) <= width:
+        return text
+    while text and text_width(text + _ELLIPSIS, size, bold) > width:
+        text = text[:-1]
+    return text + _ELLIPSIS if text else ""
+
+
+def _pdf_string(text: str) -> bytes:
+    """PDF literal string in WinAnsiEncoding (unsupported characters become '?')"""
+    data = text.encode("cp1252", "replace")
+    data = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+# ----------------------------------------------------------------------
+# Logo
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _read_png(data: bytes, max_size: int) -> Optional[Dict[str, Any]]:
+    """Decode an 8-bit, non-interlaced PNG into RGB (+ alpha) planes"""
+    position = 8
+    header = None
+    chunks = []
+    while position < len(data):
+        (length,) = struct.unpack(">I", data[position : position + 4])
+        kind = data[position + 4 : position + 8]
+        body = data[position + 8 : position + 8 + length]
+        position += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            chunks.append(body)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        return None
+    width, height, depth, color_type, _, _, interlace = header
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if depth != 8 or interlace or channels is None:
+        return None
+
+    raw = zlib.decompress(b"".join(chunks))
+    stride = width * channels
+    step = max(1, -(-max(width, height) // max_size))  # sous-échantillonnage
+    previous = bytearray(stride)
+    rgb = bytearray()
+    alpha = bytearray()
+    for y in range(height):
+        offset = y * (stride + 1)
+        kind = raw[offset]
+        line = bytearray(raw[offset + 1 : offset + 1 + stride])
+        if kind == 1:
+            for i in range(channels, stride):
+                line[i] = (line[i] + line[i - channels]) & 0xFF
+        elif kind == 2:
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, previous))
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - channels] if i >= channels else 0
+                line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                left = line[i - channels] if i >= channels else 0
+                upper_left = previous[i - channels] if i >= channels else 0
+                line[i] = (line[i] + _paeth(left, previous[i], upper_left)) & 0xFF
+        previous = line
+        if y % step:
+            continue
+        for x in range(0, width, step):
+            pixel = line[x * channels : (x + 1) * channels]
+            if channels in (1, 2):
+                rgb += bytes((pixel[0],)) * 3
+            else:
+                rgb += pixel[:3]
+            if channels in (2, 4):
+                alpha.append(pixel[-1])
+    return {
+        "width": -(-width // step),
+        "height": -(-height // step),
+        "rgb": bytes(rgb),
+        "alpha": bytes(alpha) if alpha else None,
+    }
+
+
+def _read_jpeg(data: bytes) -> Optional[Dict[str, Any]]:
+    """Dimensions of a JPEG (embedded as is with DCTDecode)"""
+    position = 2
+    while position + 9 < len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        (length,) = struct.unpack(">H", data[position + 2 : position + 4])
+        if marker in (0xC0, 0xC1, 0xC2):
+            height, width = struct.unpack(">HH", data[position + 5 : position + 9])
+            components = data[position + 9]
+            return {
+                "width": width,
+                "height": height,
+                "jpeg": data,
+                "components": components,
+            }
+        position += 2 + length
+    return None
+
+
+@lru_cache(maxsize=4)
+def _load_image(path: str, mtime_ns: int, max_size: int) -> Optional[Dict[str, Any]]:
+    data = Path(path).read_bytes()
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return _read_png(data, max_size)
+    if data.startswith(b"\xff\xd8"):
+        return _read_jpeg(data)
+    return None
+
+
+def load_logo(path: Path | str | None, max_size: int = 160) -> Optional[Dict[str, Any]]:
+    """Decoded logo (cached per file version), None if missing or unsupported"""
+    if not path:
+        return None
+    logo_path = Path(path)
+    if not logo_path.is_absolute() and not logo_path.exists():
+        # Chemin relatif au dossier frontend (ex: "src/assets/icon.png")
+        logo_path = Path(__file__).resolve().parents[2] / logo_path
+    try:
+        stat = logo_path.stat()
+        return _load_image(str(logo_path), stat.st_mtime_ns, max_size)
+    except (OSError, ValueError, zlib.error, struct.error) as e:
+        print(f"Logo ignoré ({logo_path}) : {e}")
+        return None
+
+
+# ----------------------------------------------------------------------
+# Writer
+
+
+class PdfReportWriter:
+    """Lay out tabular report data on paginated PDF pages.
+
+    Rows are read from any iterable and every page is written to the file
+    as soon as it is full: only the current page and the object offsets are
+    kept in memory. Each page repeats the header (logo, school name, report
+    title, date, page number) and the table header. Totals of the `total`
+    columns are carried forward: "À reporter" at the bottom of a page,
+    "Report" at the top of the next one, and the grand total on the last.
+
+    Text uses the standard Helvetica fonts (WinAnsiEncoding): characters
+    outside Windows-1252 are printed as "?".
+    """
+
+    PAGE_SIZE = (595.28, 841.89)  # A4 en points
+    MARGIN = 36
+    ROW_HEIGHT = 16
+    FONT_SIZE = 8.5
+    HEADER_HEIGHT = 64
+    LANDSCAPE_MIN_COLUMNS = 7
+
+    LABELS = {
+        "carried_forward": "À reporter",
+        "brought_forward": "Report",
+        "total": "Total",
+        "page": "Page",
+        "generated_on": "Généré le",
+    }
+
+    def __init__(
+        self,
+        path: Path | str,
+        columns: Sequence[ExportColumn],
+        title: str,
+        subtitle: str | None = None,
+        school_name: str = Config.SCHOOL_NAME,
+        logo_path: Path | str | None = Config.RECEIPT_LOGO_PATH,
+        currency: str = Constants.DEVISE,
+        landscape: bool | None = None,
+        labels: Dict[str, str] | None = None,
+    ) -> None:
+        if not columns:
+            raise ValueError("At least one column is required")
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.title = title
+        self.subtitle = subtitle
+        self.school_name = school_name
+        self.logo = load_logo(logo_path)
+        self.currency = currency
+        self.labels = {**self.LABELS, **(labels or {})}
+        if landscape is None:
+            landscape = len(self.columns) >= self.LANDSCAPE_MIN_COLUMNS
+        width, height = self.PAGE_SIZE
+        self.page_width, self.page_height = (
+            (height, width) if landscape else (width, height)
+        )
+        self.generated_on = datetime.now().strftime("%d/%m/%Y %H:%M")
+
+        available = self.page_width - 2 * self.MARGIN
+        weight = sum(column.width for column in self.columns)
+        self.column_widths = [
+            available * column.width / weight for column in self.columns
+        ]
+        # Les lignes de totaux n'ont de sens que si la 1re colonne peut porter le libellé
+        self.has_totals = (
+            any(column.total for column in self.columns) and not self.columns[0].total
+        )
+
+        self.rows_written = 0
+        self.pages_written = 0
+
+    # ------------------------------------------------------------------
+    # Values
+    def format_value(self, column: ExportColumn, value: Any) -> str:
+        if value is None or value == "":
+            return ""
+        try:
+            if column.kind == ExportColumn.AMOUNT:
+                return f"{float(value):,.2f} {self.currency}"
+            if column.kind == ExportColumn.NUMBER:
+                return f"{float(value):,.2f}"
+            if column.kind == ExportColumn.INTEGER:
+                return str(int(value))
+        except (TypeError, ValueError):
+            pass
+        return str(value)
+
+    # ------------------------------------------------------------------
+    # Writing
+    def write(
+        self,
+        rows: Iterable[Any],
+        progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """Write the report and return the number of data rows.
+
+        `progress(rows_written)` is called after each page.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows_written = 0
+        self.pages_written = 0
+        totals = [0.0] * len(self.columns)
+        rows = iter(rows)
+        end = object()
+
+        with self.path.open("wb") as stream:
+            self._stream = stream
+            self._offsets: Dict[int, int] = {}
+            self._next_id = 5  # 1 catalogue, 2 pages, 3-4 polices
+            self._page_ids: List[int] = []
+            stream.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            self._write_fonts()
+            image_id = self._write_logo()
+
+            row = next(rows, end)
+            while True:
+                page = _PageContent()
+                y = self._draw_page_header(page, image_id)
+                y = self._draw_table_header(page, y)
+                if self.pages_written and self.has_totals:
+                    y = self._draw_totals_row(
+                        page, y, self.labels["brought_forward"], totals
+                    )
+
+                # Une ligne est toujours réservée pour « À reporter » / « Total »
+                bottom = self.MARGIN + self.ROW_HEIGHT
+                index = 0
+                while row is not end and y - self.ROW_HEIGHT >= bottom:
+                    y = self._draw_row(page, y, row, index)
+                    for position, column in enumerate(self.columns):
+                        if column.total:
+                            try:
+                                totals[position] += float(column.value(row) or 0)
+                            except (TypeError, ValueError):
+                                pass
+                    self.rows_written += 1
+                    index += 1
+                    row = next(rows, end)
+
+                if row is end:
+                    if self.has_totals:
+                        self._draw_totals_row(page, y, self.labels["total"], totals)
+                    self._write_page(page)
+                    break
+                if self.has_totals:
+                    self._draw_totals_row(
+                        page, y, self.labels["carried_forward"], totals
+                    )
+                self._write_page(page)
+                if progress is not None:
+                    progress(self.rows_written)
+
+            self._write_trailer()
+        if progress is not None:
+            progress(self.rows_written)
+        return self.rows_written
+
+    # ------------------------------------------------------------------
+    # Drawing
+    def _draw_page_header(self, page: "_PageContent", image_id: Optional[int]) -> float:
+        top = self.page_height - self.MARGIN
+        left = self.MARGIN
+        if image_id is not None:
+            size = 40
+            ratio = self.logo["width"] / self.logo["height"]
+            page.image(image_id, left, top - size, size * min(ratio, 1.5), size)
+            left += size * min(ratio, 1.5) + 10
+        page.text(left, top - 14, self.school_name, 14, bold=True)
+        page.text(left, top - 30, self.title, 11, bold=True)
+        if self.subtitle:
+            page.text(left, top - 43, self.subtitle, 8.5)
+
+        right = self.page_width - self.MARGIN
+        generated = f"{self.labels['generated_on']} {self.generated_on}"
+        page.text(right - text_width(generated, 8), top - 12, generated, 8)
+        number = f"{self.labels['page']} {self.pages_written + 1}"
+        page.text(right - text_width(number, 8), top - 24, number, 8)
+
+        y = top - self.HEADER_HEIGHT + 10
+        page.line(self.MARGIN, y, right, y, 0.8)
+        return y - 8
+
+    def _draw_table_header(self, page: "_PageContent", y: float) -> float:
+        page.rect(
+            self.MARGIN,
+            y - self.ROW_HEIGHT,
+            self.page_width - 2 * self.MARGIN,
+            self.ROW_HEIGHT,
+            0.85,
+        )
+        self._draw_cells(page, y, [column.title for column in self.columns], bold=True)
+        return y - self.ROW_HEIGHT
+
+    def _draw_row(self, page: "_PageContent", y: float, row: Any, index: int) -> float:
+        if index % 2:
+            page.rect(
+                self.MARGIN,
+                y - self.ROW_HEIGHT,
+                self.page_width - 2 * self.MARGIN,
+                self.ROW_HEIGHT,
+                0.96,
+            )
+        values = [
+            self.format_value(column, column.value(row)) for column in self.columns
+        ]
+        self._draw_cells(page, y, values)
+        return y - self.ROW_HEIGHT
+
+    def _draw_totals_row(
+        self, page: "_PageContent", y: float, label: str, totals: List[float]
+    ) -> float:
+        right = self.page_width - self.MARGIN
+        page.line(self.MARGIN, y, right, y, 0.6)
+        values = [
+            self.format_value(column, totals[position]) if column.total else ""
+            for position, column in enumerate(self.columns)
+        ]
+        values[0] = label
+        self._draw_cells(page, y, values, bold=True)
+        page.line(self.MARGIN, y - self.ROW_HEIGHT, right, y - self.ROW_HEIGHT, 0.6)
+        return y - self.ROW_HEIGHT
+
+    def _draw_cells(
+        self, page: "_PageContent", y: float, values: List[str], bold: bool = False
+    ) -> None:
+        x = self.MARGIN
+        baseline = y - self.ROW_HEIGHT + 5
+        for column, width, value in zip(self.columns, self.column_widths, values):
+            text = _fit(value, width - 6, self.FONT_SIZE, bold)
+            if column.is_numeric:
+                page.text(
+                    x + width - 3 - text_width(text, self.FONT_SIZE, bold),
+                    baseline,
+                    text,
+                    self.FONT_SIZE,
+                    bold,
+                )
+            else:
+                page.text(x + 3, baseline, text, self.FONT_SIZE, bold)
+            x += width
+
+    # ------------------------------------------------------------------
+    # PDF objects
+    def _new_id(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _write_object(
+        self, object_id: int, body: bytes, stream: bytes | None = None
+    ) -> None:
+        self._offsets[object_id] = self._stream.tell()
+        self._stream.write(f"{object_id} 0 obj\n".encode("ascii"))
+        self._stream.write(body)
+        if stream is not None:
+            self._stream.write(b"\nstream\n")
+            self._stream.write(stream)
+            self._stream.write(b"\nendstream")
+        self._stream.write(b"\nendobj\n")
+
+    def _write_fonts(self) -> None:
+        for object_id, name in ((3, "Helvetica"), (4, "Helvetica-Bold")):
+            self._write_object(
+                object_id,
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding /WinAnsiEncoding >>".encode(
+                    "ascii"
+                ),
+            )
+
+    def _write_logo(self) -> Optional[int]:
+        logo = self.logo
+        if logo is None:
+            return None
+        image_id = self._new_id()
+        if "jpeg" in logo:
+            color_space = {1: "/DeviceGray", 4: "/DeviceCMYK"}.get(
+                logo["components"], "/DeviceRGB"
+            )
+            data = logo["jpeg"]
+            self._write_object(
+                image_id,
+                f"<< /Type /XObject /Subtype /Image /Width {logo['width']} /Height {logo['height']} "
+                f"/ColorSpace {color_space} /BitsPerComponent 8 /Filter /DCTDecode /Length {len(data)} >>".encode(
+                    "ascii"
+                ),
+                data,
+            )
+            return image_id
+
+        mask = ""
+        if logo["alpha"] is not None:
+            mask_id = self._new_id()
+            alpha = zlib.compress(logo["alpha"])
+            self._write_object(
+                mask_id,
+                f"<< /Type /XObject /Subtype /Image /Width {logo['width']} /Height {logo['height']} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode /Length {len(alpha)} >>".encode(
+                    "ascii"
+                ),
+                alpha,
+            )
+            mask = f" /SMask {mask_id} 0 R"
+        rgb = zlib.compress(logo["rgb"])
+        self._write_object(
+            image_id,
+            f"<< /Type /XObject /Subtype /Image /Width {logo['width']} /Height {logo['height']} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode{mask} /Length {len(rgb)} >>".encode(
+                "ascii"
+            ),
+            rgb,
+        )
+        return image_id
+
+    def _write_page(self, page: "_PageContent") -> None:
+        content = zlib.compress(page.getvalue())
+        content_id = self._new_id()
+        self._write_object(
+            content_id,
+            f"<< /Filter /FlateDecode /Length {len(content)} >>".encode("ascii"),
+            content,
+        )
+        page_id = self._new_id()
+        images = "".join(f" /Im{image_id} {image_id} 0 R" for image_id in page.images)
+        self._write_object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.page_width:.2f} {self.page_height:.2f}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> /XObject <<{images} >> >> "
+                f"/Contents {content_id} 0 R >>"
+            ).encode("ascii"),
+        )
+        self._page_ids.append(page_id)
+        self.pages_written += 1
+
+    def _write_trailer(self) -> None:
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(
+            2,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode(
+                "ascii"
+            ),
+        )
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self._stream.tell()
+        count = self._next_id
+        lines = [f"xref\n0 {count}\n", "0000000000 65535 f \n"]
+        for object_id in range(1, count):
+            lines.append(f"{self._offsets.get(object_id, 0):010d} 00000 n \n")
+        lines.append(
+            f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+        )
+        self._stream.write("".join(lines).encode("ascii"))
+
+
+class _PageContent:
+    """Content stream operators of the page being laid out"""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self.images: List[int] = []
+
+    def text(
+        self, x: float, y: float, text: str, size: float, bold: bool = False
+    ) -> None:
+        if not text:
+            return
+        font = "/F2" if bold else "/F1"
+        self._parts.append(
+            f"BT {font} {size:g} Tf {x:.2f} {y:.2f} Td ".encode("ascii")
+            + _pdf_string(text)
+            + b" Tj ET\n"
+        )
+
+    def rect(
+        self, x: float, y: float, width: float, height: float, gray: float
+    ) -> None:
+        self._parts.append(
+            f"{gray:g} g {x:.2f} {y:.2f} {width:.2f} {height:.2f} re f 0 g\n".encode(
+                "ascii"
+            )
+        )
+
+    def line(
+        self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5
+    ) -> None:
+        self._parts.append(
+            f"{width:g} w {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S\n".encode("ascii")
+        )
+
+    def image(
+        self, image_id: int, x: float, y: float, width: float, height: float
+    ) -> None:
+        if image_id not in self.images:
+            self.images.append(image_id)
+        self._parts.append(
+            f"q {width:.2f} 0 0 {height:.2f} {x:.2f} {y:.2f} cm /Im{image_id} Do Q\n".encode(
+                "ascii"
+            )
+        )
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._parts)
+
+
+def write_pdf_report(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: Iterable[Any],
+    title: str,
+    progress: Callable[[int], None] | None = None,
+    **options: Any,
+) -> int:
+    """Write `rows` to a paginated PDF report and return the number of data rows"""
+    return PdfReportWriter(path, columns, title, **options).write(rows, progress)
+
+
+async def export_pdf_report(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: Iterable[Any],
+    title: str,
+    progress: Callable[[int], None] | None = None,
+    **options: Any,
+) -> int:
+    """`write_pdf_report` in a worker thread so the event loop keeps running"""
+    return await asyncio.to_thread(
+        write_pdf_report, path, columns, rows, title, progress, **options
+    )
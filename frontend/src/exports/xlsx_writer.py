@@ -0,0 +1,349 @@
+"""Streaming XLSX writer (no third-party dependency)"""
+
+import asyncio
+import itertools
+import re
+import zipfile
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+from core.constants import Constants
+
+from .columns import ExportColumn
+
+# Caractères interdits dans un document XML 1.0
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+
+@lru_cache(maxsize=4096)
+def _excel_serial(value: str) -> Optional[float]:
+    """Excel serial number of an ISO date/datetime string (None if not a date)"""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    delta = moment - _EXCEL_EPOCH
+    return delta.days + delta.seconds / 86400
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _text(value: Any) -> str:
+    return escape(_INVALID_XML_CHARS.sub("", str(value)))
+
+
+class XlsxWriter:
+    """Write an .xlsx workbook row by row, in constant memory.
+
+    The worksheet XML is streamed into the zip archive while the rows are
+    read from any iterable (a generator over a database cursor, a list...):
+    nothing but the current buffer is kept in memory. Strings are written
+    inline (no shared strings table), dates become real Excel dates and
+    amounts get a number format with the school currency.
+
+    A sheet is limited to 1,048,576 rows by Excel: longer exports continue
+    on "<sheet> (2)", "<sheet> (3)"...
+    """
+
+    MAX_ROWS = 1_048_576
+    BUFFER_ROWS = 2000
+
+    # Index des styles (cellXfs) de styles.xml
+    STYLE_DEFAULT = 0
+    STYLE_HEADER = 1
+    STYLE_AMOUNT = 2
+    STYLE_INTEGER = 3
+    STYLE_NUMBER = 4
+    STYLE_DATE = 5
+
+    def __init__(
+        self,
+        path: Path | str,
+        columns: Sequence[ExportColumn],
+        sheet_name: str = "Rapport",
+        currency: str = Constants.DEVISE,
+    ) -> None:
+        if not columns:
+            raise ValueError("At least one column is required")
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.sheet_name = self._clean_sheet_name(sheet_name)
+        self.currency = currency
+        self.rows_written = 0
+
+    @staticmethod
+    def _clean_sheet_name(name: str) -> str:
+        name = re.sub(r"[\[\]:*?/\\]", " ", name).strip() or "Rapport"
+        return name[:31]
+
+    # ------------------------------------------------------------------
+    # Writing
+    def write(
+        self,
+        rows: Iterable[Any],
+        progress: Callable[[int], None] | None = None,
+        progress_every: int = 10_000,
+    ) -> int:
+        """Write every row of `rows` and return the number of data rows.
+
+        `progress(rows_written)` is called every `progress_every` rows.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rows = iter(rows)
+        sheet_names: List[str] = []
+        self.rows_written = 0
+        with zipfile.ZipFile(
+            self.path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6
+        ) as archive:
+            while True:
+                name = self.sheet_name
+                if sheet_names:
+                    suffix = f" ({len(sheet_names) + 1})"
+                    name = self.sheet_name[: 31 - len(suffix)] + suffix
+                sheet_names.append(name)
+                full = self._write_sheet(
+                    archive, len(sheet_names), rows, progress, progress_every
+                )
+                if not full:
+                    break
+                # Pas de feuille vide si la limite tombe pile sur la dernière ligne
+                try:
+                    first = next(rows)
+                except StopIteration:
+                    break
+                rows = itertools.chain([first], rows)
+            self._write_package(archive, sheet_names)
+        if progress is not None:
+            progress(self.rows_written)
+        return self.rows_written
+
+    def _write_sheet(
+        self,
+        archive: zipfile.ZipFile,
+        number: int,
+        rows,
+        progress: Callable[[int], None] | None,
+        progress_every: int,
+    ) -> bool:
+        """Stream one worksheet; returns True if it stopped at the row limit"""
+        cell_writers = [
+            self._cell_writer(index, column)
+            for index, column in enumerate(self.columns)
+        ]
+        last_column = _column_letter(len(self.columns) - 1)
+        full = False
+        row_number = 1
+
+        with archive.open(
+            f"xl/worksheets/sheet{number}.xml", "w", force_zip64=True
+        ) as stream:
+            stream.write(self._sheet_header().encode("utf-8"))
+            buffer = [self._header_row()]
+            for row in rows:
+                row_number += 1
+                cells = "".join(write(row, row_number) for write in cell_writers)
+                buffer.append(f'<row r="{row_number}">{cells}</row>')
+                self.rows_written += 1
+                if len(buffer) >= self.BUFFER_ROWS:
+                    stream.write("".join(buffer).encode("utf-8"))
+                    buffer.clear()
+                if progress is not None and self.rows_written % progress_every == 0:
+                    progress(self.rows_written)
+                if row_number >= self.MAX_ROWS:
+                    full = True
+                    break
+            buffer.append("</sheetData>")
+            buffer.append(f'<autoFilter ref="A1:{last_column}{row_number}"/>')
+            buffer.append("</worksheet>")
+            stream.write("".join(buffer).encode("utf-8"))
+
+        return full
+
+    def _sheet_header(self) -> str:
+        widths = "".join(
+            f'<col min="{index}" max="{index}" width="{column.width}" customWidth="1"/>'
+            for index, column in enumerate(self.columns, start=1)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetViews><sheetView workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            "</sheetView></sheetViews>"
+            f"<cols>{widths}</cols><sheetData>"
+        )
+
+    def _header_row(self) -> str:
+        cells = "".join(
+            f'<c r="{_column_letter(index)}1" t="inlineStr" s="{self.STYLE_HEADER}">'
+            f'<is><t xml:space="preserve">{_text(column.title)}</t></is></c>'
+            for index, column in enumerate(self.columns)
+        )
+        return f'<row r="1">{cells}</row>'
+
+    def _cell_writer(
+        self, index: int, column: ExportColumn
+    ) -> Callable[[Any, int], str]:
+        """Build the function turning a row into the XML of one cell"""
+        letter = _column_letter(index)
+        value_of = column.value
+
+        def text_cell(value: Any, row_number: int) -> str:
+            return (
+                f'<c r="{letter}{row_number}" t="inlineStr">'
+                f'<is><t xml:space="preserve">{_text(value)}</t></is></c>'
+            )
+
+        if column.is_numeric:
+            style = {
+                ExportColumn.AMOUNT: self.STYLE_AMOUNT,
+                ExportColumn.INTEGER: self.STYLE_INTEGER,
+                ExportColumn.NUMBER: self.STYLE_NUMBER,
+            }[column.kind]
+
+            def write(row: Any, row_number: int) -> str:
+                value = value_of(row)
+                if value is None or value == "":
+                    return ""
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        return text_cell(value, row_number)
+                return f'<c r="{letter}{row_number}" s="{style}"><v>{value!r}</v></c>'
+
+        elif column.kind == ExportColumn.DATE:
+
+            def write(row: Any, row_number: int) -> str:
+                value = value_of(row)
+                if value is None or value == "":
+                    return ""
+                if isinstance(value, (date, datetime)):
+                    value = value.isoformat()
+                serial = _excel_serial(str(value))
+                if serial is None:
+                    return text_cell(value, row_number)
+                return f'<c r="{letter}{row_number}" s="{self.STYLE_DATE}"><v>{serial!r}</v></c>'
+
+        else:
+
+            def write(row: Any, row_number: int) -> str:
+                value = value_of(row)
+                if value is None:
+                    return ""
+                return text_cell(value, row_number)
+
+        return write
+
+    # ------------------------------------------------------------------
+    # Package parts
+    def _write_package(self, archive: zipfile.ZipFile, sheet_names: List[str]) -> None:
+        sheets = range(1, len(sheet_names) + 1)
+        archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{number}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for number in sheets
+            )
+            + "</Types>",
+        )
+        archive.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>",
+        )
+        archive.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(
+                f'<sheet name={quoteattr(name)} sheetId="{number}" r:id="rId{number}"/>'
+                for number, name in zip(sheets, sheet_names)
+            )
+            + "</sheets></workbook>",
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{number}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{number}.xml"/>'
+                for number in sheets
+            )
+            + f'<Relationship Id="rId{len(sheet_names) + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            "</Relationships>",
+        )
+        archive.writestr("xl/styles.xml", self._styles())
+
+    def _styles(self) -> str:
+        currency = self.currency.replace('"', "")
+        amount_format = quoteattr(f'#,##0.00 "{currency}"')
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<numFmts count="2">'
+            f'<numFmt numFmtId="164" formatCode={amount_format}/>'
+            '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/>'
+            "</numFmts>"
+            '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+            '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="6">'
+            '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+            '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            "</cellXfs>"
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            "</styleSheet>"
+        )
+
+
+def write_xlsx(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: Iterable[Any],
+    sheet_name: str = "Rapport",
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Write `rows` to an .xlsx file and return the number of data rows"""
+    return XlsxWriter(path, columns, sheet_name=sheet_name).write(rows, progress)
+
+
+async def export_xlsx(
+    path: Path | str,
+    columns: Sequence[ExportColumn],
+    rows: Iterable[Any],
+    sheet_name: str = "Rapport",
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """`write_xlsx` in a worker thread so the event loop keeps running"""
+    return await asyncio.to_thread(
+        write_xlsx, path, columns, rows, sheet_name, progress
+    )
@@ -5,7 +5,7 @@ from flet import *  # type: ignore
 # import asyncio
 
 # Imports des modules locaux
-from core import AppState, Constants
+from core import AppState, Config, Constants, Prefetcher
 from screens import (
     LoginScreen,
     DashboardScreen,
@@ -14,6 +14,8 @@ from screens import (
     AdminScreen,
     CheckoutScreen,
     ReportsScreen,
+    ScreenRegistry,
+    register_scheduled_reports,
 )
 from models import UserModel
 
@@ -26,55 +28,111 @@ class MainAppp:
         self.is_first_launch = is_first_launch
         self.translations = self.app_state.translations
 
+        # Screens are built on first navigation, the dashboard stays alive
+        self.screens = ScreenRegistry(
+            max_alive=Config.MAX_ALIVE_SCREENS, pinned=("dashboard",)
+        )
+        self._register_screens()
+
+        # Warms the data of the likely next screens while the user is idle
+        self.prefetcher = Prefetcher(
+            self.app_state,
+            idle_delay=Config.PREFETCH_IDLE_DELAY,
+            memory_budget_bytes=Config.PREFETCH_MEMORY_BUDGET_MB * 1024 * 1024,
+            depth=Config.PREFETCH_DEPTH,
+        )
+        self._register_prefetch()
+
+        # Configured reports written to disk after hours (Config.SCHEDULED_REPORTS)
+        register_scheduled_reports(self.app_state)
+
         self._load_screens()
 
-    def _load_screens(self, is_language_change: bool = False):
-        self.login_screen = LoginScreen(
-            appState=self.app_state,
-            on_login_success=self.on_login_success,
-            on_change_language=self.change_language,
-            page=self.page,
-            is_first_launch=self.is_first_launch,
+    def _register_screens(self):
+        """Register the factory of every main screen"""
+        self.screens.register(
+            "dashboard",
+            lambda: DashboardScreen(appState=self.app_state, page=self.page),
         )
-        # self.login_screen.set_page(self.page)
-        self.dashboard_screen = DashboardScreen(
-            appState=self.app_state,
-            page=self.page,
+        self.screens.register(
+            "students",
+            lambda: StudentsScreen(app_state=self.app_state, page=self.page),
         )
-
-        self.students_screen = StudentsScreen(
-            app_state=self.app_state,
-            page=self.page,
+        self.screens.register(
+            "payments",
+            lambda: PaymentScreen(app_state=self.app_state, page=self.page),
+        )
+        self.screens.register(
+            "checkout",
+            lambda: CheckoutScreen(appState=self.app_state, page=self.page),
+        )
+        self.screens.register(
+            "reports",
+            lambda: ReportsScreen(app_state=self.app_state, page=self.page),
+        )
+        self.screens.register(
+            "admin",
+            lambda: AdminScreen(app_state=self.app_state, page=self.page),
         )
 
-        self.payment_screen = PaymentScreen(
-            app_state=self.app_state,
-            page=self.page,
+    def _register_prefetch(self):
+        """Register the shared-cache queries each screen needs"""
+        store = self.app_state.store
+        reference_data = self.app_state.reference_data
+        self.prefetcher.register(
+            "students",
+            store.get_students,
+            store.get_classrooms,
+            store.get_enrollments,
+        )
+        self.prefetcher.register(
+            "payments",
+            store.get_students,
+            store.get_classrooms,
+            store.get_enrollments,
+            reference_data.get_fees,
+            store.get_payments,
+        )
+        self.prefetcher.register(
+            "reports",
+            store.get_students,
+            store.get_classrooms,
+            store.get_enrollments,
+            store.get_payments,
+        )
+        self.prefetcher.register(
+            "admin",
+            reference_data.get_classrooms,
+            reference_data.get_fees,
+            reference_data.get_roles,
         )
 
-        self.checkout_screen = CheckoutScreen(
+    def _load_screens(self):
+        self.login_screen = LoginScreen(
             appState=self.app_state,
+            on_login_success=self.on_login_success,
+            on_change_language=self.change_language,
             page=self.page,
+            is_first_launch=self.is_first_launch,
         )
+        # self.login_screen.set_page(self.page)
 
-        self.admin_screen = AdminScreen(app_state=self.app_state, page=self.page)
-
-        self.reports_screen = ReportsScreen(
-            app_state=self.app_state,
-            page=self.page,
+        # Drop the screens built with the previous user
+        self.prefetcher.stop()
+        self.app_state.report_scheduler.stop()
+        self.app_state.loader.cancel_all()
+        self.screens.clear()
+
+        # self._setup_screen(self.login_screen.build_page())
+        # For testing purposes, directly show main layout
+        self.app_state.current_user = UserModel(
+            id_user=1,
+            username="admin",
+            email="admin@example.com",
+            password="admin",
+            role_id=1,
         )
-
-        if not is_language_change:
-            # self._setup_screen(self.login_screen.build_page())
-            # For testing purposes, directly show main layout
-            self.app_state.current_user = UserModel(
-                id_user=1,
-                username="admin",
-                email="admin@example.com",
-                password="admin",
-                role_id=1,
-            )
-            self.on_login_success(self.app_state)
+        asyncio.create_task(self.on_login_success(self.app_state))
 
     def _setup_screen(self, screen: Control):
 
@@ -86,28 +144,46 @@ class MainAppp:
         return self.app_state.translations.get(key, key)
 
     def on_logout(self, e):
-        self.app_state.current_user = None
+        # Jobs, cached reports and shared data of the previous user
+        self.app_state.end_session()
         self.page.update()
         self._load_screens()
 
-    def on_login_success(self, app_state: AppState):
+    async def on_login_success(self, app_state: AppState):
         self.app_state = app_state
+        # Read by the first render (school name in exports...): load before building
+        await self.app_state.settings.load()
+        if Config.SCHEDULED_REPORTS_ENABLED:
+            self.app_state.report_scheduler.start()
         self.init_ui_components()
         self.show_main_layout()
 
     def change_language(self, language: str):
-        self.app_state.current_language = language
-        self.app_state.translations = self.app_state.load_translations(language)
-        self.translations = self.app_state.translations
-        self._load_screens()
+        """Changer la langue depuis l'écran de connexion"""
+        self.app_state.set_language(language, roots=[self.login_screen])
+        self.page.update()
 
     def change_home_language(self, e: Event):
-        self.app_state.current_language = e.control.value
-        self.app_state.translations = self.app_state.load_translations(e.control.value)
-        self.translations = self.app_state.translations
-        self.init_ui_components()
-        self._load_screens(is_language_change=True)
-        self.show_main_layout()
+        """Relibeller sur place la coque et les écrans vivants (sans requête)"""
+        self.app_state.set_language(e.control.value, roots=self._translatable_roots())
+        for screen in self.screens.alive_screens:
+            # Libellés composés qu'un écran reconstruit lui-même
+            screen.on_language_change()
+        self.page.update()
+
+    def _translatable_roots(self) -> list:
+        """Contrôles à relibeller lors d'un changement de langue"""
+        return [
+            self.app_bar,
+            self.navigation_rail,
+            self.menu_language,
+            self.login_screen,
+            *self.screens.alive_screens,
+        ]
+
+    def _connected_user_label(self, connected: str) -> str:
+        user = self.app_state.current_user
+        return f"{connected}: {user.username if user else self.get_text('invite')}"
 
     def init_ui_components(self):
         """Initialiser les composants UI"""
@@ -176,10 +252,11 @@ class MainAppp:
                 ),
                 PopupMenuButton(
                     items=[
-                        PopupMenuItem(
-                            content=f"{self.get_text('connected')}: {self.app_state.current_user.username if self.app_state.current_user else self.get_text('invite')}",
-                            icon=Icons.PERSON,
-                            disabled=True,
+                        self.app_state.translator.bind(
+                            PopupMenuItem(icon=Icons.PERSON, disabled=True),
+                            "content",
+                            "connected",
+                            self._connected_user_label,
                         ),
                         PopupMenuItem(),  # Séparateur
                         PopupMenuItem(
@@ -305,8 +382,12 @@ class MainAppp:
 
     def show_main_layout(self):
         """Afficher la mise en page principale"""
-        self.content_area.content = self.dashboard_screen.build()
-        asyncio.create_task(self.dashboard_screen.on_mount())
+        dashboard_screen = self.screens.get("dashboard")
+        self.content_area.content = dashboard_screen.build()
+        self.app_state.loader.load(
+            "dashboard", dashboard_screen.on_mount, exclusive=True
+        )
+        self.prefetcher.on_navigation("dashboard")
 
         main_layout = Row(
             controls=[
@@ -347,30 +428,18 @@ class MainAppp:
 
         selected_data = destinations[index].data
 
-        if selected_data == "dashboard":
-            self.content_area.content = self.dashboard_screen.build()
-            # self.content_area.content = self.dashboard_screen.build()
-            # asyncio.create_task(self.dashboard_screen.on_mount())
-
-        elif selected_data == "students":
-            self.content_area.content = self.students_screen.build()
-            asyncio.create_task(self.students_screen.on_mount())
-
-        elif selected_data == "payments":
-            self.content_area.content = self.payment_screen.build()
-            asyncio.create_task(self.payment_screen.on_mount())
-
-        elif selected_data == "checkout":
-            self.content_area.content = self.checkout_screen.build()
-            asyncio.create_task(self.checkout_screen.on_mount())
-
-        elif selected_data == "reports":
-            self.content_area.content = self.reports_screen.build()
-            asyncio.create_task(self.reports_screen.on_mount())
-
-        elif selected_data == "admin":
-            self.content_area.content = self.admin_screen.build()
-            asyncio.create_task(self.admin_screen.on_mount())
+        # The dashboard keeps its data between visits, other screens reload.
+        # Starting a load cancels the loads of the screens left behind.
+        is_new_screen = not self.screens.is_alive(selected_data)
+        screen = self.screens.get(selected_data)
+        self.content_area.content = screen.build()
+        if (
+            is_new_screen
+            or selected_data != "dashboard"
+            or not self.app_state.loader.has_loaded("dashboard")
+        ):
+            self.app_state.loader.load(selected_data, screen.on_mount, exclusive=True)
+        self.prefetcher.on_navigation(selected_data)
 
         self.content_area.update()
 
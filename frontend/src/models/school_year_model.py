@@ -30,3 +30,14 @@ class SchoolYearModel:
             "is_active": self.is_active,
             "is_deleted": self.is_deleted,
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SchoolYearModel":
+        return cls(
+            id_school_year=data["id_school_year"],
+            name=data["name"],
+            start_date=data["start_date"],
+            end_date=data["end_date"],
+            is_active=data["is_active"],
+            is_deleted=data.get("is_deleted", False),
+        )
@@ -6,6 +6,9 @@ from .payment.payment_screen import PaymentScreen
 from .admin.admin_screen import AdminScreen
 from .checkout.checkout_screen import CheckoutScreen
 from .reports.reports_screen import ReportsScreen
+from .reports.reports_scheduled import register_scheduled_reports
+from .screen_registry import ScreenRegistry
+from .virtual_table import TableAction, TableColumn, VirtualTable
 
 __all__ = [
     "LoginScreen",
@@ -16,4 +19,9 @@ __all__ = [
     "AdminScreen",
     "CheckoutScreen",
     "ReportsScreen",
+    "register_scheduled_reports",
+    "ScreenRegistry",
+    "TableAction",
+    "TableColumn",
+    "VirtualTable",
 ]
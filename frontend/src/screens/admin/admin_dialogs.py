@@ -26,6 +26,7 @@ from flet import (
     KeyboardType,
 )
 from core.constants import Constants
+from core.reference_cache import ReferenceCache
 from models.user_model import UserModel
 from models.classroom_model import ClassroomModel
 from models.school_year_model import SchoolYearModel
@@ -58,23 +59,17 @@ class AdminDialogs:
         self.current_deleting_staff_id = None
         self.current_deleting_fee_id = None
 
-    def build_all_dialogs(self):
-        """Construire tous les dialogues"""
-        self._build_edit_dialogs()
-        self._build_delete_dialogs()
+        self.current_archiving_school_year_id = None
+
+    def _ensure_dialog(self, dialog_name: str, builder):
+        """Construire un dialogue à sa première ouverture seulement"""
+        if not hasattr(self, dialog_name):
+            builder()
 
     #################################################################
     # DIALOGUES D'ÉDITION
     #################################################################
 
-    def _build_edit_dialogs(self):
-        """Construire tous les dialogues d'édition"""
-        self._build_user_edit_dialog()
-        self._build_classroom_edit_dialog()
-        self._build_school_year_edit_dialog()
-        self._build_staff_edit_dialog()
-        self._build_fee_edit_dialog()
-
     def _build_user_edit_dialog(self):
         """Construire le dialogue d'édition utilisateur"""
         self.edit_user_username_field = TextField(
@@ -481,14 +476,6 @@ class AdminDialogs:
     # DIALOGUES DE SUPPRESSION
     #################################################################
 
-    def _build_delete_dialogs(self):
-        """Construire tous les dialogues de suppression"""
-        self._build_user_delete_dialog()
-        self._build_classroom_delete_dialog()
-        self._build_school_year_delete_dialog()
-        self._build_staff_delete_dialog()
-        self._build_fee_delete_dialog()
-
     def _build_user_delete_dialog(self):
         """Construire le dialogue de suppression utilisateur"""
         self.delete_user_motive_field = TextField(
@@ -735,6 +722,83 @@ class AdminDialogs:
             actions_alignment=MainAxisAlignment.END,
         )
 
+    def _build_school_year_archive_dialog(self):
+        """Construire le dialogue d'archivage d'une année scolaire clôturée"""
+        self.school_year_name_to_be_archived = Text(
+            value="",
+            weight=FontWeight.BOLD,
+            size=16,
+        )
+        self.archive_school_year_error_text = Text(
+            self.parent.get_text("archive_school_year_failed"),
+            color=Constants.CANCEL_COLOR,
+            size=14,
+            visible=False,
+        )
+
+        self.archive_school_year_dialog = AlertDialog(
+            modal=True,
+            scrollable=True,
+            bgcolor="#f8faff",
+            title=Container(
+                content=Text(
+                    self.parent.get_text("archive_school_year"),
+                    weight=FontWeight.BOLD,
+                    color="white",
+                ),
+                padding=Padding.symmetric(horizontal=20, vertical=10),
+                align=Alignment.CENTER_LEFT,
+                alignment=Alignment.CENTER_LEFT,
+                border_radius=BorderRadius.all(10),
+                bgcolor=Constants.SECONDARY_COLOR,
+            ),
+            content=Container(
+                content=Column(
+                    controls=[
+                        Text(
+                            self.parent.get_text("confirm_archive_school_year"),
+                            size=14,
+                            color=Constants.PRIMARY_COLOR,
+                        ),
+                        self.school_year_name_to_be_archived,
+                        self.archive_school_year_error_text,
+                    ],
+                    spacing=15,
+                    tight=True,
+                    horizontal_alignment=CrossAxisAlignment.STRETCH,
+                ),
+                width=400,
+                padding=Padding.all(20),
+                align=Alignment.CENTER_LEFT,
+                alignment=Alignment.CENTER_LEFT,
+                clip_behavior=ClipBehavior.HARD_EDGE,
+                **self.parent.get_box_style(),
+            ),
+            actions=[
+                Button(
+                    content=Text(self.parent.get_text("cancel")),
+                    on_click=self._close_school_year_archive_dialog,
+                    style=ButtonStyle(
+                        shape=RoundedRectangleBorder(radius=5),
+                        bgcolor=Constants.CANCEL_COLOR,
+                        padding=Padding(10, 20, 10, 20),
+                        color="white",
+                    ),
+                ),
+                Button(
+                    content=Text(self.parent.get_text("archive")),
+                    on_click=self._confirm_archive_school_year,
+                    style=ButtonStyle(
+                        shape=RoundedRectangleBorder(radius=5),
+                        bgcolor=Constants.PRIMARY_COLOR,
+                        padding=Padding(10, 20, 10, 20),
+                        color="white",
+                    ),
+                ),
+            ],
+            actions_alignment=MainAxisAlignment.END,
+        )
+
     def _build_staff_delete_dialog(self):
         """Construire le dialogue de suppression personnel"""
         self.delete_staff_motive_field = TextField(
@@ -826,6 +890,8 @@ class AdminDialogs:
         if not user:
             return
 
+        self._ensure_dialog("edit_user_dialog", self._build_user_edit_dialog)
+
         self.current_editing_user_id = user.id_user
         self.edit_user_username_field.value = user.username
         self.edit_user_email_field.value = user.email
@@ -843,6 +909,8 @@ class AdminDialogs:
         if not classroom:
             return
 
+        self._ensure_dialog("edit_classroom_dialog", self._build_classroom_edit_dialog)
+
         self.current_editing_classroom_id = classroom.id_classroom
         self.edit_classroom_name_field.value = classroom.name
         self.edit_classroom_level_field.value = classroom.level
@@ -855,6 +923,10 @@ class AdminDialogs:
         if not school_year:
             return
 
+        self._ensure_dialog(
+            "edit_school_year_dialog", self._build_school_year_edit_dialog
+        )
+
         self.current_editing_school_year_id = school_year.id_school_year
         self.edit_school_year_name_field.value = school_year.name
         self.edit_school_year_start_date_field.value = school_year.start_date
@@ -869,6 +941,8 @@ class AdminDialogs:
         if not staff:
             return
 
+        self._ensure_dialog("edit_staff_dialog", self._build_staff_edit_dialog)
+
         self.current_editing_staff_id = staff.id_staff
         self.edit_staff_first_name_field.value = staff.first_name
         self.edit_staff_last_name_field.value = staff.last_name
@@ -955,6 +1029,7 @@ class AdminDialogs:
 
         # TODO: Appel API pour mettre à jour la classe
         # success = await self.parent.services.update_classroom(updated_classroom)
+        self.parent.invalidate_reference_data(ReferenceCache.CLASSROOMS)
 
         self._close_classroom_edit_dialog()
         await self.parent.tables.update_classroom_table()
@@ -983,6 +1058,9 @@ class AdminDialogs:
 
         # TODO: Appel API pour mettre à jour l'année scolaire
         # success = await self.parent.services.update_school_year(updated_school_year)
+        self.parent.invalidate_reference_data(
+            ReferenceCache.ACTIVE_SCHOOL_YEAR, ReferenceCache.SCHOOL_YEARS
+        )
 
         self._close_school_year_edit_dialog()
         await self.parent.tables.update_school_year_table()
@@ -1029,6 +1107,8 @@ class AdminDialogs:
         if not user:
             return
 
+        self._ensure_dialog("delete_user_dialog", self._build_user_delete_dialog)
+
         self.current_deleting_user_id = user.id_user
         self.user_name_to_be_deleted.value = user.username
         self.delete_user_motive_field.value = ""
@@ -1041,6 +1121,10 @@ class AdminDialogs:
         if not classroom:
             return
 
+        self._ensure_dialog(
+            "delete_classroom_dialog", self._build_classroom_delete_dialog
+        )
+
         self.current_deleting_classroom_id = classroom.id_classroom
         self.classroom_name_to_be_deleted.value = classroom.name
         self.delete_classroom_motive_field.value = ""
@@ -1053,6 +1137,10 @@ class AdminDialogs:
         if not school_year:
             return
 
+        self._ensure_dialog(
+            "delete_school_year_dialog", self._build_school_year_delete_dialog
+        )
+
         self.current_deleting_school_year_id = school_year.id_school_year
         self.school_year_name_to_be_deleted.value = school_year.name
         self.delete_school_year_motive_field.value = ""
@@ -1060,11 +1148,29 @@ class AdminDialogs:
         self.parent.page.show_dialog(self.delete_school_year_dialog)
         self.parent.page.update()
 
+    def open_school_year_archive_dialog(self, school_year: SchoolYearModel):
+        """Ouvrir le dialogue d'archivage année scolaire"""
+        if not school_year or school_year.is_active:
+            return
+
+        self._ensure_dialog(
+            "archive_school_year_dialog", self._build_school_year_archive_dialog
+        )
+
+        self.current_archiving_school_year_id = school_year.id_school_year
+        self.school_year_name_to_be_archived.value = school_year.name
+        self.archive_school_year_error_text.visible = False
+
+        self.parent.page.show_dialog(self.archive_school_year_dialog)
+        self.parent.page.update()
+
     def open_staff_delete_dialog(self, staff: StaffModel):
         """Ouvrir le dialogue de suppression personnel"""
         if not staff:
             return
 
+        self._ensure_dialog("delete_staff_dialog", self._build_staff_delete_dialog)
+
         self.current_deleting_staff_id = staff.id_staff
         full_name = f"{staff.first_name} {staff.last_name}"
         self.staff_name_to_be_deleted.value = full_name
@@ -1092,6 +1198,11 @@ class AdminDialogs:
         self.delete_school_year_dialog.open = False
         self.parent.page.update()
 
+    def _close_school_year_archive_dialog(self, e=None):
+        """Fermer le dialogue d'archivage année scolaire"""
+        self.archive_school_year_dialog.open = False
+        self.parent.page.update()
+
     def _close_staff_delete_dialog(self, e=None):
         """Fermer le dialogue de suppression personnel"""
         self.delete_staff_dialog.open = False
@@ -1139,6 +1250,7 @@ class AdminDialogs:
 
         # TODO: Appel API pour supprimer la classe
         # success = await self.parent.services.delete_classroom(self.current_deleting_classroom_id, motive)
+        self.parent.invalidate_reference_data(ReferenceCache.CLASSROOMS)
 
         self._close_classroom_delete_dialog()
         await self.parent.tables.update_classroom_table()
@@ -1160,10 +1272,26 @@ class AdminDialogs:
 
         # TODO: Appel API pour supprimer l'année scolaire
         # success = await self.parent.services.delete_school_year(self.current_deleting_school_year_id, motive)
+        self.parent.invalidate_reference_data(
+            ReferenceCache.ACTIVE_SCHOOL_YEAR, ReferenceCache.SCHOOL_YEARS
+        )
 
         self._close_school_year_delete_dialog()
         await self.parent.tables.update_school_year_table()
 
+    async def _confirm_archive_school_year(self, e):
+        """Confirmer l'archivage année scolaire"""
+        success, _ = await self.parent.services.archive_school_year(
+            self.current_archiving_school_year_id
+        )
+        if not success:
+            self.archive_school_year_error_text.visible = True
+            self.archive_school_year_error_text.update()
+            return
+
+        self._close_school_year_archive_dialog()
+        await self.parent.tables.update_school_year_table()
+
     async def _confirm_delete_staff(self, e):
         """Confirmer la suppression personnel"""
         if (
@@ -1191,12 +1319,7 @@ class AdminDialogs:
 
     def _populate_roles_dropdown_for_edit(self):
         """Peupler le dropdown des rôles pour l'édition"""
-        self.edit_user_role_dropdown.options = [
-            DropdownOption(key="1", text="Administrateur"),
-            DropdownOption(key="2", text="Enseignant"),
-            DropdownOption(key="3", text="Comptable"),
-            DropdownOption(key="4", text="Surveillant"),
-        ]
+        self.edit_user_role_dropdown.options = self.parent.forms.get_role_options()
 
     #################################################################
     # DIALOGUES POUR LES FRAIS (FEES)
@@ -1409,6 +1532,8 @@ class AdminDialogs:
         if not fee:
             return
 
+        self._ensure_dialog("edit_fee_dialog", self._build_fee_edit_dialog)
+
         self.current_editing_fee_id = fee.id_fee
         self.edit_fee_name_field.value = fee.name
         self.edit_fee_description_field.value = fee.description
@@ -1449,6 +1574,7 @@ class AdminDialogs:
                     fee.periodicity = self.edit_fee_periodicity_dropdown.value
                     fee.is_active = self.edit_fee_is_active_switch.value
                     break
+            self.parent.invalidate_reference_data(ReferenceCache.FEES)
 
             self._close_fee_edit_dialog()
             await self.parent.tables.update_fee_table()
@@ -1460,6 +1586,8 @@ class AdminDialogs:
         if not fee:
             return
 
+        self._ensure_dialog("delete_fee_dialog", self._build_fee_delete_dialog)
+
         self.current_deleting_fee_id = fee.id_fee
         self.fee_name_to_be_deleted.value = fee.name
         self.delete_fee_motive_field.value = ""
@@ -1492,6 +1620,7 @@ class AdminDialogs:
                 for f in self.parent.fees_data
                 if f.id_fee != self.current_deleting_fee_id
             ]
+            self.parent.invalidate_reference_data(ReferenceCache.FEES)
 
             self._close_fee_delete_dialog()
             await self.parent.tables.update_fee_table()
@@ -3,6 +3,8 @@ Admin Form Handlers Module
 Contains form submission logic for all admin entities
 """
 
+from core import ReferenceCache
+
 
 class AdminFormHandlers:
     """Handles form submissions for admin entities"""
@@ -62,6 +64,7 @@ class AdminFormHandlers:
 
         # TODO: Submit to service
         print(f"Classroom data to submit: {classroom_data}")
+        self.parent.invalidate_reference_data(ReferenceCache.CLASSROOMS)
 
         # Close form and refresh data
         self.parent._close_form(e)
@@ -83,6 +86,9 @@ class AdminFormHandlers:
 
         # TODO: Submit to service
         print(f"School year data to submit: {school_year_data}")
+        self.parent.invalidate_reference_data(
+            ReferenceCache.ACTIVE_SCHOOL_YEAR, ReferenceCache.SCHOOL_YEARS
+        )
 
         # Close form and refresh data
         self.parent._close_form(e)
@@ -155,6 +161,7 @@ class AdminFormHandlers:
             print(f"Fee created successfully: {fee_data}")
         except Exception as ex:
             print(f"Error creating fee: {ex}")
+        self.parent.invalidate_reference_data(ReferenceCache.FEES)
 
         # Close form and refresh data
         self.parent._close_form(e)
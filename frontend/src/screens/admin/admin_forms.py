@@ -589,22 +589,24 @@ class AdminForms:
             self.parent.fee_periodicity_dropdown.value = None
             self.parent.fee_is_active_switch.value = True
 
-    def populate_roles_dropdown(self):
-        """Populate roles dropdown with available roles"""
-        # TODO: Load roles from services
-        # For now, using placeholder roles
-        self.parent.user_role_dropdown.options = [
+    def get_role_options(self):
+        """Build role options from the cached roles (placeholders as fallback)"""
+        if self.parent.roles_data:
+            return [
+                DropdownOption(key=str(role.id_role), text=role.role_name)
+                for role in self.parent.roles_data
+            ]
+        return [
             DropdownOption(key="1", text="Administrateur"),
             DropdownOption(key="2", text="Enseignant"),
             DropdownOption(key="3", text="Comptable"),
             DropdownOption(key="4", text="Surveillant"),
         ]
 
+    def populate_roles_dropdown(self):
+        """Populate roles dropdown with available roles"""
+        self.parent.user_role_dropdown.options = self.get_role_options()
+
     def populate_roles_dropdown_for_edit(self):
         """Populate roles dropdown for edit dialog"""
-        self.parent.edit_user_role_dropdown.options = [
-            DropdownOption(key="1", text="Administrateur"),
-            DropdownOption(key="2", text="Enseignant"),
-            DropdownOption(key="3", text="Comptable"),
-            DropdownOption(key="4", text="Surveillant"),
-        ]
+        self.parent.edit_user_role_dropdown.options = self.get_role_options()
@@ -13,7 +13,7 @@ Modules utilisés:
 
 from flet import *  # type: ignore
 import asyncio
-from core import AppState, Constants
+from core import AppState, Constants, ReferenceCache
 from .admin_services import AdminServices
 from .admin_components import AdminComponents
 from .admin_forms import AdminForms
@@ -40,6 +40,7 @@ class AdminScreen:
         self.staff_data = []
         self.school_year_data = []
         self.fees_data = []
+        self.roles_data = []
 
         # Initialize modules
         self.forms = AdminForms(self)
@@ -50,7 +51,7 @@ class AdminScreen:
         # Build UI components
         self.build_components()
         self._build_table_components()
-        self.dialogs.build_all_dialogs()  # Build all edit and delete dialogs
+        # Edit and delete dialogs are built on first open (see AdminDialogs)
 
     # ========================================================================
     # LIFECYCLE METHODS
@@ -64,7 +65,16 @@ class AdminScreen:
         """Refresh all admin data"""
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.load_data())
+        # Un rafraîchissement explicite relit aussi les données de référence
+        self.app_state.invalidate_reference_data()
+        self.app_state.loader.load("admin", self.load_data)
+
+    def on_language_change(self):
+        """Nothing to rebuild: every label is a plain translated text"""
+
+    def invalidate_reference_data(self, *keys: str):
+        """Invalidate cached reference data after an admin change"""
+        self.app_state.invalidate_reference_data(*keys)
 
     # ========================================================================
     # UTILITY METHODS
@@ -98,12 +108,14 @@ class AdminScreen:
                 (staff_status, staff_data),
                 (school_year_status, school_year_data),
                 (fees_status, fees_data),
+                (roles_status, roles_data),
             ) = await asyncio.gather(
                 self.services.load_users_data(),
                 self.services.load_classrooms_data(),
                 self.services.load_staff_data(),
                 self.services.load_school_years_data(),
                 self.services.load_fees_data(),
+                self.services.load_roles_data(),
                 return_exceptions=True,
             )
 
@@ -113,6 +125,7 @@ class AdminScreen:
             self.staff_data = staff_data if staff_status else []
             self.school_year_data = school_year_data if school_year_status else []
             self.fees_data = fees_data if fees_status else []
+            self.roles_data = roles_data if roles_status else []
 
             # Calculate statistics
             total_users = len(self.users_data)
@@ -383,10 +396,6 @@ class AdminScreen:
     # EDIT & DELETE DIALOGS - Delegated to admin_dialogs.py
     # ========================================================================
 
-    def _build_edit_dialogs(self):
-        """Build all edit dialogs - DEPRECATED: Use dialogs.build_all_dialogs()"""
-        self.dialogs.build_all_dialogs()
-
     def _open_user_edit_dialog(self, user):
         """Open user edit dialog"""
         self.dialogs.open_user_edit_dialog(user)
@@ -419,6 +428,10 @@ class AdminScreen:
         """Open school year delete dialog"""
         self.dialogs.open_school_year_delete_dialog(school_year)
 
+    def _open_school_year_archive_dialog(self, school_year):
+        """Open school year archive dialog"""
+        self.dialogs.open_school_year_archive_dialog(school_year)
+
     def _open_staff_delete_dialog(self, staff):
         """Open staff delete dialog"""
         self.dialogs.open_staff_delete_dialog(staff)
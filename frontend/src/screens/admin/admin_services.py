@@ -1,5 +1,5 @@
 import asyncio
-from core import AppState
+from core import AppState, ReferenceCache
 
 
 class AdminServices:
@@ -10,21 +10,29 @@ class AdminServices:
         return (True, await self.app_state.api_client.list_users())
 
     async def load_classrooms_data(self):
-        return (True, await self.app_state.api_client.list_classrooms())
+        return (True, await self.app_state.reference_data.get_classrooms())
 
     async def load_staff_data(self):
         return (True, await self.app_state.api_client.list_staff())
 
     async def load_school_years_data(self):
-        return (True, await self.app_state.api_client.list_school_years())
+        return (True, await self.app_state.reference_data.get_school_years())
 
     async def load_fees_data(self):
-        return (True, await self.app_state.api_client.list_fees())
+        return (True, await self.app_state.reference_data.get_fees())
 
     async def get_user_role_by_user_id(self, user_id: int):
         role = await self.app_state.api_client.get_user_role(user_id)
         return role.role_name
 
+    async def load_roles_data(self):
+        return (True, await self.app_state.reference_data.get_roles())
+
+    async def archive_school_year(self, school_year_id: int):
+        """Move a closed school year to the archive database"""
+        return await self.app_state.api_client.archive_school_year(school_year_id)
+
     async def activate_school_year(self, school_year_id: int):
         await asyncio.sleep(0.5)
+        self.app_state.invalidate_reference_data(ReferenceCache.ACTIVE_SCHOOL_YEAR)
         return True
@@ -451,6 +451,16 @@ class AdminTables:
                                         sy
                                     ),
                                 ),
+                                IconButton(
+                                    icon=Icons.ARCHIVE,
+                                    icon_color=Constants.SECONDARY_COLOR,
+                                    tooltip=self.parent.get_text("archive"),
+                                    # Only a closed school year can be archived
+                                    visible=not school_year.is_active,
+                                    on_click=lambda e, sy=school_year: self.parent._open_school_year_archive_dialog(
+                                        sy
+                                    ),
+                                ),
                             ],
                             spacing=5,
                         ),
@@ -5,7 +5,8 @@ Handles form submissions for the checkout screen
 
 import asyncio
 from flet import *  # type: ignore
-from core import Constants
+from core import Config, Constants
+from utils import Debouncer
 
 
 class CheckoutFormHandlers:
@@ -13,6 +14,8 @@ class CheckoutFormHandlers:
 
     def __init__(self, checkout_screen):
         self.screen = checkout_screen
+        # Staff search waits for a pause in typing
+        self.staff_search_debouncer = Debouncer(Config.SEARCH_DEBOUNCE_DELAY)
 
     async def handle_quick_entry_submit(self, e):
         """Handle quick cash entry form submission"""
@@ -195,18 +198,26 @@ class CheckoutFormHandlers:
 
     def handle_staff_search_change(self, e):
         """Handle changes in staff search field"""
-        from utils import Utils
-
         search_text = e.control.value.strip()
 
         # Hide suggestions if less than 2 characters
         if len(search_text) < 2:
+            self.staff_search_debouncer.cancel()
             self.screen.suggestions_container_staff.visible = False
             if hasattr(self.screen.suggestions_container_staff, "update"):
                 self.screen.suggestions_container_staff.update()
             return
 
-        # Filter staff based on search text
+        # Only the last keystroke is searched, off the UI path
+        self.staff_search_debouncer.call(
+            lambda: self.find_staff_suggestions(search_text),
+            self.display_staff_suggestions,
+        )
+
+    def find_staff_suggestions(self, search_text: str) -> list:
+        """Staff members whose name or position match the search text"""
+        from utils import Utils
+
         suggestions = []
         if self.screen.staff_list:
             normalized_search = Utils.normalize_text(search_text.lower())
@@ -233,8 +244,7 @@ class CheckoutFormHandlers:
                 ):
                     suggestions.append(staff)
 
-        # Display suggestions
-        self.display_staff_suggestions(suggestions)
+        return suggestions
 
     def display_staff_suggestions(self, suggestions):
         """Display the list of staff suggestions"""
@@ -13,7 +13,7 @@ Modules utilisés:
 """
 
 from flet import *  # type: ignore
-from core import AppState, Constants
+from core import AppState, Constants, DataStore
 import asyncio
 
 from .checkout_services import CheckoutServices
@@ -64,9 +64,15 @@ class CheckoutScreen:
 
     def refresh_checkout_data(self, e):
         """Refresh all checkout data"""
+        # The payments may have been prefetched before the last changes
+        self.app_state.store.invalidate(DataStore.PAYMENTS)
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.load_data())
+        self.app_state.loader.load("checkout", self.load_data)
+
+    def on_language_change(self):
+        """Rebuild the pagination label, composed with translated text"""
+        asyncio.create_task(self.tables.update_transactions_table())
 
     # ========================================================================
     # UTILITY METHODS
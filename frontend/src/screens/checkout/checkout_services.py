@@ -21,28 +21,37 @@ class CheckoutServices:
     def __init__(self, app_state: AppState):
         self.app_state = app_state
 
-    async def load_cash_register_entries(self):
+    async def load_cash_register_entries(self, school_year_id: int | None = None):
         """Load all cash register entries"""
         try:
-            entries = await self.app_state.api_client.list_cash_register_entries()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            entries = await self.app_state.api_client.list_cash_register_entries(
+                school_year_id=school_year_id
+            )
             return (True, entries)
         except Exception as e:
             print(f"Error loading cash register entries: {e}")
             return (False, [])
 
-    async def load_expenses(self):
+    async def load_expenses(self, school_year_id: int | None = None):
         """Load all expenses"""
         try:
-            expenses = await self.app_state.api_client.list_expenses()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            expenses = await self.app_state.api_client.list_expenses(
+                school_year_id=school_year_id
+            )
             return (True, expenses)
         except Exception as e:
             print(f"Error loading expenses: {e}")
             return (False, [])
 
-    async def load_staff_payments(self):
+    async def load_staff_payments(self, school_year_id: int | None = None):
         """Load all staff payments"""
         try:
-            payments = await self.app_state.api_client.list_staff_payments()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            payments = await self.app_state.api_client.list_staff_payments(
+                school_year_id=school_year_id
+            )
             return (True, payments)
         except Exception as e:
             print(f"Error loading staff payments: {e}")
@@ -52,15 +61,16 @@ class CheckoutServices:
         """Load all staff members"""
         try:
             staff = await self.app_state.api_client.list_staff()
+            self.app_state.repository.set_staff(staff)
             return (True, staff)
         except Exception as e:
             print(f"Error loading staff list: {e}")
             return (False, [])
 
-    async def load_student_payments(self):
+    async def load_student_payments(self, school_year_id: int | None = None):
         """Load all student payments"""
         try:
-            payments = await self.app_state.api_client.list_payments()
+            payments = await self.app_state.store.get_payments(school_year_id)
             return (True, payments)
         except Exception as e:
             print(f"Error loading student payments: {e}")
@@ -82,13 +92,13 @@ class CheckoutServices:
     ):
         """Create a quick cash register entry"""
         try:
-            school_year = await self.app_state.api_client.get_active_school_year()
-            if not school_year:
+            school_year_id = await self.app_state.get_active_school_year_id()
+            if school_year_id is None:
                 return (False, "No active school year found")
 
             entry = await self.app_state.api_client.create_cash_register_entry(
-                school_year_id=school_year.id_school_year,
-                date=datetime.now().strftime("%d-%m-%Y"),
+                school_year_id=school_year_id,
+                date=datetime.now().strftime("%Y-%m-%d"),
                 type=entry_type,
                 description=description,
                 amount=amount,
@@ -102,13 +112,13 @@ class CheckoutServices:
     async def create_quick_expense(self, description: str, amount: float):
         """Create a quick expense"""
         try:
-            school_year = await self.app_state.api_client.get_active_school_year()
-            if not school_year:
+            school_year_id = await self.app_state.get_active_school_year_id()
+            if school_year_id is None:
                 return (False, "No active school year found")
 
             expense = await self.app_state.api_client.create_expense(
-                school_year_id=school_year.id_school_year,
-                expense_date=datetime.now().strftime("%d-%m-%Y"),
+                school_year_id=school_year_id,
+                expense_date=datetime.now().strftime("%Y-%m-%d"),
                 description=description,
                 amount=amount,
                 user_id=self.app_state.current_user.id_user,
@@ -121,15 +131,15 @@ class CheckoutServices:
     async def create_staff_payment(self, staff_id: int, amount: float):
         """Create a staff payment"""
         try:
-            school_year = await self.app_state.api_client.get_active_school_year()
-            if not school_year:
+            school_year_id = await self.app_state.get_active_school_year_id()
+            if school_year_id is None:
                 return (False, "No active school year found")
 
             payment = await self.app_state.api_client.create_staff_payment(
                 staff_id=staff_id,
-                school_year_id=school_year.id_school_year,
+                school_year_id=school_year_id,
                 amount=amount,
-                payment_date=datetime.now().strftime("%d-%m-%Y"),
+                payment_date=datetime.now().strftime("%Y-%m-%d"),
                 user_id=self.app_state.current_user.id_user,
             )
             return (True, payment)
@@ -139,11 +149,8 @@ class CheckoutServices:
 
     async def get_staff_name(self, staff_id: int) -> str:
         """Get staff member name by ID"""
-        try:
-            staff_list = await self.app_state.api_client.list_staff()
-            for staff in staff_list:
-                if staff.id_staff == staff_id:
-                    return f"{staff.first_name} {staff.last_name}"
-            return "Unknown"
-        except Exception:
-            return "Unknown"
+        repository = self.app_state.repository
+        if repository.get_staff(staff_id) is None:
+            # Staff not loaded yet (or created since): refresh the index once
+            await self.load_staff_list()
+        return repository.staff_name(staff_id, "Unknown")
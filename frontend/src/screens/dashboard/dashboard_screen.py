@@ -5,6 +5,9 @@ from flet_charts import (
     BarChartRod,
     ChartAxis,
     ChartAxisLabel,
+    LineChart,
+    LineChartData,
+    LineChartDataPoint,
 )
 from core import AppState, Constants
 from utils import Utils
@@ -17,11 +20,20 @@ class DashboardScreen:
         self.app_state = appState
         self.page = page
         self.dashboard_services = DashboardServices(self.app_state)
+        # Last summary shown, re-rendered when the language changes
+        self.summary = None
 
         self.build_components()
 
-    async def on_mount(self):
+    async def on_mount(self, warm_start: bool = True):
         self.translations = self.app_state.translations
+        if warm_start:
+            # Render the last known summary at once, then check it in the background
+            snapshot = self.dashboard_services.load_snapshot_summary()
+            if snapshot is not None:
+                self.load_data(snapshot)
+                if await self.dashboard_services.is_snapshot_current():
+                    return
         status, result = await self.dashboard_services.load_dashboard_summary()
         if status:
             self.load_data(result)
@@ -35,9 +47,15 @@ class DashboardScreen:
     def refresh_dashboard(self, e):
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.on_mount())
+        self.app_state.loader.load("dashboard", lambda: self.on_mount(warm_start=False))
+
+    def on_language_change(self):
+        """Rebuild the counts and chart labels composed with translated text"""
+        if self.summary is not None:
+            self.load_data(self.summary)
 
     def load_data(self, result: dict):
+        self.summary = result
         self.total_students = result.get("total_students", 0)
         self.total_payments = result.get("total_payments", 0)
         self.total_expenses = result.get("total_expenses", 0)
@@ -46,6 +64,8 @@ class DashboardScreen:
         self.cash_balance = result.get("cash_balance", 0.0)
         self.active_school_year = result.get("active_school_year", "None")
         self.students_per_classroom = result.get("students_per_classroom", {})
+        self.monthly_finances = result.get("monthly_finances", [])
+        self.income_trend = result.get("income_trend", {})
         self.main_content.content = Column(
             controls=[
                 Container(
@@ -166,6 +186,46 @@ class DashboardScreen:
                     ),
                     **self.get_box_style(),
                 ),
+                Container(
+                    padding=Padding.all(10),
+                    height=350,
+                    content=Column(
+                        controls=[
+                            Text(
+                                self.get_text("monthly_finances"),
+                                size=20,
+                                weight=FontWeight.BOLD,
+                                color=Constants.PRIMARY_COLOR,
+                            ),
+                            self.get_bar_graph_for_monthly_finances(
+                                self.monthly_finances
+                            ),
+                        ]
+                    ),
+                    **self.get_box_style(),
+                ),
+                Container(
+                    padding=Padding.all(10),
+                    height=350,
+                    content=Column(
+                        controls=[
+                            Row(
+                                controls=[
+                                    Text(
+                                        self.get_text("income_trend"),
+                                        size=20,
+                                        weight=FontWeight.BOLD,
+                                        color=Constants.PRIMARY_COLOR,
+                                    ),
+                                    self.get_income_trend_growth(self.income_trend),
+                                ],
+                                alignment=MainAxisAlignment.SPACE_BETWEEN,
+                            ),
+                            self.get_line_graph_for_income_trend(self.income_trend),
+                        ]
+                    ),
+                    **self.get_box_style(),
+                ),
             ],
             spacing=20,
             expand=True,
@@ -212,6 +272,133 @@ class DashboardScreen:
             expand=3,
         )
 
+    def get_bar_graph_for_monthly_finances(self, data: list) -> Control:
+        """Income and expenses of the active school year, one group per month"""
+        return BarChart(
+            groups=[
+                BarChartGroup(
+                    x=i,
+                    rods=[
+                        BarChartRod(
+                            from_y=0,
+                            to_y=month["income"],
+                            width=16,
+                            color=Colors.GREEN,
+                            border_radius=0,
+                            tooltip=f"{self.get_text('income')}: {month['income']:,.2f}",
+                        ),
+                        BarChartRod(
+                            from_y=0,
+                            to_y=month["expenses"],
+                            width=16,
+                            color=Colors.RED,
+                            border_radius=0,
+                            tooltip=f"{self.get_text('expenses')}: {month['expenses']:,.2f}",
+                        ),
+                    ],
+                )
+                for i, month in enumerate(data)
+            ],
+            border=Border.all(width=1, color=Colors.BLACK12),
+            left_axis=ChartAxis(label_size=60),
+            bottom_axis=ChartAxis(
+                labels=[
+                    ChartAxisLabel(value=i, label=month["month"])
+                    for i, month in enumerate(data)
+                ],
+            ),
+            margin=Margin.all(10),
+            expand=True,
+        )
+
+    # Année en cours, puis années précédentes de la plus récente à la plus
+    # ancienne (la palette est réutilisée au-delà de Config.DASHBOARD_TREND_YEARS)
+    CURRENT_YEAR_COLOR = Colors.GREEN
+    PAST_YEAR_COLORS = (
+        Colors.AMBER_700,
+        Colors.BLUE_GREY_300,
+        Colors.PURPLE_200,
+        Colors.BROWN_300,
+        Colors.CYAN_300,
+    )
+
+    @classmethod
+    def get_trend_colors(cls, count: int) -> list:
+        """One color per school year, from the oldest to the most recent"""
+        if count <= 0:
+            return []
+        past = [
+            cls.PAST_YEAR_COLORS[index % len(cls.PAST_YEAR_COLORS)]
+            for index in range(count - 1)
+        ]
+        return past[::-1] + [cls.CURRENT_YEAR_COLOR]
+
+    def get_line_graph_for_income_trend(self, trend: dict) -> Control:
+        """Monthly income of the last school years, aligned on the month of the school year"""
+        years = trend.get("years", [])
+        colors = self.get_trend_colors(len(years))
+        # Month labels of the longest school year (e.g. "09" for September)
+        longest = max(years, key=lambda year: len(year["months"]), default=None)
+        return LineChart(
+            data_series=[
+                LineChartData(
+                    points=[
+                        LineChartDataPoint(
+                            x=i,
+                            y=income,
+                            tooltip=f"{year['school_year']} · {month}: {income:,.2f}",
+                        )
+                        for i, (month, income) in enumerate(
+                            zip(year["months"], year["income"])
+                        )
+                    ],
+                    color=color,
+                    stroke_width=3 if color == self.CURRENT_YEAR_COLOR else 2,
+                    curved=True,
+                )
+                for year, color in zip(years, colors)
+            ],
+            border=Border.all(width=1, color=Colors.BLACK12),
+            left_axis=ChartAxis(label_size=60),
+            bottom_axis=ChartAxis(
+                labels=[
+                    ChartAxisLabel(value=i, label=month[5:])
+                    for i, month in enumerate(longest["months"] if longest else [])
+                ],
+            ),
+            min_x=0,
+            max_x=max(trend.get("positions", 0) - 1, 1),
+            min_y=0,
+            margin=Margin.all(10),
+            expand=True,
+        )
+
+    def get_income_trend_growth(self, trend: dict) -> Control:
+        """Legend of the trend chart and income growth of the current year"""
+        years = trend.get("years", [])
+        colors = self.get_trend_colors(len(years))
+        controls = [
+            Row(
+                controls=[
+                    Container(width=12, height=12, bgcolor=color, border_radius=6),
+                    Text(year["school_year"], size=12),
+                ],
+                spacing=5,
+            )
+            for year, color in zip(years, colors)
+        ]
+        growth = years[-1]["totals"]["income_yoy_growth"] if years else None
+        if growth is not None:
+            # Same months of the previous year
+            controls.append(
+                Text(
+                    f"{growth:+.1f}% {self.get_text('yoy_growth')}",
+                    weight=FontWeight.BOLD,
+                    color=Colors.GREEN_700 if growth >= 0 else Colors.RED_700,
+                )
+            )
+        return Row(controls=controls, spacing=15)
+
     def get_text(self, key: str) -> str:
         return self.app_state.translations.get(key, key)
 
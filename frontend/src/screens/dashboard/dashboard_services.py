@@ -1,11 +1,49 @@
 import asyncio
-from core import AppState
+from datetime import date
+from core import AppState, Config, compare_school_years
+from core.financial_comparison import SOURCES as COMPARISON_SOURCES
 
 
 class DashboardServices:
     def __init__(self, app_state: AppState):
         self.app_state = app_state
 
+    def load_snapshot_summary(self) -> dict | None:
+        """Summary saved by the last successful load (None on first launch)"""
+        return self.app_state.warm_start.restore()
+
+    async def is_snapshot_current(self) -> bool:
+        return await self.app_state.warm_start.revalidate()
+
     async def load_dashboard_summary(self) -> tuple[bool, dict]:
         # await asyncio.sleep(2)  # Simulate network delay
-        return (True, await self.app_state.api_client.get_dashboard_summary())
+        # Versions read before the data: a write in between makes the next
+        # revalidation fail instead of hiding the change
+        versions = await self.app_state.warm_start.fetch_versions()
+        active_school_year = (
+            await self.app_state.reference_data.get_active_school_year()
+        )
+        summary = await self.app_state.api_client.get_dashboard_summary(
+            active_school_year=active_school_year
+        )
+        summary["income_trend"] = await self.load_income_trend()
+        await self.app_state.warm_start.save(summary, versions)
+        return (True, summary)
+
+    async def load_income_trend(self) -> dict:
+        """Monthly series of the last school years, aligned for the trend chart"""
+        school_years = await self.app_state.reference_data.get_school_years()
+        # Most recent years first
+        school_years = sorted(
+            school_years, key=lambda year: year.start_date, reverse=True
+        )[: Config.DASHBOARD_TREND_YEARS]
+        year_ids = {year.id_school_year for year in school_years}
+        totals = await self.app_state.api_client.get_financial_totals(
+            group_by=("source", "school_year_id", "month"),
+            sources=COMPARISON_SOURCES,
+        )
+        return compare_school_years(
+            [row for row in totals if row["school_year_id"] in year_ids],
+            school_years,
+            until=date.today(),
+        )
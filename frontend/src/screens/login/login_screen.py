@@ -132,7 +132,7 @@ class LoginScreen:
             expand=True,
         )
 
-    def on_login(self, e: Event):
+    async def on_login(self, e: Event):
         username = self.user_name_field.value
         password = self.password_field.value
         self.error_text.visible = False
@@ -156,7 +156,9 @@ class LoginScreen:
             self.error_text.update()
             return
         self.app_state.current_user = result
-        self.on_login_success(self.app_state)
+        login = self.on_login_success(self.app_state)
+        if asyncio.iscoroutine(login):
+            await login
 
     def reset_login_form(self):
         self.user_name_field.value = ""
@@ -1,6 +1,6 @@
 from flet import *  # type: ignore
-from core import AppState, Constants
-from utils import Utils
+from core import AppState, Config, Constants, DataStore
+from utils import Debouncer, Utils
 from models import (
     StudentModel,
     ClassroomModel,
@@ -10,6 +10,7 @@ from models import (
     FeeModel,
 )
 from .payment_services import PaymentServices
+from ..virtual_table import TableAction, TableColumn, VirtualTable
 import asyncio
 from datetime import datetime
 
@@ -38,10 +39,27 @@ class PaymentScreen:
         self.selected_payment_type_filter = "all"
         self.selected_classroom_filter = "all"
 
+        # Searches wait for a pause in typing and only render the latest result
+        self.search_debouncer = Debouncer(Config.SEARCH_DEBOUNCE_DELAY)
+        self.student_search_debouncer = Debouncer(Config.SEARCH_DEBOUNCE_DELAY)
+
         self.build_components()
         self._build_add_form_components()
         self._build_table_components()
 
+        # Follow changes made to the shared collections by other screens
+        self.app_state.store.subscribe(DataStore.STUDENTS, self._on_store_change)
+        self.app_state.store.subscribe(DataStore.ENROLLMENTS, self._on_store_change)
+
+    def _on_store_change(self, collection: str, values: list):
+        """Re-render the table with a reloaded shared collection"""
+        if collection == DataStore.STUDENTS:
+            self.students_data = values
+        else:
+            self.enrollments_data = values
+        self._apply_filters()
+        self._update_table()
+
     def get_text(self, key: str) -> str:
         return self.app_state.translations.get(key, key)
 
@@ -59,24 +77,27 @@ class PaymentScreen:
 
     def refresh_payments_data(self, e):
         """Refresh all payment data"""
+        self.app_state.store.invalidate()
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.load_data())
+        self.app_state.loader.load("payments", self.load_data)
 
     async def load_data(self):
         """Load all necessary data for the payment screen"""
         try:
             # Load data in parallel
-            students_status, students_data = await self.services.load_students_data()
-            classrooms_status, classrooms_data = (
-                await self.services.load_classrooms_data()
-            )
-            enrollments_status, enrollments_data = (
-                await self.services.load_enrollments_data()
-            )
-            payments_status, payments_data = await self.services.load_payments_data()
-            payment_types_status, payment_types_data = (
-                await self.services.load_payment_types_data()
+            (
+                (students_status, students_data),
+                (classrooms_status, classrooms_data),
+                (enrollments_status, enrollments_data),
+                (payments_status, payments_data),
+                (payment_types_status, payment_types_data),
+            ) = await self.app_state.loader.gather(
+                self.services.load_students_data(),
+                self.services.load_classrooms_data(),
+                self.services.load_enrollments_data(),
+                self.services.load_payments_data(),
+                self.services.load_payment_types_data(),
             )
 
             # Store data
@@ -458,11 +479,61 @@ class PaymentScreen:
             **self.get_box_style(),
         )
 
-        self.payments_table_container = Container(
-            content=Column(
-                controls=[],
-                scroll=ScrollMode.AUTO,
+        # Header and row controls are built once, rows are rebound to each page
+        self.payments_table = VirtualTable(
+            columns=[
+                TableColumn(
+                    self.get_text("student"),
+                    lambda p: self._get_student_name(p.student_id),
+                    2,
+                ),
+                TableColumn(
+                    self.get_text("classroom"),
+                    lambda p: self._get_classroom_name(p.student_id),
+                ),
+                TableColumn(
+                    self.get_text("payment_type"),
+                    lambda p: self._get_payment_type_name(p.payment_type_id),
+                ),
+                TableColumn(
+                    "Période",
+                    lambda p: p.period if p.period else "-",
+                    color=lambda p: (
+                        Constants.SECONDARY_COLOR if p.period else Colors.GREY_400
+                    ),
+                ),
+                TableColumn(
+                    self.get_text("amount"),
+                    lambda p: f"{p.amount:,.0f} FC",
+                    weight=FontWeight.BOLD,
+                ),
+                TableColumn(
+                    self.get_text("payment_date"),
+                    lambda p: Utils.format_date(p.payment_date),
+                ),
+            ],
+            actions=[
+                TableAction(
+                    icon=Icons.VISIBILITY,
+                    tooltip=self.get_text("view_payment"),
+                    on_click=self._show_view_payment_dialog,
+                )
+            ],
+            actions_title=self.get_text("actions"),
+            on_row_click=self._show_view_payment_dialog,
+            empty_content=Container(
+                content=Text(
+                    self.get_text("no_payments_found"),
+                    size=16,
+                    color=Colors.GREY_600,
+                ),
+                padding=Padding.all(20),
+                alignment=Alignment.CENTER,
             ),
+        )
+
+        self.payments_table_container = Container(
+            content=self.payments_table.control,
             padding=Padding.all(10),
             **self.get_box_style(),
         )
@@ -690,12 +761,20 @@ class PaymentScreen:
 
         # Hide suggestions if less than 2 characters
         if len(search_text) < 2:
+            self.student_search_debouncer.cancel()
             self.suggestions_container_student.visible = False
             if hasattr(self.suggestions_container_student, "update"):
                 self.suggestions_container_student.update()
             return
 
-        # Filter students based on search text
+        # Only the last keystroke is searched, off the UI path
+        self.student_search_debouncer.call(
+            lambda: self._find_student_suggestions(search_text),
+            self.display_student_suggestions,
+        )
+
+    def _find_student_suggestions(self, search_text: str) -> list[StudentModel]:
+        """Students whose names match the search text"""
         suggestions = []
         if self.students_data:
             normalized_search = Utils.normalize_text(search_text.lower())
@@ -722,8 +801,7 @@ class PaymentScreen:
                 ):
                     suggestions.append(student)
 
-        # Display suggestions
-        self.display_student_suggestions(suggestions)
+        return suggestions
 
     def display_student_suggestions(self, suggestions: list[StudentModel]):
         """Display the list of student suggestions"""
@@ -839,9 +917,12 @@ class PaymentScreen:
     # --- Filter and pagination methods ---
     def _apply_filters(self):
         """Apply search and filters to payments data"""
+        self.filtered_payments = self._filter_payments()
+
+    def _filter_payments(self) -> list[PaymentModel]:
+        """Payments matching the search and filters"""
         if not self.payments_data:
-            self.filtered_payments = []
-            return
+            return []
 
         query = self.search_query.lower().strip()
         filtered = self.payments_data.copy()
@@ -863,14 +944,12 @@ class PaymentScreen:
         if self.selected_classroom_filter != "all":
             classroom_id = int(self.selected_classroom_filter)
             # Get student IDs for this classroom
-            student_ids_in_classroom = [
-                e.student_id
-                for e in self.enrollments_data
-                if e.classroom_id == classroom_id
-            ]
+            student_ids_in_classroom = (
+                self.app_state.repository.get_classroom_student_ids(classroom_id)
+            )
             filtered = [p for p in filtered if p.student_id in student_ids_in_classroom]
 
-        self.filtered_payments = filtered
+        return filtered
 
     def _update_payment_type_filter_options(self):
         """Update payment type filter dropdown options with fees"""
@@ -905,8 +984,12 @@ class PaymentScreen:
     def _on_search_change(self, e):
         """Handle search field change"""
         self.search_query = e.control.value
+        self.search_debouncer.call(self._filter_payments, self._show_search_results)
+
+    def _show_search_results(self, filtered_payments: list[PaymentModel]):
+        """Render the result of the latest search"""
+        self.filtered_payments = filtered_payments
         self.current_page = 1
-        self._apply_filters()
         self._update_table()
 
     def _on_payment_type_filter_change(self, e):
@@ -961,26 +1044,15 @@ class PaymentScreen:
     # --- Helper methods ---
     def _get_student_name(self, student_id: int) -> str:
         """Get student full name by ID"""
-        for student in self.students_data:
-            if student.id_student == student_id:
-                return f"{student.first_name} {student.last_name} {student.surname}".strip()
-        return "N/A"
+        return self.app_state.repository.student_name(student_id)
 
     def _get_payment_type_name(self, payment_type_id: int) -> str:
         """Get payment type name by ID (from fees)"""
-        for fee in self.payment_types_data:
-            if fee.id_fee == payment_type_id:
-                return fee.name
-        return "N/A"
+        return self.app_state.repository.fee_name(payment_type_id)
 
     def _get_classroom_name(self, student_id: int) -> str:
         """Get classroom name for a student"""
-        for enrollment in self.enrollments_data:
-            if enrollment.student_id == student_id:
-                for classroom in self.classrooms_data:
-                    if classroom.id_classroom == enrollment.classroom_id:
-                        return classroom.name
-        return "N/A"
+        return self.app_state.repository.classroom_name_for_student(student_id)
 
     def _format_date(self, date_str: str) -> str:
         """Format date string to DD/MM/YYYY"""
@@ -994,6 +1066,12 @@ class PaymentScreen:
     def close_dialog(self, e=None):
         self.page.pop_dialog()
 
+    def _bound_label(self, key: str, value: str, **kwargs) -> Text:
+        """Text "<label>: <value>" relabelled in place on language change"""
+        return self.app_state.translator.bind(
+            Text(**kwargs), "value", key, lambda label: f"{label}: {value}"
+        )
+
     def _show_view_payment_dialog(self, payment: PaymentModel):
         """Build the view payment dialog"""
         student_name = self._get_student_name(payment.student_id)
@@ -1002,20 +1080,11 @@ class PaymentScreen:
         formatted_date = Utils.format_date(payment.payment_date)
 
         dialog_controls = [
-            Text(
-                f"{self.get_text('student')}: {student_name}",
-                size=14,
-            ),
+            self._bound_label("student", student_name, size=14),
             Divider(height=1),
-            Text(
-                f"{self.get_text('classroom')}: {classroom_name}",
-                size=14,
-            ),
+            self._bound_label("classroom", classroom_name, size=14),
             Divider(height=1),
-            Text(
-                f"{self.get_text('payment_type')}: {payment_type_name}",
-                size=14,
-            ),
+            self._bound_label("payment_type", payment_type_name, size=14),
             Divider(height=1),
         ]
 
@@ -1035,15 +1104,9 @@ class PaymentScreen:
 
         dialog_controls.extend(
             [
-                Text(
-                    f"{self.get_text('amount')}: {payment.amount:,.0f} FC",
-                    size=14,
-                ),
+                self._bound_label("amount", f"{payment.amount:,.0f} FC", size=14),
                 Divider(height=1),
-                Text(
-                    f"{self.get_text('payment_date')}: {formatted_date}",
-                    size=14,
-                ),
+                self._bound_label("payment_date", formatted_date, size=14),
             ]
         )
 
@@ -1073,188 +1136,15 @@ class PaymentScreen:
 
         self.page.show_dialog(dialog)
 
-    # --- Table creation methods ---
-    def _create_table_header(self):
-        """Create the table header row"""
-        return Container(
-            content=Row(
-                controls=[
-                    Container(
-                        content=Text(
-                            self.get_text("student"),
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=2,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.get_text("classroom"),
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.get_text("payment_type"),
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            "Période",
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.get_text("amount"),
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.get_text("payment_date"),
-                            weight=FontWeight.BOLD,
-                            color="white",
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.get_text("actions"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                ],
-                alignment=MainAxisAlignment.SPACE_BETWEEN,
-            ),
-            bgcolor=Constants.PRIMARY_COLOR,
-            border_radius=BorderRadius.only(top_left=10, top_right=10),
-            height=65,
-        )
-
-    def _create_table_row(self, payment: PaymentModel, index: int):
-        """Create a table row for a payment"""
-        student_name = self._get_student_name(payment.student_id)
-        classroom_name = self._get_classroom_name(payment.student_id)
-        payment_type_name = self._get_payment_type_name(payment.payment_type_id)
-        formatted_date = Utils.format_date(payment.payment_date)
-
-        return Container(
-            content=Row(
-                controls=[
-                    Container(
-                        content=Text(student_name, size=14),
-                        expand=2,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(classroom_name, size=14),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(payment_type_name, size=14),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            payment.period if payment.period else "-",
-                            size=14,
-                            color=(
-                                Constants.SECONDARY_COLOR
-                                if payment.period
-                                else Colors.GREY_400
-                            ),
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            f"{payment.amount:,.0f} FC", size=14, weight=FontWeight.BOLD
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(formatted_date, size=14),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Row(
-                            controls=[
-                                IconButton(
-                                    icon=Icons.VISIBILITY,
-                                    icon_color=Constants.PRIMARY_COLOR,
-                                    tooltip=self.get_text("view_payment"),
-                                    on_click=lambda e, p=payment: self._show_view_payment_dialog(
-                                        p
-                                    ),
-                                )
-                            ]
-                        ),
-                        expand=1,
-                        padding=Padding.all(5),
-                    ),
-                ],
-                alignment=MainAxisAlignment.SPACE_BETWEEN,
-            ),
-            bgcolor="#f8faff" if index % 2 == 0 else "white",
-            border=Border(
-                bottom=BorderSide(1, Colors.GREY_200),
-            ),
-            on_click=lambda e, p=payment: self._show_view_payment_dialog(p),
-            ink=True,
-        )
+    def on_language_change(self):
+        """Rebuild the pagination label, composed with translated text"""
+        self._update_table()
 
+    # --- Table creation methods ---
     def _update_table(self):
         """Update the payments table with current data"""
-        if not self.filtered_payments:
-            self.payments_table_container.content = Column(
-                controls=[
-                    Container(
-                        content=Text(
-                            self.get_text("no_payments_found"),
-                            size=16,
-                            color=Colors.GREY_600,
-                        ),
-                        padding=Padding.all(20),
-                        alignment=Alignment.CENTER,
-                    )
-                ],
-            )
-        else:
-            paginated_payments = self._get_paginated_payments()
-            table_rows = [self._create_table_header()]
-
-            for idx, payment in enumerate(paginated_payments):
-                table_rows.append(self._create_table_row(payment, idx))
-
-            self.payments_table_container.content = Column(
-                controls=table_rows,
-                spacing=0,
-                scroll=ScrollMode.AUTO,
-            )
+        # Rebind the recycled rows: only changed cells are sent to the client
+        self.payments_table.set_items(self._get_paginated_payments())
 
         # Update pagination info
         total_pages = self._get_total_pages()
@@ -1272,7 +1162,7 @@ class PaymentScreen:
 
         # Update UI
         try:
-            self.payments_table_container.update()
+            self.payments_table.control.update()
             self.page_info_text.update()
             self.prev_page_button.update()
             self.next_page_button.update()
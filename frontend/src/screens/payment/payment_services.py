@@ -1,5 +1,5 @@
 import asyncio
-from core import AppState
+from core import AppState, DataStore
 
 
 class PaymentServices:
@@ -8,28 +8,29 @@ class PaymentServices:
 
     async def load_students_data(self):
         """Load all students data"""
-        return (True, await self.app_state.api_client.list_students())
+        return (True, await self.app_state.store.get_students())
 
     async def load_classrooms_data(self):
         """Load all classrooms data"""
-        return (True, await self.app_state.api_client.list_classrooms())
+        return (True, await self.app_state.store.get_classrooms())
 
-    async def load_enrollments_data(self):
+    async def load_enrollments_data(self, school_year_id: int | None = None):
         """Load all enrollments data"""
-        return (True, await self.app_state.api_client.list_enrollments())
+        return (True, await self.app_state.store.get_enrollments(school_year_id))
 
     async def search_students(self, query: str):
         """Search students by name"""
         return await self.app_state.api_client.search_students(query)
 
-    async def load_payments_data(self):
+    async def load_payments_data(self, school_year_id: int | None = None):
         """Load all payments data"""
-        return (True, await self.app_state.api_client.list_payments())
+        return (True, await self.app_state.store.get_payments(school_year_id))
 
     async def load_payment_types_data(self):
         """Load all payment types data (now loading fees)"""
         # Load fees instead of payment_types
-        fees = await self.app_state.api_client.list_fees()
+        fees = await self.app_state.reference_data.get_fees()
+        self.app_state.repository.set_fees(fees)
         # Filter only active fees
         active_fees = [fee for fee in fees if fee.is_active]
         return (True, active_fees)
@@ -38,4 +39,5 @@ class PaymentServices:
         """Create a new payment"""
         # TODO: Implement create_payment in API client
         await asyncio.sleep(0.5)  # Simulate API call
+        self.app_state.store.invalidate(DataStore.PAYMENTS)
         return True
@@ -4,5 +4,6 @@ Provides comprehensive reporting functionality
 """
 
 from .reports_screen import ReportsScreen
+from .reports_scheduled import register_scheduled_reports
 
-__all__ = ["ReportsScreen"]
+__all__ = ["ReportsScreen", "register_scheduled_reports"]
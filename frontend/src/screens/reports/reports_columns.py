@@ -0,0 +1,100 @@
+"""
+Reports Columns Module
+Column definitions shared by the report exporters (Excel, PDF...)
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+from exports import ExportColumn
+
+# report_type -> [(data key, translation key, column kind)]
+REPORT_COLUMNS: Dict[str, List[Tuple[str, str, str]]] = {
+    "students": [
+        ("id", "id", ExportColumn.INTEGER),
+        ("first_name", "first_name", ExportColumn.TEXT),
+        ("last_name", "last_name", ExportColumn.TEXT),
+        ("gender", "gender", ExportColumn.TEXT),
+        ("date_of_birth", "date_of_birth", ExportColumn.DATE),
+        ("parent_contact", "parent_contact", ExportColumn.TEXT),
+        ("address", "address", ExportColumn.TEXT),
+        ("classroom", "classroom", ExportColumn.TEXT),
+    ],
+    "staff_payments": [
+        ("id", "id", ExportColumn.INTEGER),
+        ("staff_name", "staff_name", ExportColumn.TEXT),
+        ("payment_date", "payment_date", ExportColumn.DATE),
+        ("amount", "amount", ExportColumn.AMOUNT),
+    ],
+    "financial_classroom": [
+        ("classroom", "classroom", ExportColumn.TEXT),
+        ("total_amount", "total_amount", ExportColumn.AMOUNT),
+        ("payment_count", "payment_count", ExportColumn.INTEGER),
+        ("student_count", "student_count", ExportColumn.INTEGER),
+    ],
+    "financial_student": [
+        ("student_id", "student_id", ExportColumn.INTEGER),
+        ("student_name", "student_name", ExportColumn.TEXT),
+        ("total_amount", "total_amount", ExportColumn.AMOUNT),
+        ("payment_count", "payment_count", ExportColumn.INTEGER),
+    ],
+    "financial_school": [
+        ("total_income", "total_income", ExportColumn.AMOUNT),
+        ("total_expenses", "total_expenses", ExportColumn.AMOUNT),
+        ("net_balance", "net_balance", ExportColumn.AMOUNT),
+        ("payment_count", "payment_count", ExportColumn.INTEGER),
+        ("staff_payment_count", "staff_payment_count", ExportColumn.INTEGER),
+        ("expense_count", "expense_count", ExportColumn.INTEGER),
+    ],
+    "financial_comparison": [
+        ("school_year", "school_year", ExportColumn.TEXT),
+        ("month", "month", ExportColumn.TEXT),
+        ("income", "income", ExportColumn.AMOUNT),
+        ("income_mom_growth", "mom_growth", ExportColumn.NUMBER),
+        ("income_yoy", "yoy_change", ExportColumn.NUMBER),
+        ("income_yoy_growth", "yoy_growth", ExportColumn.NUMBER),
+        ("expenses", "expenses", ExportColumn.AMOUNT),
+        ("expenses_yoy_growth", "expenses_yoy_growth", ExportColumn.NUMBER),
+        ("net", "net_balance", ExportColumn.AMOUNT),
+        ("net_yoy", "net_yoy_change", ExportColumn.NUMBER),
+    ],
+    "cash_register": [
+        ("id", "id", ExportColumn.INTEGER),
+        ("date", "date", ExportColumn.DATE),
+        ("type", "type", ExportColumn.TEXT),
+        ("description", "transaction_description", ExportColumn.TEXT),
+        ("amount", "amount", ExportColumn.AMOUNT),
+    ],
+    "users": [
+        ("id", "id", ExportColumn.INTEGER),
+        ("username", "username", ExportColumn.TEXT),
+        ("role_id", "role_id", ExportColumn.INTEGER),
+        ("is_active", "is_active", ExportColumn.TEXT),
+    ],
+}
+
+# report_type -> translation key of the report title
+REPORT_TITLES: Dict[str, str] = {
+    "students": "students_report",
+    "staff_payments": "staff_payments_report",
+    "financial_classroom": "financial_classroom_report",
+    "financial_student": "financial_student_report",
+    "financial_school": "financial_school_report",
+    "financial_comparison": "financial_comparison_report",
+    "cash_register": "cash_register_report",
+    "users": "users_report",
+}
+
+
+def get_report_columns(
+    report_type: str, get_text: Callable[[str], str]
+) -> List[ExportColumn]:
+    """Translated export columns of a report type"""
+    return [
+        ExportColumn(key, get_text(title_key), kind)
+        for key, title_key, kind in REPORT_COLUMNS.get(report_type, [])
+    ]
+
+
+def get_report_title(report_type: str, get_text: Callable[[str], str]) -> str:
+    title_key = REPORT_TITLES.get(report_type)
+    return get_text(title_key) if title_key else report_type
@@ -24,13 +24,17 @@ class ReportsDialogs:
     def show_export_options_dialog(self, report_type: str, report_data: list):
         """Show export options dialog"""
 
-        def on_export_excel(e):
+        async def on_export_excel(e):
             self.close_dialog()
-            self.screen.form_handlers.export_to_excel(report_type, report_data)
+            await self.screen.form_handlers.export_to_excel(report_type, report_data)
 
-        def on_export_pdf(e):
+        async def on_export_csv(e):
             self.close_dialog()
-            self.screen.form_handlers.export_to_pdf(report_type, report_data)
+            await self.screen.form_handlers.export_to_csv(report_type, report_data)
+
+        async def on_export_pdf(e):
+            self.close_dialog()
+            await self.screen.form_handlers.export_to_pdf(report_type, report_data)
 
         def on_print(e):
             self.close_dialog()
@@ -54,6 +58,14 @@ class ReportsDialogs:
                         color=Colors.WHITE,
                         width=200,
                     ),
+                    Button(
+                        content=self.get_text("export_csv"),
+                        icon=Icons.TEXT_SNIPPET,
+                        on_click=on_export_csv,
+                        bgcolor=Colors.TEAL,
+                        color=Colors.WHITE,
+                        width=200,
+                    ),
                     Button(
                         content=self.get_text("export_pdf"),
                         icon=Icons.PICTURE_AS_PDF,
@@ -150,16 +162,25 @@ class ReportsDialogs:
             self.close_dialog()
             self.show_export_options_dialog(report_type, report_data)
 
+        # Composed labels follow language changes while the dialog is open
+        translator = self.screen.app_state.translator
+
         # Create a simple preview based on report type
         preview_content = Column(
             controls=[
-                Text(
-                    f"{self.get_text('preview')}: {report_type}",
-                    size=16,
-                    weight=FontWeight.BOLD,
+                translator.bind(
+                    Text(size=16, weight=FontWeight.BOLD),
+                    "value",
+                    "preview",
+                    lambda label: f"{label}: {report_type}",
                 ),
                 Container(height=10),
-                Text(f"{self.get_text('total_records')}: {len(report_data)}"),
+                translator.bind(
+                    Text(),
+                    "value",
+                    "total_records",
+                    lambda label: f"{label}: {len(report_data)}",
+                ),
                 Container(height=10),
                 Container(
                     content=Text(self.get_text("preview_available_after_export")),
@@ -5,8 +5,13 @@ Handles form submission logic and export operations for the reports screen
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core import Config, comparison_rows
+from exports import export_csv, export_pdf_report, export_xlsx
+from .reports_columns import get_report_columns, get_report_title
+from .reports_preview import PagedRows
 
 
 class ReportsFormHandlers:
@@ -52,6 +57,53 @@ class ReportsFormHandlers:
     # REPORT GENERATION HANDLERS
     # ========================================================================
 
+    def submit_report_job(
+        self,
+        report_type: str,
+        generate: Callable[..., Awaitable[tuple[bool, Any]]],
+        params: Optional[Dict[str, Any]] = None,
+        to_rows: Optional[Callable[[Any], tuple[List[Dict[str, Any]], dict]]] = None,
+    ):
+        """Queue a report in the background job manager.
+
+        `generate(progress)` is a report service call; `to_rows` turns its
+        result into (rows, summary) when it is not already a list of rows.
+        The screen is notified when the job finishes (see on_report_job_change).
+        """
+        no_data = self.get_text("no_data_found")
+
+        async def run(job):
+            success, result = await generate(job.set_progress)
+            if not (success and result):
+                raise LookupError(no_data)
+            if to_rows is None:
+                job.rows = result
+            else:
+                job.rows, job.summary = to_rows(result)
+
+        job = self.screen.app_state.report_jobs.submit(
+            report_type,
+            run,
+            title=get_report_title(report_type, self.get_text),
+            params=params,
+        )
+        self.screen.pending_report_job_id = job.id
+        return job
+
+    def get_period_filter(
+        self, period_dropdown: str, start_field: str, end_field: str
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Start and end dates selected in a period dropdown of the forms"""
+        if not hasattr(self.screen.forms, period_dropdown):
+            return (None, None)
+        period = getattr(self.screen.forms, period_dropdown).value
+        if period == "custom":
+            return (
+                getattr(self.screen.forms, start_field).value,
+                getattr(self.screen.forms, end_field).value,
+            )
+        return self.get_date_range(period)
+
     async def handle_generate_students_report(self):
         """Handle students report generation"""
         try:
@@ -62,30 +114,14 @@ class ReportsFormHandlers:
                 if classroom_value and classroom_value != "all":
                     classroom_id = int(classroom_value)
 
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog(
-                self.get_text("generating_report")
-            )
-
-            # Generate report
-            success, report_data = await self.screen.services.generate_students_report(
-                classroom_id=classroom_id
+            self.submit_report_job(
+                "students",
+                lambda progress: self.screen.services.generate_students_report(
+                    classroom_id=classroom_id, progress=progress
+                ),
+                params={"classroom_id": classroom_id},
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_data:
-                # Update preview
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "students"
-                self.update_preview_section("students", report_data)
-
-                # Show export options
-                self.screen.dialogs.show_export_options_dialog("students", report_data)
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
-
         except Exception as e:
             print(f"Error generating students report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
@@ -100,41 +136,27 @@ class ReportsFormHandlers:
                 if staff_value and staff_value != "all":
                     staff_id = int(staff_value)
 
-            # Get date range
-            start_date, end_date = None, None
-            if hasattr(self.screen.forms, "staff_payment_period_dropdown"):
-                period = self.screen.forms.staff_payment_period_dropdown.value
-                if period == "custom":
-                    start_date = self.screen.forms.staff_payment_start_date.value
-                    end_date = self.screen.forms.staff_payment_end_date.value
-                else:
-                    start_date, end_date = self.get_date_range(period)
-
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_data = (
-                await self.screen.services.generate_staff_payments_report(
+            start_date, end_date = self.get_period_filter(
+                "staff_payment_period_dropdown",
+                "staff_payment_start_date",
+                "staff_payment_end_date",
+            )
+
+            self.submit_report_job(
+                "staff_payments",
+                lambda progress: self.screen.services.generate_staff_payments_report(
                     staff_id=staff_id,
                     start_date=start_date,
                     end_date=end_date,
-                )
+                    progress=progress,
+                ),
+                params={
+                    "staff_id": staff_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                },
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_data:
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "staff_payments"
-                self.update_preview_section("staff_payments", report_data)
-                self.screen.dialogs.show_export_options_dialog(
-                    "staff_payments", report_data
-                )
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
-
         except Exception as e:
             print(f"Error generating staff payments report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
@@ -149,45 +171,31 @@ class ReportsFormHandlers:
                 if classroom_value and classroom_value != "all":
                     classroom_id = int(classroom_value)
 
-            # Get date range
-            start_date, end_date = None, None
-            if hasattr(self.screen.forms, "financial_period_dropdown"):
-                period = self.screen.forms.financial_period_dropdown.value
-                if period == "custom":
-                    start_date = self.screen.forms.financial_start_date.value
-                    end_date = self.screen.forms.financial_end_date.value
-                else:
-                    start_date, end_date = self.get_date_range(period)
-
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_result = (
-                await self.screen.services.generate_financial_report_by_classroom(
+            start_date, end_date = self.get_period_filter(
+                "financial_period_dropdown",
+                "financial_start_date",
+                "financial_end_date",
+            )
+
+            self.submit_report_job(
+                "financial_classroom",
+                lambda progress: self.screen.services.generate_financial_report_by_classroom(
                     classroom_id=classroom_id,
                     start_date=start_date,
                     end_date=end_date,
-                )
+                    progress=progress,
+                ),
+                params={
+                    "classroom_id": classroom_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                },
+                to_rows=lambda result: (
+                    result.get("classrooms", []),
+                    {"total": result.get("total", 0)},
+                ),
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_result:
-                report_data = report_result.get("classrooms", [])
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "financial_classroom"
-                self.screen.current_report_summary = {
-                    "total": report_result.get("total", 0)
-                }
-                self.update_preview_section("financial_classroom", report_data)
-                self.screen.dialogs.show_export_options_dialog(
-                    "financial_classroom", report_data
-                )
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
-
         except Exception as e:
             print(f"Error generating financial classroom report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
@@ -198,41 +206,27 @@ class ReportsFormHandlers:
             # Get filter values - use the selected student from search
             student_id = self.screen.selected_financial_student_id
 
-            # Get date range
-            start_date, end_date = None, None
-            if hasattr(self.screen.forms, "financial_period_dropdown"):
-                period = self.screen.forms.financial_period_dropdown.value
-                if period == "custom":
-                    start_date = self.screen.forms.financial_start_date.value
-                    end_date = self.screen.forms.financial_end_date.value
-                else:
-                    start_date, end_date = self.get_date_range(period)
-
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_data = (
-                await self.screen.services.generate_financial_report_by_student(
+            start_date, end_date = self.get_period_filter(
+                "financial_period_dropdown",
+                "financial_start_date",
+                "financial_end_date",
+            )
+
+            self.submit_report_job(
+                "financial_student",
+                lambda progress: self.screen.services.generate_financial_report_by_student(
                     student_id=student_id,
                     start_date=start_date,
                     end_date=end_date,
-                )
+                    progress=progress,
+                ),
+                params={
+                    "student_id": student_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                },
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_data:
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "financial_student"
-                self.update_preview_section("financial_student", report_data)
-                self.screen.dialogs.show_export_options_dialog(
-                    "financial_student", report_data
-                )
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
-
         except Exception as e:
             print(f"Error generating financial student report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
@@ -240,84 +234,67 @@ class ReportsFormHandlers:
     async def handle_generate_school_financial_report(self):
         """Handle overall school financial report generation"""
         try:
-            # Get date range
-            start_date, end_date = None, None
-            if hasattr(self.screen.forms, "financial_period_dropdown"):
-                period = self.screen.forms.financial_period_dropdown.value
-                if period == "custom":
-                    start_date = self.screen.forms.financial_start_date.value
-                    end_date = self.screen.forms.financial_end_date.value
-                else:
-                    start_date, end_date = self.get_date_range(period)
-
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_data = (
-                await self.screen.services.generate_school_financial_report(
+            start_date, end_date = self.get_period_filter(
+                "financial_period_dropdown",
+                "financial_start_date",
+                "financial_end_date",
+            )
+
+            self.submit_report_job(
+                "financial_school",
+                lambda progress: self.screen.services.generate_school_financial_report(
                     start_date=start_date,
                     end_date=end_date,
-                )
+                    progress=progress,
+                ),
+                params={"start_date": start_date, "end_date": end_date},
+                # Convert to list format for export
+                to_rows=lambda result: ([result], result),
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
+        except Exception as e:
+            print(f"Error generating school financial report: {e}")
+            self.screen.dialogs.show_error_dialog(str(e))
 
-            if success and report_data:
-                # Convert to list format for export
-                report_list = [report_data]
-                self.screen.current_report_data = report_list
-                self.screen.current_report_type = "financial_school"
-                self.screen.current_report_summary = report_data
-                self.update_preview_section("financial_school", report_list)
-                self.screen.dialogs.show_export_options_dialog(
-                    "financial_school", report_list
-                )
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
+    async def handle_generate_financial_comparison_report(self):
+        """Handle multi-year financial comparison report generation"""
+        try:
+            # Months of the current school year after today are not compared
+            until = datetime.now().date().isoformat()
+
+            self.submit_report_job(
+                "financial_comparison",
+                lambda progress: self.screen.services.generate_financial_comparison_report(
+                    until=until, progress=progress
+                ),
+                params={"until": until},
+                # One row per school year and month, the series as summary
+                to_rows=lambda result: (comparison_rows(result), result),
+            )
 
         except Exception as e:
-            print(f"Error generating school financial report: {e}")
+            print(f"Error generating financial comparison report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
 
     async def handle_generate_cash_register_report(self):
         """Handle cash register report generation"""
         try:
-            # Get date range
-            start_date, end_date = None, None
-            if hasattr(self.screen.forms, "cash_register_period_dropdown"):
-                period = self.screen.forms.cash_register_period_dropdown.value
-                if period == "custom":
-                    start_date = self.screen.forms.cash_register_start_date.value
-                    end_date = self.screen.forms.cash_register_end_date.value
-                else:
-                    start_date, end_date = self.get_date_range(period)
-
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_data = (
-                await self.screen.services.generate_cash_register_report(
+            start_date, end_date = self.get_period_filter(
+                "cash_register_period_dropdown",
+                "cash_register_start_date",
+                "cash_register_end_date",
+            )
+
+            self.submit_report_job(
+                "cash_register",
+                lambda progress: self.screen.services.generate_cash_register_report(
                     start_date=start_date,
                     end_date=end_date,
-                )
+                    progress=progress,
+                ),
+                params={"start_date": start_date, "end_date": end_date},
             )
 
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_data:
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "cash_register"
-                self.update_preview_section("cash_register", report_data)
-                self.screen.dialogs.show_export_options_dialog(
-                    "cash_register", report_data
-                )
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
-
         except Exception as e:
             print(f"Error generating cash register report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
@@ -325,63 +302,92 @@ class ReportsFormHandlers:
     async def handle_generate_users_report(self):
         """Handle users report generation"""
         try:
-            # Show loading
-            loading_dialog = self.screen.dialogs.show_loading_dialog()
-
-            # Generate report
-            success, report_data = await self.screen.services.generate_users_report()
-
-            # Close loading
-            self.screen.dialogs.close_loading_dialog(loading_dialog)
-
-            if success and report_data:
-                self.screen.current_report_data = report_data
-                self.screen.current_report_type = "users"
-                self.update_preview_section("users", report_data)
-                self.screen.dialogs.show_export_options_dialog("users", report_data)
-            else:
-                self.screen.dialogs.show_error_dialog(self.get_text("no_data_found"))
+            self.submit_report_job(
+                "users",
+                lambda progress: self.screen.services.generate_users_report(
+                    progress=progress
+                ),
+            )
 
         except Exception as e:
             print(f"Error generating users report: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
 
+    async def show_report_job(self, job):
+        """Preview a finished report job and offer its export options"""
+        self.screen.current_report_data = job.rows
+        self.screen.current_report_type = job.report_type
+        self.screen.current_report_summary = job.summary
+        await self.update_preview_section(job.report_type, job.rows)
+        self.screen.dialogs.show_export_options_dialog(job.report_type, job.rows)
+
     # ========================================================================
     # PREVIEW UPDATE
     # ========================================================================
 
-    def update_preview_section(self, report_type: str, data: List[Dict[str, Any]]):
-        """Update the preview section with report data"""
+    PREVIEW_TABLE_BUILDERS = {
+        "students": "build_students_preview_table",
+        "staff_payments": "build_staff_payments_preview_table",
+        "financial_classroom": "build_financial_classroom_preview_table",
+        "financial_student": "build_financial_student_preview_table",
+        "financial_comparison": "build_financial_comparison_preview_table",
+        "cash_register": "build_cash_register_preview_table",
+        "users": "build_users_preview_table",
+    }
+
+    async def update_preview_section(
+        self, report_type: str, data: List[Dict[str, Any]]
+    ):
+        """Show the first page of a report in the preview section.
+
+        Only one page of rows is turned into table controls at a time.
+        """
+        if report_type not in self.PREVIEW_TABLE_BUILDERS:
+            return
+        self.screen.preview_rows = PagedRows(data)
+        await self.show_preview_page(report_type, 0)
+
+    async def show_preview_page(self, report_type: str, index: int):
+        """Render one page of the current preview"""
         try:
-            # Build appropriate preview table based on report type
-            if report_type == "students":
-                preview_table = self.screen.tables.build_students_preview_table(data)
-            elif report_type == "staff_payments":
-                preview_table = self.screen.tables.build_staff_payments_preview_table(
-                    data
-                )
-            elif report_type == "financial_classroom":
-                preview_table = (
-                    self.screen.tables.build_financial_classroom_preview_table(data)
-                )
-            elif report_type == "financial_student":
-                preview_table = (
-                    self.screen.tables.build_financial_student_preview_table(data)
-                )
-            elif report_type == "cash_register":
-                preview_table = self.screen.tables.build_cash_register_preview_table(
-                    data
-                )
-            elif report_type == "users":
-                preview_table = self.screen.tables.build_users_preview_table(data)
-            else:
-                return
+            pages = self.screen.preview_rows
+            rows = pages.get_page(index)
+            self.screen.preview_page = index
+            build_table = getattr(
+                self.screen.tables, self.PREVIEW_TABLE_BUILDERS[report_type]
+            )
+            preview_table = build_table(rows)
 
             # Update preview in the UI
             if hasattr(self.screen, "preview_container"):
-                from flet import Column, Container, Text, ScrollMode
+                from flet import (
+                    Column,
+                    Container,
+                    CrossAxisAlignment,
+                    IconButton,
+                    Icons,
+                    Row,
+                    ScrollMode,
+                    Text,
+                )
                 from .reports_components import ReportsComponents
 
+                async def on_previous(e):
+                    await self.show_preview_page(report_type, index - 1)
+
+                async def on_next(e):
+                    await self.show_preview_page(report_type, index + 1)
+
+                first = index * pages.page_size + 1 if rows else 0
+                last = index * pages.page_size + len(rows)
+                records = (
+                    f"{self.get_text('showing')} {first}-{last} "
+                    f"{self.get_text('of')} {pages.total()} {self.get_text('records')}"
+                )
+                page_label = (
+                    f"{self.get_text('page')} {index + 1} / {pages.page_count()}"
+                )
+
                 self.screen.preview_container.content = Column(
                     controls=[
                         ReportsComponents.create_section_header(
@@ -392,10 +398,24 @@ class ReportsFormHandlers:
                             content=preview_table,
                             padding=10,
                         ),
-                        Text(
-                            f"{self.get_text('showing')} {min(10, len(data))} {self.get_text('of')} {len(data)} {self.get_text('records')}",
-                            size=12,
-                            italic=True,
+                        Row(
+                            controls=[
+                                Text(records, size=12, italic=True, expand=True),
+                                IconButton(
+                                    icon=Icons.CHEVRON_LEFT,
+                                    tooltip=self.get_text("previous"),
+                                    disabled=index == 0,
+                                    on_click=on_previous,
+                                ),
+                                Text(page_label, size=12),
+                                IconButton(
+                                    icon=Icons.CHEVRON_RIGHT,
+                                    tooltip=self.get_text("next"),
+                                    disabled=not pages.has_next(index),
+                                    on_click=on_next,
+                                ),
+                            ],
+                            vertical_alignment=CrossAxisAlignment.CENTER,
                         ),
                     ],
                     scroll=ScrollMode.AUTO,
@@ -410,17 +430,34 @@ class ReportsFormHandlers:
     # EXPORT HANDLERS
     # ========================================================================
 
-    def export_to_excel(self, report_type: str, data: List[Dict[str, Any]]):
-        """Export report to Excel format"""
+    def get_export_path(self, report_type: str, extension: str) -> Path:
+        """Timestamped file name in the reports export folder"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return (
+            Path(Config.REPORTS_EXPORT_DIR)
+            / f"{report_type}_report_{timestamp}.{extension}"
+        )
+
+    async def export_to_excel(self, report_type: str, data: List[Dict[str, Any]]):
+        """Export report to an Excel workbook (written in a worker thread)"""
         try:
-            # TODO: Implement actual Excel export using openpyxl or xlsxwriter
-            # For now, save as JSON
-            filename = (
-                f"{report_type}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
+            columns = get_report_columns(report_type, self.get_text)
+            if not columns:
+                raise ValueError(f"Unknown report type: {report_type}")
+            filename = self.get_export_path(report_type, "xlsx")
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            loading_dialog = self.screen.dialogs.show_loading_dialog(
+                self.get_text("exporting_report")
+            )
+            try:
+                await export_xlsx(
+                    filename,
+                    columns,
+                    data,
+                    sheet_name=get_report_title(report_type, self.get_text),
+                )
+            finally:
+                self.screen.dialogs.close_loading_dialog(loading_dialog)
 
             self.screen.dialogs.show_success_dialog(
                 f"{self.get_text('report_exported_successfully')}\n{filename}"
@@ -429,17 +466,67 @@ class ReportsFormHandlers:
             print(f"Error exporting to Excel: {e}")
             self.screen.dialogs.show_error_dialog(str(e))
 
-    def export_to_pdf(self, report_type: str, data: List[Dict[str, Any]]):
-        """Export report to PDF format"""
+    async def export_to_csv(self, report_type: str, data: List[Dict[str, Any]]):
+        """Export report to a CSV file (written in a worker thread).
+
+        The rows are the retained result of the report job, so the file
+        matches the preview and the other exports even if the data changed
+        since the report was generated.
+        """
         try:
-            # TODO: Implement actual PDF export using reportlab or similar
-            # For now, save as JSON
-            filename = (
-                f"{report_type}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            columns = get_report_columns(report_type, self.get_text)
+            if not columns:
+                raise ValueError(f"Unknown report type: {report_type}")
+            filename = self.get_export_path(report_type, "csv")
+
+            loading_dialog = self.screen.dialogs.show_loading_dialog(
+                self.get_text("exporting_report")
             )
+            try:
+                await export_csv(filename, columns, data)
+            finally:
+                self.screen.dialogs.close_loading_dialog(loading_dialog)
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.screen.dialogs.show_success_dialog(
+                f"{self.get_text('report_exported_successfully')}\n{filename}"
+            )
+        except Exception as e:
+            print(f"Error exporting to CSV: {e}")
+            self.screen.dialogs.show_error_dialog(str(e))
+
+    async def export_to_pdf(self, report_type: str, data: List[Dict[str, Any]]):
+        """Export report to a paginated PDF (rendered in a worker thread)"""
+        try:
+            columns = get_report_columns(report_type, self.get_text)
+            if not columns:
+                raise ValueError(f"Unknown report type: {report_type}")
+            filename = self.get_export_path(report_type, "pdf")
+
+            loading_dialog = self.screen.dialogs.show_loading_dialog(
+                self.get_text("exporting_report")
+            )
+            try:
+                await export_pdf_report(
+                    filename,
+                    columns,
+                    data,
+                    get_report_title(report_type, self.get_text),
+                    school_name=self.screen.app_state.get_setting(
+                        "school_name", Config.SCHOOL_NAME
+                    ),
+                    labels={
+                        key: self.get_text(key)
+                        for key in (
+                            "carried_forward",
+                            "brought_forward",
+                            "total",
+                            "page",
+                            "generated_on",
+                        )
+                    },
+                )
+            finally:
+                self.screen.dialogs.close_loading_dialog(loading_dialog)
 
             self.screen.dialogs.show_success_dialog(
                 f"{self.get_text('report_exported_successfully')}\n{filename}"
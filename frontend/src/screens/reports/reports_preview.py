@@ -0,0 +1,36 @@
+"""
+Reports Preview Module
+Paged access to report rows for the preview table
+"""
+
+from typing import Any, List, Sequence
+
+from core import Config
+
+
+class PagedRows:
+    """Pages of the rows retained by a finished report job.
+
+    The preview, the exports and the re-exports all read the job's rows,
+    so they always show the same data; only the rows of the requested page
+    are turned into table controls.
+    """
+
+    def __init__(
+        self, rows: Sequence[Any], page_size: int = Config.REPORT_PREVIEW_PAGE_SIZE
+    ) -> None:
+        self.page_size = max(1, page_size)
+        self._rows = rows
+
+    def get_page(self, index: int) -> List[Any]:
+        start = max(0, index) * self.page_size
+        return list(self._rows[start : start + self.page_size])
+
+    def has_next(self, index: int) -> bool:
+        return len(self._rows) > (index + 1) * self.page_size
+
+    def total(self) -> int:
+        return len(self._rows)
+
+    def page_count(self) -> int:
+        return max(1, -(-len(self._rows) // self.page_size))
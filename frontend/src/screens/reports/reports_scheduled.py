@@ -0,0 +1,170 @@
+"""
+Reports Scheduled Module
+Reports written to disk by the report scheduler (Config.SCHEDULED_REPORTS)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+
+from core import AppState, Config, ReportScheduler, comparison_rows
+from exports import export_csv, export_pdf_report, export_xlsx
+from .reports_columns import get_report_columns, get_report_title
+from .reports_services import ReportsServices
+
+SCHEDULED_FORMATS = ("csv", "xlsx", "pdf")
+
+
+def get_period_dates(period: str, moment: datetime) -> Tuple[str, str]:
+    """Start and end dates (ISO) of a scheduled report period"""
+    day = moment.date()
+    if period == "day":
+        start, end = day, day
+    elif period == "previous_day":
+        start = end = day - timedelta(days=1)
+    elif period == "current_month":
+        start, end = day.replace(day=1), day
+    elif period == "previous_month":
+        end = day.replace(day=1) - timedelta(days=1)
+        start = end.replace(day=1)
+    else:
+        raise ValueError(f"Unknown scheduled report period: {period}")
+    return (start.isoformat(), end.isoformat())
+
+
+def _thread_iterator(
+    rows: AsyncIterator[Any], loop: asyncio.AbstractEventLoop
+) -> Iterator[Any]:
+    """Read an async iterator from a writer thread, one row at a time"""
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(rows.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+async def get_scheduled_rows(
+    services: ReportsServices, report_type: str, params: Dict[str, Any]
+) -> AsyncIterator[Any] | Iterable[Any]:
+    """Rows of a report: streamed from the database when the report allows it"""
+    rows = await services.stream_report_rows(report_type, params)
+    if rows is not None:
+        return rows
+
+    start_date, end_date = params["start_date"], params["end_date"]
+    if report_type == "staff_payments":
+        result = await services.generate_staff_payments_report(
+            start_date=start_date, end_date=end_date
+        )
+    elif report_type == "financial_classroom":
+        result = await services.generate_financial_report_by_classroom(
+            start_date=start_date, end_date=end_date
+        )
+    elif report_type == "financial_student":
+        result = await services.generate_financial_report_by_student(
+            start_date=start_date, end_date=end_date
+        )
+    elif report_type == "financial_school":
+        result = await services.generate_school_financial_report(
+            start_date=start_date, end_date=end_date
+        )
+    elif report_type == "financial_comparison":
+        result = await services.generate_financial_comparison_report(until=end_date)
+    elif report_type == "students":
+        result = await services.generate_students_report()
+    elif report_type == "users":
+        result = await services.generate_users_report()
+    else:
+        raise ValueError(f"Unknown report type: {report_type}")
+
+    success, data = result
+    if not success:
+        raise RuntimeError(f"Report '{report_type}' could not be generated")
+    if report_type == "financial_classroom":
+        return data.get("classrooms", [])
+    if report_type == "financial_school":
+        return [data]
+    if report_type == "financial_comparison":
+        return comparison_rows(data)
+    return data
+
+
+async def write_scheduled_report(
+    app_state: AppState,
+    definition: Dict[str, Any],
+    folder: Path,
+    scheduled_at: datetime,
+) -> Path:
+    """Generate one configured report into `folder` and return the file path"""
+    report_type = definition["report_type"]
+    file_format = definition.get("format", "xlsx")
+    if file_format not in SCHEDULED_FORMATS:
+        raise ValueError(f"Unknown scheduled report format: {file_format}")
+
+    def get_text(key: str) -> str:
+        return app_state.translations.get(key, key)
+
+    columns = get_report_columns(report_type, get_text)
+    if not columns:
+        raise ValueError(f"Unknown report type: {report_type}")
+    start_date, end_date = get_period_dates(
+        definition.get("period", "day"), scheduled_at
+    )
+    services = ReportsServices(app_state)
+    rows = await get_scheduled_rows(
+        services, report_type, {"start_date": start_date, "end_date": end_date}
+    )
+
+    path = folder / f"{definition['name']}.{file_format}"
+    title = get_report_title(report_type, get_text)
+    try:
+        if file_format == "csv":
+            await export_csv(path, columns, rows)
+            return path
+        if hasattr(rows, "__aiter__"):
+            # The writer thread pulls the database batches through the event loop
+            rows = _thread_iterator(rows.__aiter__(), asyncio.get_running_loop())
+        if file_format == "xlsx":
+            await export_xlsx(path, columns, rows, sheet_name=title)
+        else:
+            await export_pdf_report(
+                path,
+                columns,
+                rows,
+                f"{title} ({start_date} - {end_date})",
+                school_name=app_state.get_setting("school_name", Config.SCHOOL_NAME),
+                labels={
+                    key: get_text(key)
+                    for key in (
+                        "carried_forward",
+                        "brought_forward",
+                        "total",
+                        "page",
+                        "generated_on",
+                    )
+                },
+            )
+    except BaseException:
+        # A partial file would count as done for the catch-up of the scheduler
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def register_scheduled_reports(
+    app_state: AppState,
+    scheduler: Optional[ReportScheduler] = None,
+    definitions: Iterable[Dict[str, Any]] = Config.SCHEDULED_REPORTS,
+) -> ReportScheduler:
+    """Add the configured reports to the scheduler of the application"""
+    scheduler = scheduler or app_state.report_scheduler
+    for definition in definitions:
+
+        async def run(folder: Path, scheduled_at: datetime, definition=definition):
+            return await write_scheduled_report(
+                app_state, definition, folder, scheduled_at
+            )
+
+        scheduler.add(definition["name"], definition["cron"], run)
+    return scheduler
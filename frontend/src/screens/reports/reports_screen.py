@@ -13,8 +13,10 @@ Modules utilisés:
 """
 
 from flet import *  # type: ignore
-from core import AppState, Constants
+from core import AppState, Config, Constants, DataStore
+from utils import Debouncer
 import asyncio
+import inspect
 
 from .reports_services import ReportsServices
 from .reports_components import ReportsComponents
@@ -43,10 +45,22 @@ class ReportsScreen:
         self.current_report_data = []
         self.current_report_type = None
         self.current_report_summary = {}
+        # Pages of the report shown in the preview (PagedRows) and current page
+        self.preview_rows = None
+        self.preview_page = 0
+        # Last report job submitted from this screen (previewed when done)
+        self.pending_report_job_id = None
+        # job id -> (progress bar, percentage text) of the recent reports panel
+        self.report_job_progress = {}
+        self._report_job_status = {}
 
         # Current section
         self.current_section = "home"
         self.selected_financial_student_id = None
+        # Student search waits for a pause in typing
+        self.financial_student_search_debouncer = Debouncer(
+            Config.SEARCH_DEBOUNCE_DELAY
+        )
 
         # Initialize modules
         self.forms = ReportsForms(self)
@@ -57,6 +71,12 @@ class ReportsScreen:
         # Build UI components
         self.build_components()
 
+        # Keep the shared collections in sync when other screens change them
+        self.app_state.store.subscribe(DataStore.STUDENTS, self.on_store_change)
+        self.app_state.store.subscribe(DataStore.ENROLLMENTS, self.on_store_change)
+        # Background report jobs keep running while the user navigates
+        self.app_state.report_jobs.subscribe(self.on_report_job_change)
+
     # ========================================================================
     # LIFECYCLE METHODS
     # ========================================================================
@@ -67,9 +87,31 @@ class ReportsScreen:
 
     def refresh_reports_data(self, e):
         """Refresh all reports data"""
+        self.app_state.store.invalidate()
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.load_initial_data())
+        self.app_state.loader.load("reports", self.load_initial_data)
+
+    def on_language_change(self):
+        """Rebuild the headers and preview labels composed with translated text"""
+        if self.main_content.content is self.loading_indicator:
+            return
+        if self.current_section == "home":
+            self.show_home_section()
+            try:
+                self.main_content.update()
+            except Exception:
+                # Screen not mounted: rebuilt in the new language when shown
+                pass
+        elif (
+            self.current_section == self.current_report_type
+            and self.preview_rows is not None
+        ):
+            asyncio.create_task(
+                self.form_handlers.show_preview_page(
+                    self.current_report_type, self.preview_page
+                )
+            )
 
     # ========================================================================
     # UTILITY METHODS
@@ -88,6 +130,13 @@ class ReportsScreen:
     # DATA LOADING
     # ========================================================================
 
+    def on_store_change(self, collection: str, values: list):
+        """Use the reloaded shared collection"""
+        if collection == DataStore.STUDENTS:
+            self.students_list = values
+        else:
+            self.enrollments_list = values
+
     async def load_initial_data(self):
         """Load all necessary data for the reports screen"""
         try:
@@ -151,6 +200,14 @@ class ReportsScreen:
                     **self.get_box_style(),
                 ),
                 Container(height=10),
+                Container(
+                    content=self.tables.build_scheduled_reports_panel(),
+                    padding=Padding.all(20),
+                    **self.get_box_style(),
+                ),
+                Container(height=10),
+                self.build_report_jobs_container(),
+                Container(height=10),
                 report_cards,
             ],
         )
@@ -220,6 +277,8 @@ class ReportsScreen:
                 Container(height=10),
                 generate_button,
                 Container(height=10),
+                self.build_report_jobs_container(),
+                Container(height=10),
                 self.preview_container,
             ],
         )
@@ -243,8 +302,8 @@ class ReportsScreen:
             filter_form = self.forms.build_financial_filter_form("school")
         elif report_type == "cash_register":
             filter_form = self.forms.build_cash_register_filter_form()
-        elif report_type == "users":
-            # No filters needed for users report
+        elif report_type in ("users", "financial_comparison"):
+            # No filters needed for users and comparison reports
             filter_form = Column(
                 controls=[
                     Text(
@@ -279,11 +338,72 @@ class ReportsScreen:
             await self.form_handlers.handle_generate_financial_student_report()
         elif report_type == "financial_school":
             await self.form_handlers.handle_generate_school_financial_report()
+        elif report_type == "financial_comparison":
+            await self.form_handlers.handle_generate_financial_comparison_report()
         elif report_type == "cash_register":
             await self.form_handlers.handle_generate_cash_register_report()
         elif report_type == "users":
             await self.form_handlers.handle_generate_users_report()
 
+    # ========================================================================
+    # BACKGROUND REPORT JOBS
+    # ========================================================================
+
+    def build_report_jobs_container(self) -> Container:
+        """Recent reports panel of the current section"""
+        self.report_jobs_container.content = self.tables.build_report_jobs_panel(
+            self.app_state.report_jobs.jobs
+        )
+        self._report_job_status = {
+            job.id: job.status for job in self.app_state.report_jobs.jobs
+        }
+        return self.report_jobs_container
+
+    async def on_report_job_change(self, job):
+        """Refresh the recent reports panel when a job progresses or ends"""
+        try:
+            if self._report_job_status.get(job.id) == job.status and (
+                job.id in self.report_job_progress
+            ):
+                # Same status: only the progress bar of this job changes
+                progress_bar, percent_text = self.report_job_progress[job.id]
+                progress_bar.value = job.percent / 100
+                percent_text.value = f"{job.percent}%"
+                progress_bar.update()
+                percent_text.update()
+                return
+
+            self.build_report_jobs_container()
+            self.report_jobs_container.update()
+        except Exception:
+            # Screen not mounted: the panel is rebuilt with the next section
+            pass
+
+        if job.id == self.pending_report_job_id and job.is_finished:
+            self.pending_report_job_id = None
+            if self.current_section != job.report_type:
+                return
+            if job.status == job.DONE:
+                await self.form_handlers.show_report_job(job)
+            elif job.status == job.FAILED:
+                self.dialogs.show_error_dialog(job.error or self.get_text("error"))
+
+    async def open_report_job(self, job):
+        """Show a finished report again without generating it"""
+        if self.current_section != job.report_type:
+            self.show_report_section(job.report_type)
+        await self.form_handlers.show_report_job(job)
+
+    async def open_scheduled_report(self, path):
+        """Open a report written by the scheduler with the system viewer"""
+        try:
+            result = self.page.launch_url(path.resolve().as_uri())
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"Error opening scheduled report: {e}")
+            self.dialogs.show_error_dialog(str(e))
+
     # ========================================================================
     # PERIOD CHANGE HANDLERS
     # ========================================================================
@@ -330,12 +450,11 @@ class ReportsScreen:
 
     def handle_financial_student_search_change(self, e):
         """Handle changes in financial student search field"""
-        from utils import Utils
-
         search_text = e.control.value.strip()
 
         # Hide suggestions if less than 2 characters
         if len(search_text) < 2:
+            self.financial_student_search_debouncer.cancel()
             if hasattr(self.forms, "financial_student_suggestions_container"):
                 self.forms.financial_student_suggestions_container.visible = False
                 try:
@@ -344,7 +463,16 @@ class ReportsScreen:
                     pass
             return
 
-        # Filter students based on search text
+        # Only the last keystroke is searched, off the UI path
+        self.financial_student_search_debouncer.call(
+            lambda: self.find_financial_student_suggestions(search_text),
+            self.display_financial_student_suggestions,
+        )
+
+    def find_financial_student_suggestions(self, search_text: str) -> list:
+        """Students whose names match the search text"""
+        from utils import Utils
+
         suggestions = []
         if self.students_list:
             normalized_search = Utils.normalize_text(search_text.lower())
@@ -371,8 +499,7 @@ class ReportsScreen:
                 ):
                     suggestions.append(student)
 
-        # Display suggestions
-        self.display_financial_student_suggestions(suggestions)
+        return suggestions
 
     def display_financial_student_suggestions(self, suggestions):
         """Display the list of student suggestions for financial report"""
@@ -432,17 +559,7 @@ class ReportsScreen:
 
     def _get_classroom_name_for_student(self, student_id: int) -> str:
         """Get classroom name for a student"""
-        try:
-            # Find enrollment
-            for enrollment in self.enrollments_list:
-                if enrollment.student_id == student_id:
-                    # Find classroom
-                    for classroom in self.classrooms_list:
-                        if classroom.id_classroom == enrollment.classroom_id:
-                            return classroom.name
-        except Exception as e:
-            print(f"Error getting classroom name: {e}")
-        return "N/A"
+        return self.app_state.repository.classroom_name_for_student(student_id)
 
     def select_financial_student(self, student):
         """Select a student from suggestions for financial report"""
@@ -525,6 +642,11 @@ class ReportsScreen:
             **self.get_box_style(),
         )
 
+        self.report_jobs_container = Container(
+            padding=Padding.all(20),
+            **self.get_box_style(),
+        )
+
     def build(self) -> Column:
         """Build the main reports screen layout"""
         return Column(
@@ -4,9 +4,17 @@ Handles all business logic and API calls for the reports screen
 """
 
 import asyncio
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from core import AppState
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from core import (
+    AppState,
+    Config,
+    ProgressCallback,
+    cached_report,
+    compare_school_years,
+    track_rows,
+)
+from core.financial_comparison import SOURCES as COMPARISON_SOURCES
 from models import (
     StudentModel,
     StaffModel,
@@ -33,7 +41,7 @@ class ReportsServices:
     async def load_students_list(self):
         """Load all students"""
         try:
-            students = await self.app_state.api_client.list_students()
+            students = await self.app_state.store.get_students()
             return (True, students)
         except Exception as e:
             print(f"Error loading students list: {e}")
@@ -54,6 +62,7 @@ class ReportsServices:
         """Load all staff members"""
         try:
             staff = await self.app_state.api_client.list_staff()
+            self.app_state.repository.set_staff(staff)
             return (True, staff)
         except Exception as e:
             print(f"Error loading staff list: {e}")
@@ -62,43 +71,52 @@ class ReportsServices:
     async def load_classrooms_list(self):
         """Load all classrooms"""
         try:
-            classrooms = await self.app_state.api_client.list_classrooms()
+            classrooms = await self.app_state.store.get_classrooms()
             return (True, classrooms)
         except Exception as e:
             print(f"Error loading classrooms list: {e}")
             return (False, [])
 
-    async def load_payments_list(self):
+    async def load_payments_list(self, school_year_id: int | None = None):
         """Load all payments"""
         try:
-            payments = await self.app_state.api_client.list_payments()
+            payments = await self.app_state.store.get_payments(school_year_id)
             return (True, payments)
         except Exception as e:
             print(f"Error loading payments list: {e}")
             return (False, [])
 
-    async def load_staff_payments_list(self):
+    async def load_staff_payments_list(self, school_year_id: int | None = None):
         """Load all staff payments"""
         try:
-            payments = await self.app_state.api_client.list_staff_payments()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            payments = await self.app_state.api_client.list_staff_payments(
+                school_year_id=school_year_id
+            )
             return (True, payments)
         except Exception as e:
             print(f"Error loading staff payments list: {e}")
             return (False, [])
 
-    async def load_cash_register_entries(self):
+    async def load_cash_register_entries(self, school_year_id: int | None = None):
         """Load all cash register entries"""
         try:
-            entries = await self.app_state.api_client.list_cash_register_entries()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            entries = await self.app_state.api_client.list_cash_register_entries(
+                school_year_id=school_year_id
+            )
             return (True, entries)
         except Exception as e:
             print(f"Error loading cash register entries: {e}")
             return (False, [])
 
-    async def load_expenses_list(self):
+    async def load_expenses_list(self, school_year_id: int | None = None):
         """Load all expenses"""
         try:
-            expenses = await self.app_state.api_client.list_expenses()
+            school_year_id = await self.app_state.resolve_school_year_id(school_year_id)
+            expenses = await self.app_state.api_client.list_expenses(
+                school_year_id=school_year_id
+            )
             return (True, expenses)
         except Exception as e:
             print(f"Error loading expenses list: {e}")
@@ -113,10 +131,10 @@ class ReportsServices:
             print(f"Error loading users list: {e}")
             return (False, [])
 
-    async def load_enrollments_list(self):
+    async def load_enrollments_list(self, school_year_id: int | None = None):
         """Load all enrollments"""
         try:
-            enrollments = await self.app_state.api_client.list_enrollments()
+            enrollments = await self.app_state.store.get_enrollments(school_year_id)
             return (True, enrollments)
         except Exception as e:
             print(f"Error loading enrollments list: {e}")
@@ -126,10 +144,12 @@ class ReportsServices:
     # REPORT GENERATION METHODS
     # ========================================================================
 
+    @cached_report("students", tables=("students", "enrollments", "classrooms"))
     async def generate_students_report(
         self,
         classroom_id: Optional[int] = None,
         format: str = "all",
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, List[Dict[str, Any]]]:
         """Generate students report"""
         try:
@@ -148,13 +168,13 @@ class ReportsServices:
             # Create enrollment map
             enrollment_map = {}
             for enrollment in enrollments:
-                enrollment_map[enrollment.id_student] = enrollment.id_classroom
+                enrollment_map[enrollment.student_id] = enrollment.classroom_id
 
             # Create classroom map
             classroom_map = {c.id_classroom: c.name for c in classrooms}
 
             report_data = []
-            for student in students:
+            async for student in track_rows(students, progress):
                 classroom_name = "N/A"
                 if student.id_student in enrollment_map:
                     classroom_id_mapped = enrollment_map[student.id_student]
@@ -167,7 +187,7 @@ class ReportsServices:
                         "last_name": student.last_name,
                         "gender": student.gender,
                         "date_of_birth": student.date_of_birth,
-                        "contact": student.contact or "N/A",
+                        "parent_contact": student.parent_contact or "N/A",
                         "address": student.address or "N/A",
                         "classroom": classroom_name,
                     }
@@ -178,11 +198,13 @@ class ReportsServices:
             print(f"Error generating students report: {e}")
             return (False, [])
 
+    @cached_report("staff_payments", tables=("staff_payments", "staff"))
     async def generate_staff_payments_report(
         self,
         staff_id: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, List[Dict[str, Any]]]:
         """Generate staff payments report"""
         try:
@@ -202,14 +224,14 @@ class ReportsServices:
             staff_map = {s.id_staff: s for s in staff_list}
 
             report_data = []
-            for payment in payments:
+            async for payment in track_rows(payments, progress):
                 # Filter by date if provided
                 if start_date and payment.payment_date < start_date:
                     continue
                 if end_date and payment.payment_date > end_date:
                     continue
 
-                staff = staff_map.get(payment.id_staff)
+                staff = staff_map.get(payment.staff_id)
                 staff_name = (
                     f"{staff.first_name} {staff.last_name}" if staff else "Unknown"
                 )
@@ -220,8 +242,6 @@ class ReportsServices:
                         "staff_name": staff_name,
                         "payment_date": payment.payment_date,
                         "amount": payment.amount,
-                        "payment_type": payment.payment_type or "Salary",
-                        "description": payment.description or "N/A",
                     }
                 )
 
@@ -230,71 +250,44 @@ class ReportsServices:
             print(f"Error generating staff payments report: {e}")
             return (False, [])
 
+    @cached_report(
+        "financial_classroom",
+        tables=("payments", "students", "enrollments", "classrooms"),
+    )
     async def generate_financial_report_by_classroom(
         self,
         classroom_id: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, Dict[str, Any]]:
-        """Generate financial report by classroom"""
+        """Generate financial report by classroom (from the financial cube)"""
         try:
-            success, payments = await self.load_payments_list()
-            if not success:
-                return (False, {})
-
-            _, students = await self.load_students_list()
-            _, enrollments = await self.load_enrollments_list()
+            school_year_id = await self.app_state.resolve_school_year_id()
+            totals = await self.app_state.api_client.get_financial_totals(
+                group_by=("classroom_id",),
+                school_year_id=school_year_id,
+                start_date=start_date,
+                end_date=end_date,
+                classroom_id=classroom_id,
+                count_students=True,
+            )
             _, classrooms = await self.load_classrooms_list()
-
-            # Create maps
-            enrollment_map = {}
-            for enrollment in enrollments:
-                enrollment_map[enrollment.id_student] = enrollment.id_classroom
-
             classroom_map = {c.id_classroom: c.name for c in classrooms}
-            student_map = {s.id_student: s for s in students}
-
-            # Aggregate by classroom
-            classroom_totals = {}
-            for payment in payments:
-                # Filter by date if provided
-                if start_date and payment.payment_date < start_date:
-                    continue
-                if end_date and payment.payment_date > end_date:
-                    continue
-
-                student_id = payment.id_student
-                if student_id not in enrollment_map:
-                    continue
 
-                class_id = enrollment_map[student_id]
-
-                # Filter by specific classroom if provided
-                if classroom_id and class_id != classroom_id:
-                    continue
-
-                class_name = classroom_map.get(class_id, f"Classroom {class_id}")
-
-                if class_name not in classroom_totals:
-                    classroom_totals[class_name] = {
-                        "total_amount": 0.0,
-                        "payment_count": 0,
-                        "students": set(),
-                    }
-
-                classroom_totals[class_name]["total_amount"] += payment.amount
-                classroom_totals[class_name]["payment_count"] += 1
-                classroom_totals[class_name]["students"].add(student_id)
-
-            # Convert to list
             report_data = []
-            for class_name, data in classroom_totals.items():
+            async for row in track_rows(totals, progress):
+                # Payments of students without enrollment are not attributed
+                if not row["classroom_id"]:
+                    continue
                 report_data.append(
                     {
-                        "classroom": class_name,
-                        "total_amount": data["total_amount"],
-                        "payment_count": data["payment_count"],
-                        "student_count": len(data["students"]),
+                        "classroom": classroom_map.get(
+                            row["classroom_id"], f"Classroom {row['classroom_id']}"
+                        ),
+                        "total_amount": row["total_amount"],
+                        "payment_count": row["entry_count"],
+                        "student_count": row["student_count"],
                     }
                 )
 
@@ -309,125 +302,89 @@ class ReportsServices:
             print(f"Error generating financial report by classroom: {e}")
             return (False, {})
 
+    @cached_report("financial_student", tables=("payments", "students"))
     async def generate_financial_report_by_student(
         self,
         student_id: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, List[Dict[str, Any]]]:
-        """Generate financial report by student"""
+        """Generate financial report by student (from the financial cube)"""
         try:
-            if student_id:
-                payments = await self.app_state.api_client.list_payments_by_student(
-                    student_id
-                )
-                success = True
-            else:
-                success, payments = await self.load_payments_list()
-
-            if not success:
-                return (False, [])
-
+            # A single student is reported over every school year
+            school_year_id = (
+                None if student_id else await self.app_state.resolve_school_year_id()
+            )
+            totals = await self.app_state.api_client.get_financial_totals(
+                group_by=("student_id",),
+                school_year_id=school_year_id,
+                start_date=start_date,
+                end_date=end_date,
+                student_id=student_id,
+            )
             _, students = await self.load_students_list()
             student_map = {s.id_student: s for s in students}
 
-            # Aggregate by student
-            student_totals = {}
-            for payment in payments:
-                # Filter by date if provided
-                if start_date and payment.payment_date < start_date:
-                    continue
-                if end_date and payment.payment_date > end_date:
-                    continue
-
-                student_id_key = payment.id_student
-                if student_id_key not in student_totals:
-                    student = student_map.get(student_id_key)
-                    student_name = (
-                        f"{student.first_name} {student.last_name}"
-                        if student
-                        else "Unknown"
-                    )
-                    student_totals[student_id_key] = {
-                        "student_name": student_name,
-                        "total_amount": 0.0,
-                        "payment_count": 0,
+            report_data = []
+            async for row in track_rows(totals, progress):
+                student = student_map.get(row["student_id"])
+                report_data.append(
+                    {
+                        "student_id": row["student_id"],
+                        "student_name": (
+                            f"{student.first_name} {student.last_name}"
+                            if student
+                            else "Unknown"
+                        ),
+                        "total_amount": row["total_amount"],
+                        "payment_count": row["entry_count"],
                     }
-
-                student_totals[student_id_key]["total_amount"] += payment.amount
-                student_totals[student_id_key]["payment_count"] += 1
-
-            report_data = [
-                {
-                    "student_id": sid,
-                    "student_name": data["student_name"],
-                    "total_amount": data["total_amount"],
-                    "payment_count": data["payment_count"],
-                }
-                for sid, data in student_totals.items()
-            ]
+                )
 
             return (True, report_data)
         except Exception as e:
             print(f"Error generating financial report by student: {e}")
             return (False, [])
 
+    @cached_report(
+        "financial_school", tables=("payments", "staff_payments", "expenses")
+    )
     async def generate_school_financial_report(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, Dict[str, Any]]:
-        """Generate overall school financial report"""
+        """Generate overall school financial report (from the financial cube)"""
         try:
-            success_payments, payments = await self.load_payments_list()
-            success_staff_payments, staff_payments = (
-                await self.load_staff_payments_list()
+            school_year_id = await self.app_state.resolve_school_year_id()
+            totals = await self.app_state.api_client.get_financial_totals(
+                group_by=("source",),
+                sources=("payment", "staff_payment", "expense"),
+                school_year_id=school_year_id,
+                start_date=start_date,
+                end_date=end_date,
             )
-            success_expenses, expenses = await self.load_expenses_list()
-
-            if not (success_payments and success_staff_payments and success_expenses):
-                return (False, {})
-
-            total_income = 0.0
-            total_expenses = 0.0
-            payment_count = 0
-            staff_payment_count = 0
-            expense_count = 0
+            by_source = {
+                row["source"]: row async for row in track_rows(totals, progress)
+            }
+            empty = {"total_amount": 0.0, "entry_count": 0}
+            payments = by_source.get("payment", empty)
+            staff_payments = by_source.get("staff_payment", empty)
+            expenses = by_source.get("expense", empty)
 
-            # Calculate income from student payments
-            for payment in payments:
-                if start_date and payment.payment_date < start_date:
-                    continue
-                if end_date and payment.payment_date > end_date:
-                    continue
-                total_income += payment.amount
-                payment_count += 1
-
-            # Calculate expenses from staff payments
-            for payment in staff_payments:
-                if start_date and payment.payment_date < start_date:
-                    continue
-                if end_date and payment.payment_date > end_date:
-                    continue
-                total_expenses += payment.amount
-                staff_payment_count += 1
-
-            # Calculate expenses from general expenses
-            for expense in expenses:
-                if start_date and expense.date < start_date:
-                    continue
-                if end_date and expense.date > end_date:
-                    continue
-                total_expenses += expense.amount
-                expense_count += 1
+            total_income = payments["total_amount"]
+            # Staff payments and general expenses are both expenses
+            total_expenses = staff_payments["total_amount"] + expenses["total_amount"]
 
             report_data = {
                 "total_income": total_income,
                 "total_expenses": total_expenses,
                 "net_balance": total_income - total_expenses,
-                "payment_count": payment_count,
-                "staff_payment_count": staff_payment_count,
-                "expense_count": expense_count,
+                "payment_count": payments["entry_count"],
+                "staff_payment_count": staff_payments["entry_count"],
+                "expense_count": expenses["entry_count"],
             }
 
             return (True, report_data)
@@ -435,10 +392,63 @@ class ReportsServices:
             print(f"Error generating school financial report: {e}")
             return (False, {})
 
+    @cached_report(
+        "financial_comparison",
+        tables=("payments", "staff_payments", "expenses", "school_years"),
+    )
+    async def generate_financial_comparison_report(
+        self,
+        school_year_ids: Optional[List[int]] = None,
+        until: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> tuple[bool, Dict[str, Any]]:
+        """Compare income and expenses of several school years month by month.
+
+        Monthly totals come from the financial cube in one grouped query;
+        the series are aligned on the month of the school year with their
+        month-over-month and year-over-year variations. `until` (ISO date)
+        drops the months of the current year that have not started yet.
+        """
+        try:
+            school_years = await self.app_state.api_client.list_school_years(
+                deletion_status="all"
+            )
+            if school_year_ids:
+                school_years = [
+                    year
+                    for year in school_years
+                    if year.id_school_year in school_year_ids
+                ]
+            elif Config.FINANCIAL_COMPARISON_YEARS:
+                # list_school_years returns the most recent years first
+                school_years = school_years[: Config.FINANCIAL_COMPARISON_YEARS]
+            year_ids = {year.id_school_year for year in school_years}
+
+            totals = await self.app_state.api_client.get_financial_totals(
+                group_by=("source", "school_year_id", "month"),
+                sources=COMPARISON_SOURCES,
+            )
+            rows = [
+                row
+                async for row in track_rows(totals, progress)
+                if row["school_year_id"] in year_ids
+            ]
+            report_data = compare_school_years(
+                rows,
+                school_years,
+                until=date.fromisoformat(until[:10]) if until else None,
+            )
+            return (True, report_data)
+        except Exception as e:
+            print(f"Error generating financial comparison report: {e}")
+            return (False, {})
+
+    @cached_report("cash_register", tables=("cash_register",))
     async def generate_cash_register_report(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> tuple[bool, List[Dict[str, Any]]]:
         """Generate cash register report"""
         try:
@@ -447,7 +457,7 @@ class ReportsServices:
                 return (False, [])
 
             report_data = []
-            for entry in entries:
+            async for entry in track_rows(entries, progress):
                 # Filter by date if provided
                 if start_date and entry.date < start_date:
                     continue
@@ -456,7 +466,7 @@ class ReportsServices:
 
                 report_data.append(
                     {
-                        "id": entry.id_cash_register,
+                        "id": entry.id_cash,
                         "date": entry.date,
                         "type": entry.type,
                         "description": entry.description or "N/A",
@@ -469,7 +479,10 @@ class ReportsServices:
             print(f"Error generating cash register report: {e}")
             return (False, [])
 
-    async def generate_users_report(self) -> tuple[bool, List[Dict[str, Any]]]:
+    @cached_report("users", tables=("users",))
+    async def generate_users_report(
+        self, progress: Optional[ProgressCallback] = None
+    ) -> tuple[bool, List[Dict[str, Any]]]:
         """Generate users report"""
         try:
             success, users = await self.load_users_list()
@@ -477,13 +490,13 @@ class ReportsServices:
                 return (False, [])
 
             report_data = []
-            for user in users:
+            async for user in track_rows(users, progress):
                 report_data.append(
                     {
                         "id": user.id_user,
                         "username": user.username,
                         "role_id": user.role_id,
-                        "is_active": "Yes" if user.is_active else "No",
+                        "is_active": "No" if user.is_deleted else "Yes",
                     }
                 )
 
@@ -491,3 +504,39 @@ class ReportsServices:
         except Exception as e:
             print(f"Error generating users report: {e}")
             return (False, [])
+
+    # ========================================================================
+    # STREAMED ROWS
+    # ========================================================================
+
+    async def stream_report_rows(
+        self, report_type: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[AsyncIterator[Dict[str, Any]]]:
+        """Rows of a report read straight from the database in batches.
+
+        Used by the scheduled exports so that large detail reports never
+        sit in memory. The filters are those of the matching generate_*
+        method. Returns None for report types without a streamed query
+        (the generated rows are used instead).
+        """
+        params = params or {}
+        api_client = self.app_state.api_client
+        school_year_id = await self.app_state.resolve_school_year_id()
+        if report_type == "cash_register":
+            return api_client.stream_cash_register_entries(
+                school_year_id=school_year_id,
+                start_date=params.get("start_date"),
+                end_date=params.get("end_date"),
+                batch_size=Config.EXPORT_BATCH_SIZE,
+            )
+        if report_type == "staff_payments":
+            staff_id = params.get("staff_id")
+            return api_client.stream_staff_payments(
+                # Like the generated report, one staff member spans every year
+                school_year_id=None if staff_id else school_year_id,
+                staff_id=staff_id,
+                start_date=params.get("start_date"),
+                end_date=params.get("end_date"),
+                batch_size=Config.EXPORT_BATCH_SIZE,
+            )
+        return None
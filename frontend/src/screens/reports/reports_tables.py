@@ -3,9 +3,11 @@ Reports Tables Module
 Manages all table/list views for the reports screen
 """
 
+import asyncio
+
 from flet import *  # type: ignore
-from core import Constants
-from typing import List, Dict, Any
+from core import Constants, ReportJob
+from typing import List, Dict, Any, Optional
 
 
 class ReportsTables:
@@ -21,6 +23,8 @@ class ReportsTables:
     # ========================================================================
     # PREVIEW TABLES
     # ========================================================================
+    # Each builder renders the rows it is given: the preview passes one page
+    # (see ReportsFormHandlers.update_preview_section).
 
     def build_students_preview_table(self, data: List[Dict[str, Any]]) -> DataTable:
         """Build preview table for students report"""
@@ -34,7 +38,7 @@ class ReportsTables:
         ]
 
         rows = []
-        for item in data[:10]:  # Show first 10 for preview
+        for item in data:
             rows.append(
                 DataRow(
                     cells=[
@@ -70,11 +74,10 @@ class ReportsTables:
             DataColumn(Text(self.get_text("staff_name"), weight=FontWeight.BOLD)),
             DataColumn(Text(self.get_text("payment_date"), weight=FontWeight.BOLD)),
             DataColumn(Text(self.get_text("amount"), weight=FontWeight.BOLD)),
-            DataColumn(Text(self.get_text("payment_type"), weight=FontWeight.BOLD)),
         ]
 
         rows = []
-        for item in data[:10]:
+        for item in data:
             rows.append(
                 DataRow(
                     cells=[
@@ -82,7 +85,6 @@ class ReportsTables:
                         DataCell(Text(item.get("staff_name", ""))),
                         DataCell(Text(item.get("payment_date", ""))),
                         DataCell(Text(f"${item.get('amount', 0):.2f}")),
-                        DataCell(Text(item.get("payment_type", ""))),
                     ]
                 )
             )
@@ -149,7 +151,7 @@ class ReportsTables:
         ]
 
         rows = []
-        for item in data[:10]:
+        for item in data:
             rows.append(
                 DataRow(
                     cells=[
@@ -174,6 +176,58 @@ class ReportsTables:
             data_row_max_height=60,
         )
 
+    def build_financial_comparison_preview_table(
+        self, data: List[Dict[str, Any]]
+    ) -> DataTable:
+        """Build preview table for the multi-year financial comparison"""
+
+        def growth(value: Optional[float]) -> Text:
+            if value is None:
+                return Text("-")
+            return Text(
+                f"{value:+.1f}%",
+                color=Colors.GREEN_700 if value >= 0 else Colors.RED_700,
+            )
+
+        columns = [
+            DataColumn(Text(self.get_text("school_year"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("month"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("income"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("mom_growth"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("yoy_growth"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("expenses"), weight=FontWeight.BOLD)),
+            DataColumn(Text(self.get_text("net_balance"), weight=FontWeight.BOLD)),
+        ]
+
+        rows = []
+        for item in data:
+            rows.append(
+                DataRow(
+                    cells=[
+                        DataCell(Text(item.get("school_year", ""))),
+                        DataCell(Text(item.get("month", ""))),
+                        DataCell(Text(f"${item.get('income', 0):.2f}")),
+                        DataCell(growth(item.get("income_mom_growth"))),
+                        DataCell(growth(item.get("income_yoy_growth"))),
+                        DataCell(Text(f"${item.get('expenses', 0):.2f}")),
+                        DataCell(Text(f"${item.get('net', 0):.2f}")),
+                    ]
+                )
+            )
+
+        return DataTable(
+            columns=columns,
+            rows=rows,
+            border=border.all(1, Colors.GREY_300),
+            border_radius=BorderRadius.all(8),
+            vertical_lines=border.BorderSide(1, Colors.GREY_300),
+            horizontal_lines=border.BorderSide(1, Colors.GREY_300),
+            heading_row_color=Colors.BLUE_50,
+            heading_row_height=50,
+            data_row_min_height=40,
+            data_row_max_height=60,
+        )
+
     def build_cash_register_preview_table(
         self, data: List[Dict[str, Any]]
     ) -> DataTable:
@@ -187,7 +241,7 @@ class ReportsTables:
         ]
 
         rows = []
-        for item in data[:10]:
+        for item in data:
             rows.append(
                 DataRow(
                     cells=[
@@ -223,7 +277,7 @@ class ReportsTables:
         ]
 
         rows = []
-        for item in data[:10]:
+        for item in data:
             rows.append(
                 DataRow(
                     cells=[
@@ -248,6 +302,197 @@ class ReportsTables:
             data_row_max_height=60,
         )
 
+    # ========================================================================
+    # RECENT REPORTS
+    # ========================================================================
+
+    JOB_STATUS_COLORS = {
+        ReportJob.QUEUED: Colors.GREY,
+        ReportJob.RUNNING: Constants.PRIMARY_COLOR,
+        ReportJob.DONE: Colors.GREEN,
+        ReportJob.FAILED: Colors.RED,
+        ReportJob.CANCELLED: Colors.ORANGE,
+    }
+
+    def build_report_jobs_panel(self, jobs: List[ReportJob]) -> Control:
+        """Build the list of queued, running and recent report jobs.
+
+        The progress bar and percentage of every job are kept in
+        screen.report_job_progress so that progress updates only touch them.
+        """
+        from .reports_components import ReportsComponents
+
+        self.screen.report_job_progress = {}
+        if not jobs:
+            return Text(self.get_text("no_recent_reports"), size=12, italic=True)
+
+        return Column(
+            controls=[
+                ReportsComponents.create_section_header(
+                    title=self.get_text("recent_reports"),
+                    icon=Icons.HISTORY,
+                ),
+                *[self.build_report_job_row(job) for job in jobs],
+            ],
+            spacing=5,
+        )
+
+    def build_report_job_row(self, job: ReportJob) -> Control:
+        """Build one row of the recent reports panel"""
+        handlers = self.screen.form_handlers
+        progress_bar = ProgressBar(
+            value=job.percent / 100,
+            color=self.JOB_STATUS_COLORS[job.status],
+            bgcolor=Colors.GREY_200,
+            expand=True,
+        )
+        percent_text = Text(f"{job.percent}%", size=12, width=40)
+        self.screen.report_job_progress[job.id] = (progress_bar, percent_text)
+
+        status = self.get_text(f"report_job_{job.status}")
+        if job.status == ReportJob.FAILED and job.error:
+            status = f"{status} : {job.error}"
+
+        actions = []
+        if not job.is_finished:
+            actions.append(
+                IconButton(
+                    icon=Icons.CANCEL,
+                    icon_color=Colors.RED,
+                    tooltip=self.get_text("cancel"),
+                    on_click=lambda e, job_id=job.id: self.screen.app_state.report_jobs.cancel(
+                        job_id
+                    ),
+                )
+            )
+        elif job.status == ReportJob.DONE:
+            actions.extend(
+                [
+                    IconButton(
+                        icon=Icons.VISIBILITY,
+                        icon_color=Constants.PRIMARY_COLOR,
+                        tooltip=self.get_text("preview"),
+                        on_click=lambda e, job=job: asyncio.create_task(
+                            self.screen.open_report_job(job)
+                        ),
+                    ),
+                    IconButton(
+                        icon=Icons.TABLE_CHART,
+                        icon_color=Colors.GREEN,
+                        tooltip=self.get_text("export_excel"),
+                        on_click=lambda e, job=job: asyncio.create_task(
+                            handlers.export_to_excel(job.report_type, job.rows)
+                        ),
+                    ),
+                    IconButton(
+                        icon=Icons.TEXT_SNIPPET,
+                        icon_color=Colors.TEAL,
+                        tooltip=self.get_text("export_csv"),
+                        on_click=lambda e, job=job: asyncio.create_task(
+                            handlers.export_to_csv(job.report_type, job.rows)
+                        ),
+                    ),
+                    IconButton(
+                        icon=Icons.PICTURE_AS_PDF,
+                        icon_color=Colors.RED,
+                        tooltip=self.get_text("export_pdf"),
+                        on_click=lambda e, job=job: asyncio.create_task(
+                            handlers.export_to_pdf(job.report_type, job.rows)
+                        ),
+                    ),
+                ]
+            )
+        if job.is_finished:
+            actions.append(
+                IconButton(
+                    icon=Icons.DELETE_OUTLINE,
+                    icon_color=Colors.GREY,
+                    tooltip=self.get_text("remove"),
+                    on_click=lambda e, job_id=job.id: self.screen.app_state.report_jobs.remove(
+                        job_id
+                    ),
+                )
+            )
+
+        return Container(
+            content=Row(
+                controls=[
+                    Column(
+                        controls=[
+                            Text(job.title, weight=FontWeight.BOLD, size=14),
+                            Text(
+                                f"{job.created_at.strftime('%H:%M:%S')} · {status}",
+                                size=12,
+                                color=self.JOB_STATUS_COLORS[job.status],
+                            ),
+                        ],
+                        spacing=2,
+                        width=260,
+                    ),
+                    progress_bar,
+                    percent_text,
+                    Row(controls=actions, spacing=0),
+                ],
+                spacing=10,
+                vertical_alignment=CrossAxisAlignment.CENTER,
+            ),
+            padding=Padding.symmetric(horizontal=10, vertical=5),
+            border=border.all(1, Colors.GREY_300),
+            border_radius=BorderRadius.all(8),
+        )
+
+    # ========================================================================
+    # SCHEDULED REPORTS
+    # ========================================================================
+
+    SCHEDULED_FILE_ICONS = {
+        ".xlsx": (Icons.TABLE_CHART, Colors.GREEN),
+        ".pdf": (Icons.PICTURE_AS_PDF, Colors.RED),
+        ".csv": (Icons.TEXT_SNIPPET, Colors.TEAL),
+    }
+
+    def build_scheduled_reports_panel(self) -> Control:
+        """Files of the latest scheduled reports folder, opened without recomputing"""
+        from .reports_components import ReportsComponents
+
+        day, files = self.screen.app_state.report_scheduler.latest_outputs()
+        if not files:
+            return Text(self.get_text("no_scheduled_reports"), size=12, italic=True)
+
+        rows = []
+        for path in files:
+            icon, color = self.SCHEDULED_FILE_ICONS.get(
+                path.suffix, (Icons.INSERT_DRIVE_FILE, Colors.GREY)
+            )
+            rows.append(
+                Row(
+                    controls=[
+                        Icon(icon, color=color, size=20),
+                        Text(path.name, size=14, expand=True),
+                        IconButton(
+                            icon=Icons.OPEN_IN_NEW,
+                            icon_color=Constants.PRIMARY_COLOR,
+                            tooltip=self.get_text("open"),
+                            on_click=lambda e, path=path: asyncio.create_task(
+                                self.screen.open_scheduled_report(path)
+                            ),
+                        ),
+                    ],
+                    vertical_alignment=CrossAxisAlignment.CENTER,
+                )
+            )
+
+        return Column(
+            controls=[
+                ReportsComponents.create_section_header(
+                    title=f"{self.get_text('scheduled_reports')} · {day.isoformat()}",
+                    icon=Icons.SCHEDULE,
+                ),
+                *rows,
+            ],
+            spacing=5,
+        )
+
     # ========================================================================
     # REPORT CARDS GRID
     # ========================================================================
@@ -346,6 +591,16 @@ class ReportsTables:
                     on_generate=lambda e: self.screen.show_report_section("users"),
                     get_text_func=self.get_text,
                 ),
+                ReportsComponents.create_report_card(
+                    title=self.get_text("financial_comparison"),
+                    description=self.get_text("compare_school_years"),
+                    icon=Icons.STACKED_LINE_CHART,
+                    color=Colors.DEEP_PURPLE,
+                    on_generate=lambda e: self.screen.show_report_section(
+                        "financial_comparison"
+                    ),
+                    get_text_func=self.get_text,
+                ),
             ],
             spacing=15,
         )
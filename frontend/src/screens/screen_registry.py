@@ -0,0 +1,87 @@
+"""
+Screen Registry
+===============
+Construction paresseuse des écrans principaux avec éviction LRU.
+
+Chaque écran est enregistré sous la forme d'une fabrique et n'est construit
+qu'à sa première navigation. Au plus `max_alive` écrans restent en mémoire ;
+l'écran le moins récemment utilisé est libéré au-delà.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable
+
+
+class ScreenRegistry:
+    """Registre de fabriques d'écrans avec cache LRU"""
+
+    # Suffixes des attributs contenant les données chargées par un écran
+    DATA_ATTRIBUTE_SUFFIXES = ("_data", "_list", "_students", "_payments")
+
+    def __init__(self, max_alive: int = 3, pinned: Iterable[str] = ()) -> None:
+        self.max_alive = max(1, max_alive)
+        self.pinned = set(pinned)
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._alive: "OrderedDict[str, Any]" = OrderedDict()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Enregistrer la fabrique d'un écran"""
+        self._factories[name] = factory
+
+    def is_alive(self, name: str) -> bool:
+        return name in self._alive
+
+    @property
+    def alive_names(self) -> list[str]:
+        return list(self._alive.keys())
+
+    @property
+    def alive_screens(self) -> list[Any]:
+        """Écrans construits, sans modifier l'ordre LRU"""
+        return list(self._alive.values())
+
+    def get(self, name: str) -> Any:
+        """Retourner l'écran (construit à la première demande)"""
+        if name in self._alive:
+            self._alive.move_to_end(name)
+            return self._alive[name]
+
+        if name not in self._factories:
+            raise KeyError(f"Écran inconnu : {name}")
+
+        screen = self._factories[name]()
+        self._alive[name] = screen
+        self._evict_overflow()
+        return screen
+
+    def evict(self, name: str) -> None:
+        """Libérer un écran et ses données"""
+        screen = self._alive.pop(name, None)
+        if screen is not None:
+            self.release(screen)
+
+    def clear(self) -> None:
+        """Libérer tous les écrans (changement de langue, déconnexion)"""
+        for name in list(self._alive.keys()):
+            self.evict(name)
+
+    def _evict_overflow(self) -> None:
+        while len(self._alive) > self.max_alive:
+            candidate = next(
+                (name for name in self._alive if name not in self.pinned), None
+            )
+            if candidate is None:
+                return
+            self.evict(candidate)
+
+    @classmethod
+    def release(cls, screen: Any) -> None:
+        """Vider les listes de données d'un écran pour libérer la mémoire"""
+        if hasattr(screen, "release"):
+            screen.release()
+            return
+        for attribute, value in list(vars(screen).items()):
+            if isinstance(value, list) and attribute.endswith(
+                cls.DATA_ATTRIBUTE_SUFFIXES
+            ):
+                setattr(screen, attribute, [])
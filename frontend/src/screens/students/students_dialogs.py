@@ -2,6 +2,7 @@ from flet import *
 from core import Constants
 from models import StudentModel
 from .students_components import StudentsComponents
+from .students_import import StudentImport
 import asyncio
 
 
@@ -336,6 +337,20 @@ class StudentsDialogs:
             margin=Margin(top=10, bottom=10),
         )
 
+        # Reading / import progress (hidden until a file is selected)
+        self.screen.import_progress_bar = ProgressBar(
+            value=0,
+            color=Constants.PRIMARY_COLOR,
+            bgcolor=Colors.GREY_200,
+            visible=False,
+        )
+        self.screen.import_progress_text = Text(
+            value="", size=12, color=Colors.GREY_600, visible=False
+        )
+        self.screen.import_errors_text = Text(
+            value="", size=12, color=Colors.RED_700, visible=False
+        )
+
         # Classroom dropdown for import
         self.screen.import_classroom_dropdown = Dropdown(
             label=self.screen.get_text("select_classroom_for_import"),
@@ -394,7 +409,10 @@ class StudentsDialogs:
                             vertical_alignment=CrossAxisAlignment.CENTER,
                             spacing=10,
                         ),
+                        self.screen.import_progress_bar,
+                        self.screen.import_progress_text,
                         self.screen.import_file_details_container,
+                        self.screen.import_errors_text,
                         self.screen.import_classroom_dropdown,
                     ],
                     spacing=15,
@@ -410,7 +428,7 @@ class StudentsDialogs:
             actions=[
                 Button(
                     content=Text(self.screen.get_text("cancel")),
-                    on_click=self.close_import_dialog,
+                    on_click=self.cancel_import,
                     style=ButtonStyle(
                         shape=RoundedRectangleBorder(radius=5),
                         bgcolor=Constants.CANCEL_COLOR,
@@ -423,8 +441,8 @@ class StudentsDialogs:
             actions_alignment=MainAxisAlignment.END,
         )
 
-        # Store for parsed data
-        self.screen.parsed_students = []
+        # Import of the selected file (read again chunk by chunk on import)
+        self.screen.student_import = None
         self.screen.import_file_path = None
 
     def create_detail_stat(
@@ -482,158 +500,105 @@ class StudentsDialogs:
         on_file_picked(result)
 
     async def parse_import_file(self, file_path: str):
-        """Parse CSV or Excel file and extract student data"""
-        import os
+        """Read the file in a worker thread to count and validate its students"""
+        if self.screen.student_import is not None:
+            # Another file was selected while the previous one was being read
+            self.screen.student_import.cancel()
+        student_import = StudentImport(file_path)
+        self.screen.student_import = student_import
+
+        self.screen.import_file_details_container.visible = False
+        self.screen.import_errors_text.visible = False
+        self.screen.import_confirm_button.disabled = True
+        self.show_import_progress(student_import, "processing_file")
 
         try:
-            file_extension = os.path.splitext(file_path)[1].lower()
-
-            if file_extension == ".csv":
-                students = await self.parse_csv_file(file_path)
-            elif file_extension in [".xlsx", ".xls"]:
-                students = await self.parse_excel_file(file_path)
-            else:
-                self.screen.show_error_snackbar(
-                    self.screen.get_text("invalid_file_format")
-                )
+            if not await student_import.scan(
+                lambda progress: self.show_import_progress(progress, "processing_file")
+            ):
                 return
-
-            if students:
-                self.screen.parsed_students = students
-
-                # Calculate statistics
-                male_count = sum(
-                    1 for s in students if s.gender.upper().startswith("M")
-                )
-                female_count = sum(
-                    1 for s in students if s.gender.upper().startswith("F")
-                )
-                total_count = len(students)
-
-                # Update UI
-                self.screen.import_male_count_text.value = str(male_count)
-                self.screen.import_female_count_text.value = str(female_count)
-                self.screen.import_total_count_text.value = str(total_count)
-                self.screen.import_file_details_container.visible = True
-                self.screen.import_confirm_button.disabled = False
-
-                # Update classroom dropdown
-                self.populate_import_classroom_dropdown()
-
-                try:
-                    self.screen.import_male_count_text.update()
-                    self.screen.import_female_count_text.update()
-                    self.screen.import_total_count_text.update()
-                    self.screen.import_file_details_container.update()
-                    self.screen.import_confirm_button.update()
-                    self.screen.import_classroom_dropdown.update()
-                except:
-                    pass
-            else:
-                self.screen.show_error_snackbar(
-                    self.screen.get_text("file_format_error")
-                )
-
         except Exception as ex:
             print(f"Error parsing file: {ex}")
+            if self.screen.student_import is not student_import:
+                return
+            self.screen.student_import = None
+            self.hide_import_progress()
             self.screen.show_error_snackbar(
-                f"{self.screen.get_text('import_error')}: {str(ex)}"
+                f"{self.screen.get_text('import_error')}: {self.screen.get_text(str(ex))}"
             )
+            return
 
-    async def parse_csv_file(self, file_path: str) -> list:
-        """Parse CSV file and return list of StudentModel objects"""
-        import csv
+        self.hide_import_progress()
+        self.show_import_errors(student_import)
+        if not student_import.valid_count:
+            self.screen.show_error_snackbar(self.screen.get_text("file_format_error"))
+            return
+
+        # Update UI
+        self.screen.import_male_count_text.value = str(student_import.male_count)
+        self.screen.import_female_count_text.value = str(student_import.female_count)
+        self.screen.import_total_count_text.value = str(student_import.valid_count)
+        self.screen.import_file_details_container.visible = True
+        self.screen.import_confirm_button.disabled = False
 
-        students = []
+        # Update classroom dropdown
+        self.populate_import_classroom_dropdown()
 
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-
-                for row in reader:
-                    try:
-                        student = StudentModel(
-                            id_student=0,  # Will be assigned by database
-                            first_name=row.get("first_name", "").strip(),
-                            last_name=row.get("last_name", "").strip(),
-                            surname=row.get("surname", "").strip(),
-                            gender=row.get("gender", "M").strip().upper(),
-                            date_of_birth=row.get(
-                                "date_of_birth", "01-01-2000"
-                            ).strip(),
-                            address=row.get("address", "").strip(),
-                            parent_contact=row.get("parent_contact", "").strip(),
-                        )
-                        students.append(student)
-                    except Exception as e:
-                        print(f"Error parsing row: {e}")
-                        continue
-        except Exception as e:
-            print(f"Error reading CSV file: {e}")
-            raise
-
-        return students
-
-    async def parse_excel_file(self, file_path: str) -> list:
-        """Parse Excel file and return list of StudentModel objects"""
+            self.screen.import_file_details_container.update()
+            self.screen.import_confirm_button.update()
+            self.screen.import_classroom_dropdown.update()
+        except:
+            pass
+
+    def show_import_progress(self, student_import: StudentImport, label_key: str):
+        """Move the progress bar of the import dialog (called after each chunk)"""
+        self.screen.import_progress_bar.value = student_import.progress
+        self.screen.import_progress_bar.visible = True
+        count = (
+            student_import.imported_count
+            if label_key == "importing_students"
+            else student_import.rows_read
+        )
+        self.screen.import_progress_text.value = (
+            f"{self.screen.get_text(label_key)} {count} "
+            f"({student_import.progress:.0%})"
+        )
+        self.screen.import_progress_text.visible = True
         try:
-            import openpyxl
-        except ImportError:
-            self.screen.show_error_snackbar(
-                "openpyxl library not installed. Please install it to import Excel files."
-            )
-            return []
-
-        students = []
-
+            self.screen.import_progress_bar.update()
+            self.screen.import_progress_text.update()
+        except:
+            pass
+
+    def hide_import_progress(self):
+        self.screen.import_progress_bar.visible = False
+        self.screen.import_progress_text.visible = False
         try:
-            workbook = openpyxl.load_workbook(file_path)
-            sheet = workbook.active
-
-            # Assume first row is header
-            headers = [cell.value for cell in sheet[1]]
-
-            # Find column indices
-            first_name_idx = (
-                headers.index("first_name") if "first_name" in headers else 0
+            self.screen.import_progress_bar.update()
+            self.screen.import_progress_text.update()
+        except:
+            pass
+
+    def show_import_errors(self, student_import: StudentImport):
+        """Summary of the rejected lines of the file (the first ones in detail)"""
+        if not student_import.error_count:
+            self.screen.import_errors_text.visible = False
+        else:
+            details = ", ".join(
+                f"{self.screen.get_text('line')} {line} ({self.screen.get_text(key)})"
+                for line, key in student_import.errors[:5]
             )
-            last_name_idx = headers.index("last_name") if "last_name" in headers else 1
-            surname_idx = headers.index("surname") if "surname" in headers else 2
-            gender_idx = headers.index("gender") if "gender" in headers else 3
-            date_of_birth_idx = (
-                headers.index("date_of_birth") if "date_of_birth" in headers else 4
+            more = "..." if student_import.error_count > 5 else ""
+            self.screen.import_errors_text.value = (
+                f"{student_import.error_count} {self.screen.get_text('rejected_lines')}"
+                f" : {details}{more}"
             )
-            address_idx = headers.index("address") if "address" in headers else 5
-            parent_contact_idx = (
-                headers.index("parent_contact") if "parent_contact" in headers else 6
-            )
-
-            # Read rows (skip header)
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                try:
-                    student = StudentModel(
-                        id_student=0,  # Will be assigned by database
-                        first_name=str(row[first_name_idx] or "").strip(),
-                        last_name=str(row[last_name_idx] or "").strip(),
-                        surname=str(row[surname_idx] or "").strip(),
-                        gender=str(row[gender_idx] or "M").strip().upper(),
-                        date_of_birth=str(
-                            row[date_of_birth_idx] or "01-01-2000"
-                        ).strip(),
-                        address=str(row[address_idx] or "").strip(),
-                        parent_contact=str(row[parent_contact_idx] or "").strip(),
-                    )
-                    students.append(student)
-                except Exception as e:
-                    print(f"Error parsing row: {e}")
-                    continue
-
-            workbook.close()
-        except Exception as e:
-            print(f"Error reading Excel file: {e}")
-            raise
-
-        return students
+            self.screen.import_errors_text.visible = True
+        try:
+            self.screen.import_errors_text.update()
+        except:
+            pass
 
     def populate_import_classroom_dropdown(self):
         """Populate classroom dropdown for import"""
@@ -650,14 +615,19 @@ class StudentsDialogs:
         """Open the import dialog"""
         # Reset dialog state
         self.screen.import_file_path = None
-        self.screen.parsed_students = []
+        self.screen.student_import = None
         self.screen.import_file_path_text.value = self.screen.get_text(
             "no_file_selected"
         )
         self.screen.import_file_path_text.italic = True
         self.screen.import_file_path_text.color = Colors.GREY_600
         self.screen.import_file_details_container.visible = False
+        self.screen.import_progress_bar.visible = False
+        self.screen.import_progress_text.visible = False
+        self.screen.import_errors_text.visible = False
+        self.screen.import_file_picker_button.disabled = False
         self.screen.import_confirm_button.disabled = True
+        self.screen.import_confirm_button.content = Text(self.screen.get_text("import"))
 
         # Populate classroom dropdown
         self.populate_import_classroom_dropdown()
@@ -671,9 +641,16 @@ class StudentsDialogs:
         self.screen.import_dialog.open = False
         self.screen.page.update()
 
+    def cancel_import(self, e=None):
+        """Stop the reading or the import in progress and close the dialog"""
+        if self.screen.student_import is not None:
+            self.screen.student_import.cancel()
+        self.close_import_dialog()
+
     async def confirm_import(self, e):
-        """Confirm and execute import"""
-        if not self.screen.parsed_students:
+        """Import the selected file chunk by chunk"""
+        student_import = self.screen.student_import
+        if student_import is None or not student_import.valid_count:
             self.screen.show_error_snackbar(self.screen.get_text("no_file_selected"))
             return
 
@@ -681,46 +658,67 @@ class StudentsDialogs:
             self.screen.show_error_snackbar(self.screen.get_text("classroom_required"))
             return
 
-        try:
-            classroom_id = int(self.screen.import_classroom_dropdown.value)
+        classroom_id = int(self.screen.import_classroom_dropdown.value)
 
-            # Disable button and show processing
-            self.screen.import_confirm_button.disabled = True
-            self.screen.import_confirm_button.content = Text(
-                self.screen.get_text("processing_file")
-            )
+        # Disable buttons and show processing
+        self.screen.import_confirm_button.disabled = True
+        self.screen.import_confirm_button.content = Text(
+            self.screen.get_text("importing_students")
+        )
+        self.screen.import_file_picker_button.disabled = True
+        try:
             self.screen.import_confirm_button.update()
+            self.screen.import_file_picker_button.update()
+        except:
+            pass
+        self.show_import_progress(student_import, "importing_students")
 
-            # Call service to import
-            success, imported_count = await self.screen.services.import_students(
-                self.screen.parsed_students, classroom_id
+        try:
+            # Each chunk goes through the bulk insert of the services
+            completed = await student_import.run(
+                lambda students: self.screen.services.import_students(
+                    students, classroom_id
+                ),
+                lambda progress: self.show_import_progress(
+                    progress, "importing_students"
+                ),
             )
-
-            if success:
-                self.close_import_dialog()
-                # self.screen.show_success_snackbar(
-                #     f"{imported_count} {self.screen.get_text('students_imported')}"
-                # )
-                # Reload data
-                await self.screen.load_data()
-            else:
-                self.screen.show_error_snackbar(self.screen.get_text("import_error"))
-                self.screen.import_confirm_button.disabled = False
-                self.screen.import_confirm_button.content = Text(
-                    self.screen.get_text("import")
-                )
-                self.screen.import_confirm_button.update()
-
         except Exception as ex:
             print(f"Error during import: {ex}")
-            # self.screen.show_error_snackbar(
-            #     f"{self.screen.get_text('import_error')}: {str(ex)}"
-            # )
-            self.screen.import_confirm_button.disabled = False
+            completed = False
+
+        imported = student_import.imported_count
+        if completed:
+            self.close_import_dialog()
+            self.screen.show_success_snackbar(
+                f"{imported} {self.screen.get_text('students_imported')}"
+            )
+        elif student_import.cancelled:
+            self.screen.show_error_snackbar(
+                f"{self.screen.get_text('import_cancelled')} : "
+                f"{imported} {self.screen.get_text('students_imported')}"
+            )
+        else:
+            self.screen.show_error_snackbar(
+                f"{self.screen.get_text('import_error')} : "
+                f"{imported} {self.screen.get_text('students_imported')}"
+            )
+            self.hide_import_progress()
+            # Importing again would duplicate the chunks already inserted
+            self.screen.import_confirm_button.disabled = imported > 0
             self.screen.import_confirm_button.content = Text(
                 self.screen.get_text("import")
             )
-            self.screen.import_confirm_button.update()
+            self.screen.import_file_picker_button.disabled = False
+            try:
+                self.screen.import_confirm_button.update()
+                self.screen.import_file_picker_button.update()
+            except:
+                pass
+
+        if imported:
+            # Reload data
+            await self.screen.load_data()
 
     def open_edit_dialog(self, student: StudentModel):
         """Open edit dialog and populate with student data"""
@@ -121,27 +121,13 @@ class StudentsFormHandlers:
                 print("API call to update student failed")
             else:
                 print("Student updated successfully")
-
-            # For now, update locally
-            for i, student in enumerate(self.screen.students_data):
-                if student.id_student == self.screen.current_editing_student_id:
-                    self.screen.students_data[i] = updated_student
-                    break
-
-            # Update enrollment if classroom changed
-            selected_classroom_id = int(self.screen.edit_classroom_dropdown.value)
-            for enrollment in self.screen.enrollments_data:
-                if enrollment.student_id == self.screen.current_editing_student_id:
-                    enrollment.classroom_id = selected_classroom_id
-                    break
+                # The shared lists and their indexes are rebuilt from the
+                # database; subscribed screens (this one included) re-render
+                await self.screen.services.reload_students()
 
             # Close dialog
             self.screen.dialogs.close_edit_dialog()
 
-            # Refresh the table
-            self.screen.tables.apply_filters()
-            self.screen.tables.update_table()
-
         except Exception as ex:
             print(f"Error updating student: {ex}")
             # self.screen.page.show_snack_bar(
@@ -0,0 +1,301 @@
+"""
+Students Import Module
+Streaming import of a CSV or Excel students file, chunk by chunk
+"""
+
+import asyncio
+import csv
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core import Config
+from models import StudentModel
+
+# Columns of an import file, in the order used when the file has no header
+IMPORT_FIELDS = (
+    "first_name",
+    "last_name",
+    "surname",
+    "gender",
+    "date_of_birth",
+    "address",
+    "parent_contact",
+)
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d")
+DEFAULT_DATE_OF_BIRTH = "2000-01-01"
+
+# (line of the file, translation key of the error)
+RejectedLine = Tuple[int, str]
+ImportProgress = Callable[["StudentImport"], None]
+
+
+class ImportCancelled(Exception):
+    """The import was cancelled while a chunk was being read"""
+
+
+class ImportChunk:
+    """Valid students of a chunk, its rejected lines and the reading progress"""
+
+    def __init__(
+        self,
+        students: List[StudentModel],
+        errors: List[RejectedLine],
+        rows_read: int,
+        progress: float,
+    ) -> None:
+        self.students = students
+        self.errors = errors
+        self.rows_read = rows_read
+        self.progress = progress
+
+
+def _normalize_header(name: Any) -> str:
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def _text(row: Dict[str, Any], field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def parse_date_of_birth(value: Any) -> str:
+    """ISO date of a cell (date, or text in one of DATE_FORMATS)"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = "" if value is None else str(value).strip()
+    if not text:
+        return DEFAULT_DATE_OF_BIRTH
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError("import_invalid_date")
+
+
+def parse_student_row(row: Dict[str, Any]) -> StudentModel:
+    """Validate one row of an import file (ValueError with a translation key)"""
+    first_name = _text(row, "first_name")
+    last_name = _text(row, "last_name")
+    if not first_name or not last_name:
+        raise ValueError("import_missing_name")
+
+    gender = _text(row, "gender").upper() or "M"
+    if gender[0] not in ("M", "F"):
+        raise ValueError("import_invalid_gender")
+
+    return StudentModel(
+        id_student=0,  # Will be assigned by database
+        first_name=first_name,
+        last_name=last_name,
+        surname=_text(row, "surname"),
+        gender=gender[0],
+        date_of_birth=parse_date_of_birth(row.get("date_of_birth")),
+        address=_text(row, "address"),
+        parent_contact=_text(row, "parent_contact"),
+    )
+
+
+def _csv_rows(file_path: str) -> Iterator[Tuple[int, Dict[str, Any], float]]:
+    """(line, row, progress) of a CSV file, read as a stream"""
+    size = os.path.getsize(file_path) or 1
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as file:
+        # "," or ";" (Excel with a French locale saves with ";")
+        sample = file.read(4096)
+        file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(file, dialect=dialect)
+        reader.fieldnames = [
+            _normalize_header(name) for name in (reader.fieldnames or [])
+        ]
+        for row in reader:
+            # The position of the binary buffer is still known while iterating
+            yield reader.line_num, row, min(file.buffer.tell() / size, 1.0)
+
+
+def _excel_rows(file_path: str) -> Iterator[Tuple[int, Dict[str, Any], float]]:
+    """(line, row, progress) of the active sheet of an Excel workbook"""
+    try:
+        import openpyxl
+    except ImportError:
+        raise RuntimeError(
+            "openpyxl library not installed. Please install it to import Excel files."
+        ) from None
+
+    # read_only: rows are loaded while they are read, not the whole sheet
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        headers = [_normalize_header(cell) for cell in next(rows, ())]
+        if not set(headers) & set(IMPORT_FIELDS):
+            # No header names: columns in the order of IMPORT_FIELDS
+            headers = list(IMPORT_FIELDS)
+        total = max(sheet.max_row or 1, 1)
+        for line, values in enumerate(rows, start=2):
+            yield line, dict(zip(headers, values)), min(line / total, 1.0)
+    finally:
+        workbook.close()
+
+
+def read_student_chunks(
+    file_path: str,
+    chunk_size: int = Config.STUDENT_IMPORT_CHUNK_SIZE,
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[ImportChunk]:
+    """Read and validate an import file, `chunk_size` rows at a time.
+
+    Blocking: meant to be advanced from a worker thread. Raises
+    ImportCancelled as soon as `cancel` is set.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        rows = _csv_rows(file_path)
+    elif extension in (".xlsx", ".xls"):
+        rows = _excel_rows(file_path)
+    else:
+        raise ValueError("invalid_file_format")
+
+    chunk_size = max(1, chunk_size)
+    students: List[StudentModel] = []
+    errors: List[RejectedLine] = []
+    rows_read = 0
+    try:
+        for line, row, progress in rows:
+            if cancel is not None and cancel.is_set():
+                raise ImportCancelled()
+            if not any(_text(row, field) for field in IMPORT_FIELDS):
+                continue  # Empty line
+            rows_read += 1
+            try:
+                students.append(parse_student_row(row))
+            except ValueError as e:
+                errors.append((line, str(e)))
+            if rows_read % chunk_size == 0:
+                yield ImportChunk(students, errors, rows_read, progress)
+                students, errors = [], []
+    finally:
+        rows.close()
+    yield ImportChunk(students, errors, rows_read, 1.0)
+
+
+class StudentImport:
+    """Import of one students file, in two streamed passes.
+
+    `scan` reads the whole file to count the students and collect the
+    rejected lines; `run` reads it again and hands each chunk of valid
+    students to `insert` (the bulk insert of the services) before the
+    next chunk is read. Chunks are read and validated in a worker thread,
+    so neither the file nor the list of students is ever held in memory
+    and the event loop stays free for the progress bar.
+
+    `cancel()` stops at the next row read. Each chunk is committed on its
+    own: the chunks inserted before a cancellation stay imported.
+    """
+
+    def __init__(
+        self, file_path: str, chunk_size: int = Config.STUDENT_IMPORT_CHUNK_SIZE
+    ) -> None:
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.progress = 0.0
+        self.rows_read = 0
+        self.valid_count = 0
+        self.male_count = 0
+        self.female_count = 0
+        self.error_count = 0
+        self.errors: List[RejectedLine] = []
+        self.imported_count = 0
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    async def _read(self, on_chunk: Callable[[ImportChunk], Awaitable[bool]]) -> bool:
+        """Pass every chunk to `on_chunk` (False stops); False when cancelled"""
+        self.progress = 0.0
+        chunks = read_student_chunks(self.file_path, self.chunk_size, self._cancel)
+        reading = False
+        try:
+            while not self.cancelled:
+                reading = True
+                chunk = await asyncio.to_thread(next, chunks, None)
+                reading = False
+                if chunk is None:
+                    return True
+                self.rows_read = chunk.rows_read
+                self.progress = chunk.progress
+                if not await on_chunk(chunk):
+                    return True
+            return False
+        except ImportCancelled:
+            reading = False
+            return False
+        except asyncio.CancelledError:
+            # The worker thread may still be reading: it stops at the next row
+            self.cancel()
+            raise
+        finally:
+            if not reading:
+                chunks.close()
+
+    async def scan(self, on_progress: Optional[ImportProgress] = None) -> bool:
+        """Count the valid students of the file (False when cancelled)"""
+        self.valid_count = self.male_count = self.female_count = 0
+        self.error_count = 0
+        self.errors = []
+
+        async def count(chunk: ImportChunk) -> bool:
+            self.valid_count += len(chunk.students)
+            for student in chunk.students:
+                if student.gender == "M":
+                    self.male_count += 1
+                else:
+                    self.female_count += 1
+            self.error_count += len(chunk.errors)
+            room = Config.STUDENT_IMPORT_MAX_ERRORS - len(self.errors)
+            self.errors.extend(chunk.errors[: max(room, 0)])
+            if on_progress is not None:
+                on_progress(self)
+            return True
+
+        return await self._read(count)
+
+    async def run(
+        self,
+        insert: Callable[[List[StudentModel]], Awaitable[Tuple[bool, int]]],
+        on_progress: Optional[ImportProgress] = None,
+    ) -> bool:
+        """Insert the valid students chunk by chunk.
+
+        Returns False when cancelled or when a chunk could not be inserted;
+        `imported_count` holds the students inserted until then.
+        """
+        self.imported_count = 0
+        failed = False
+
+        async def insert_chunk(chunk: ImportChunk) -> bool:
+            nonlocal failed
+            if chunk.students:
+                success, count = await insert(chunk.students)
+                if not success:
+                    failed = True
+                    return False
+                self.imported_count += count
+            if on_progress is not None:
+                on_progress(self)
+            return True
+
+        completed = await self._read(insert_chunk)
+        return completed and not failed
@@ -1,5 +1,5 @@
 from flet import *
-from core import AppState, Constants
+from core import AppState, Constants, DataStore
 from utils import Utils
 import asyncio
 from .students_services import StudentsServices
@@ -43,14 +43,32 @@ class StudentsScreen:
         self.dialogs.build_delete_dialog()
         self.dialogs.build_import_dialog()
 
+        # Follow changes made to the shared collections by other screens
+        self.app_state.store.subscribe(DataStore.STUDENTS, self.on_store_change)
+        self.app_state.store.subscribe(DataStore.ENROLLMENTS, self.on_store_change)
+
     async def on_mount(self):
         self.translations = self.app_state.translations
         await self.load_data()
 
     def refresh_students_data(self, e):
+        self.app_state.store.invalidate()
         self.main_content.content = self.loading_indicator
         self.main_content.update()
-        asyncio.create_task(self.load_data())
+        self.app_state.loader.load("students", self.load_data)
+
+    def on_store_change(self, collection: str, values: list):
+        """Re-render the table with a reloaded shared collection"""
+        if collection == DataStore.STUDENTS:
+            self.students_data = values
+        else:
+            self.enrollments_data = values
+        self.tables.apply_filters()
+        self.tables.update_table()
+
+    def on_language_change(self):
+        """Rebuild the pagination label, composed with translated text"""
+        self.tables.update_table()
 
     def get_text(self, key: str) -> str:
         return self.app_state.translations.get(key, key)
@@ -62,10 +80,15 @@ class StudentsScreen:
         self.classroom_form.options = options
 
     async def load_data(self):
-        students_status, students_data = await self.services.load_students_data()
-        classrooms_status, classrooms_data = await self.services.load_classrooms_data()
-        enrollments_status, enrollments_data = (
-            await self.services.load_enrollments_data()
+        # Load data in parallel
+        (
+            (students_status, students_data),
+            (classrooms_status, classrooms_data),
+            (enrollments_status, enrollments_data),
+        ) = await self.app_state.loader.gather(
+            self.services.load_students_data(),
+            self.services.load_classrooms_data(),
+            self.services.load_enrollments_data(),
         )
 
         # Store data
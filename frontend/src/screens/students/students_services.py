@@ -1,5 +1,5 @@
 import asyncio
-from core import AppState
+from core import AppState, DataStore
 
 
 class StudentsServices:
@@ -8,7 +8,7 @@ class StudentsServices:
 
     async def load_students_data(self):
         # await asyncio.sleep(2)  # Simulate network delay
-        return (True, await self.app_state.api_client.list_students())
+        return (True, await self.app_state.store.get_students())
 
     async def load_students_per_classroom_data(self):
         # await asyncio.sleep(2)  # Simulate network delay
@@ -16,28 +16,57 @@ class StudentsServices:
 
     async def load_classrooms_data(self):
         # await asyncio.sleep(2)  # Simulate network delay
-        return (True, await self.app_state.api_client.list_classrooms())
+        return (True, await self.app_state.store.get_classrooms())
 
-    async def load_enrollments_data(self):
+    async def load_enrollments_data(self, school_year_id: int | None = None):
         # await asyncio.sleep(2)  # Simulate network delay
-        return (True, await self.app_state.api_client.list_enrollments())
+        return (True, await self.app_state.store.get_enrollments(school_year_id))
 
     async def update_student(self, student, classroom_id: int) -> bool:
         """Update a student"""
         # await asyncio.sleep(1)  # Simulate network delay
-        return await self.app_state.api_client.update_student(student, classroom_id)
+        success = await self.app_state.api_client.update_student(student, classroom_id)
+        if success:
+            self.invalidate_students()
+        return success
 
     async def delete_student(self, student_id: int) -> bool:
         """Delete a student"""
         # await asyncio.sleep(1)  # Simulate network delay
-        return await self.app_state.api_client.delete_student(student_id)
+        success = await self.app_state.api_client.delete_student(student_id)
+        if success:
+            self.invalidate_students()
+        return success
 
     async def import_students(self, students_list, classroom_id):
         """Import multiple students"""
         # await asyncio.sleep(1)  # Simulate network delay
-        return await self.app_state.api_client.import_students(
-            students_list, classroom_id
+        school_year_id = await self.app_state.get_active_school_year_id()
+        if school_year_id is None:
+            return False, 0
+        success, imported_count = await self.app_state.api_client.import_students(
+            students_list, classroom_id, school_year_id=school_year_id
         )
+        if success:
+            self.invalidate_students()
+        return success, imported_count
 
     async def create_student(self, student, classroom_id: int):
-        return await self.app_state.api_client.create_student(student, classroom_id)
+        school_year_id = await self.app_state.get_active_school_year_id()
+        if school_year_id is None:
+            return False
+        response = await self.app_state.api_client.create_student(
+            student, classroom_id, school_year_id=school_year_id
+        )
+        if response:
+            self.invalidate_students()
+        return response
+
+    def invalidate_students(self):
+        """Students and enrollments changed: reload them on next access"""
+        self.app_state.store.invalidate(DataStore.STUDENTS, DataStore.ENROLLMENTS)
+
+    async def reload_students(self):
+        """Reload students and enrollments shared through the store"""
+        await self.app_state.store.get_students(force=True)
+        await self.app_state.store.get_enrollments(force=True)
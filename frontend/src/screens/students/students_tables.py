@@ -1,12 +1,16 @@
 from flet import *
-from core import Constants
+from core import Config, Constants
+from utils import Debouncer
 from models import StudentModel
 from .students_components import StudentsComponents
+from ..virtual_table import TableAction, TableColumn, VirtualTable
 
 
 class StudentsTables:
     def __init__(self, students_screen):
         self.screen = students_screen
+        # Searches wait for a pause in typing and only render the latest result
+        self.search_debouncer = Debouncer(Config.SEARCH_DEBOUNCE_DELAY)
 
     def build_table_components(self):
         """Build the students table and pagination components"""
@@ -111,140 +115,82 @@ class StudentsTables:
             **StudentsComponents.get_box_style(),
         )
 
+        # Header and row controls are built once, rows are rebound to each page
+        self.screen.students_table = VirtualTable(
+            columns=[
+                TableColumn(self.screen.get_text("full_name"), self.get_full_name, 3),
+                TableColumn(self.screen.get_text("gender"), self.get_gender_text, 1),
+                TableColumn(
+                    self.screen.get_text("classroom"),
+                    lambda s: self.get_classroom_name(s.id_student),
+                    2,
+                ),
+                TableColumn(
+                    self.screen.get_text("year_of_birth"),
+                    lambda s: self.get_birth_year(s.date_of_birth),
+                    1,
+                ),
+            ],
+            actions=[
+                TableAction(
+                    icon=Icons.EDIT,
+                    tooltip=self.screen.get_text("edit"),
+                    on_click=lambda s: self.screen.dialogs.open_edit_dialog(s),
+                ),
+                TableAction(
+                    icon=Icons.DELETE,
+                    tooltip=self.screen.get_text("delete"),
+                    on_click=lambda s: self.screen.dialogs.open_delete_dialog(s),
+                    icon_color=Constants.CANCEL_COLOR,
+                ),
+            ],
+            actions_title=self.screen.get_text("actions"),
+            actions_expand=2,
+            on_row_click=lambda s: self.screen.dialogs.show_student_details_dialog(s),
+            empty_content=self.create_empty_message(),
+            divider=False,
+        )
+
         self.screen.students_table_container = Container(
-            content=Column(
-                controls=[],
-                scroll=ScrollMode.AUTO,
-            ),
+            content=self.screen.students_table.control,
             padding=Padding.all(10),
             **StudentsComponents.get_box_style(),
         )
 
-    def create_table_header(self):
-        """Create table header row"""
+    def create_empty_message(self):
+        """Message shown when no student matches the filters"""
         return Container(
-            content=Row(
+            content=Column(
                 controls=[
-                    Container(
-                        content=Text(
-                            self.screen.get_text("full_name"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=3,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.screen.get_text("gender"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.screen.get_text("classroom"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=2,
-                        padding=Padding.all(10),
+                    Icon(Icons.SEARCH_OFF, size=60, color=Colors.GREY_400),
+                    Text(
+                        self.screen.get_text("no_students_found"),
+                        size=18,
+                        weight=FontWeight.BOLD,
+                        color=Colors.GREY_600,
                     ),
-                    Container(
-                        content=Text(
-                            self.screen.get_text("year_of_birth"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(
-                            self.screen.get_text("actions"),
-                            weight=FontWeight.BOLD,
-                            color=Colors.WHITE,
-                        ),
-                        expand=2,
-                        padding=Padding.all(10),
+                    Text(
+                        self.screen.get_text("no_students_message"),
+                        size=14,
+                        color=Colors.GREY_500,
                     ),
                 ],
+                horizontal_alignment=CrossAxisAlignment.CENTER,
+                spacing=10,
             ),
-            bgcolor=Constants.PRIMARY_COLOR,
-            border_radius=BorderRadius.only(top_left=10, top_right=10),
+            padding=Padding.all(40),
+            alignment=Alignment(0, 0),
         )
 
-    def create_table_row(self, student: StudentModel, index):
-        """Create a table row for a student"""
-        full_name = f"{student.last_name} {student.surname} {student.first_name}"
-        gender_text = (
+    def get_full_name(self, student: StudentModel) -> str:
+        return f"{student.last_name} {student.surname} {student.first_name}"
+
+    def get_gender_text(self, student: StudentModel) -> str:
+        return (
             self.screen.get_text("male")
             if student.gender.lower().startswith("m")
             else self.screen.get_text("female")
         )
-        classroom_name = self.get_classroom_name(student.id_student)
-        birth_year = self.get_birth_year(student.date_of_birth)
-
-        row_color = "#f8faff" if index % 2 == 0 else "#ffffff"
-
-        return Container(
-            content=Row(
-                controls=[
-                    Container(
-                        content=Text(full_name, size=14),
-                        expand=3,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(gender_text, size=14),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(classroom_name, size=14),
-                        expand=2,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Text(birth_year, size=14),
-                        expand=1,
-                        padding=Padding.all(10),
-                    ),
-                    Container(
-                        content=Row(
-                            controls=[
-                                IconButton(
-                                    icon=Icons.EDIT,
-                                    icon_color=Constants.PRIMARY_COLOR,
-                                    tooltip=self.screen.get_text("edit"),
-                                    on_click=lambda e, s=student: self.screen.dialogs.open_edit_dialog(
-                                        s
-                                    ),
-                                ),
-                                IconButton(
-                                    icon=Icons.DELETE,
-                                    icon_color=Constants.CANCEL_COLOR,
-                                    tooltip=self.screen.get_text("delete"),
-                                    on_click=lambda e, s=student: self.screen.dialogs.open_delete_dialog(
-                                        s
-                                    ),
-                                ),
-                            ],
-                            spacing=5,
-                        ),
-                        expand=2,
-                        padding=Padding.all(5),
-                    ),
-                ],
-            ),
-            bgcolor=row_color,
-            on_click=lambda e, s=student: self.screen.dialogs.show_student_details_dialog(
-                s
-            ),
-            ink=True,
-        )
 
     def update_table(self):
         """Update the students table with current data"""
@@ -263,49 +209,12 @@ class StudentsTables:
         self.screen.prev_page_button.disabled = self.screen.current_page <= 1
         self.screen.next_page_button.disabled = self.screen.current_page >= total_pages
 
-        # Build table content
-        table_controls = [self.create_table_header()]
-
-        if not paginated_students:
-            # No students found message
-            table_controls.append(
-                Container(
-                    content=Column(
-                        controls=[
-                            Icon(Icons.SEARCH_OFF, size=60, color=Colors.GREY_400),
-                            Text(
-                                self.screen.get_text("no_students_found"),
-                                size=18,
-                                weight=FontWeight.BOLD,
-                                color=Colors.GREY_600,
-                            ),
-                            Text(
-                                self.screen.get_text("no_students_message"),
-                                size=14,
-                                color=Colors.GREY_500,
-                            ),
-                        ],
-                        horizontal_alignment=CrossAxisAlignment.CENTER,
-                        spacing=10,
-                    ),
-                    padding=Padding.all(40),
-                    alignment=Alignment(0, 0),
-                )
-            )
-        else:
-            # Add student rows
-            for index, student in enumerate(paginated_students):
-                table_controls.append(self.create_table_row(student, index))
-
-        self.screen.students_table_container.content = Column(
-            controls=table_controls,
-            scroll=ScrollMode.AUTO,
-            spacing=0,
-        )
+        # Rebind the recycled rows: only changed cells are sent to the client
+        self.screen.students_table.set_items(paginated_students)
 
         try:
             self.screen.search_and_pagination_container.update()
-            self.screen.students_table_container.update()
+            self.screen.students_table.control.update()
         except Exception as e:
             # print("Error updating table:", e)
             pass
@@ -313,8 +222,12 @@ class StudentsTables:
     def on_search_change(self, e):
         """Handle search field change"""
         self.screen.search_query = e.control.value
+        self.search_debouncer.call(self.filter_students, self.show_search_results)
+
+    def show_search_results(self, filtered_students: list[StudentModel]):
+        """Render the result of the latest search"""
+        self.screen.filtered_students = filtered_students
         self.screen.current_page = 1
-        self.apply_filters()
         self.update_table()
 
     def on_classroom_filter_change(self, e):
@@ -368,9 +281,12 @@ class StudentsTables:
 
     def apply_filters(self):
         """Apply search and filters to students data"""
+        self.screen.filtered_students = self.filter_students()
+
+    def filter_students(self) -> list[StudentModel]:
+        """Students matching the search and filters"""
         if not self.screen.students_data:
-            self.screen.filtered_students = []
-            return
+            return []
 
         query = self.screen.search_query.lower().strip()
 
@@ -393,11 +309,9 @@ class StudentsTables:
         if self.screen.selected_classroom_filter != "all":
             classroom_id = int(self.screen.selected_classroom_filter)
             # Get students enrolled in the selected classroom
-            enrolled_student_ids = [
-                enrollment.student_id
-                for enrollment in self.screen.enrollments_data
-                if enrollment.classroom_id == classroom_id
-            ]
+            enrolled_student_ids = (
+                self.screen.app_state.repository.get_classroom_student_ids(classroom_id)
+            )
             filtered = [
                 student
                 for student in filtered
@@ -413,7 +327,7 @@ class StudentsTables:
                 == self.screen.selected_gender_filter.lower()[0]
             ]
 
-        self.screen.filtered_students = filtered
+        return filtered
 
     def update_classroom_filter_options(self):
         """Update classroom filter dropdown options"""
@@ -433,12 +347,7 @@ class StudentsTables:
 
     def get_classroom_name(self, student_id) -> str:
         """Get classroom name for a student"""
-        for enrollment in self.screen.enrollments_data:
-            if enrollment.student_id == student_id:
-                for classroom in self.screen.classrooms_data:
-                    if classroom.id_classroom == enrollment.classroom_id:
-                        return classroom.name
-        return "N/A"
+        return self.screen.app_state.repository.classroom_name_for_student(student_id)
 
     def get_birth_year(self, date_of_birth: str) -> str:
         """Extract birth year from date string"""
@@ -0,0 +1,228 @@
+"""
+Virtual Table
+=============
+Tableau à lignes recyclées pour les listes paginées (élèves, paiements).
+
+L'en-tête et un réservoir (pool) de lignes sont construits une seule fois.
+À chaque filtre, changement de page ou frappe clavier, les lignes existantes
+sont simplement rattachées aux nouvelles données : seules les valeurs des
+cellules qui changent sont envoyées au client Flet. Les lignes sont rendues
+par un `ListView` à hauteur d'élément fixe (`item_extent`), ce qui permet au
+client de ne dessiner que les lignes visibles.
+"""
+
+from typing import Any, Callable, List, Optional, Sequence
+
+from flet import *  # type: ignore
+from core import Constants
+
+
+class TableColumn:
+    """Description d'une colonne : titre, largeur relative et valeur affichée"""
+
+    def __init__(
+        self,
+        title: str,
+        value: Callable[[Any], str],
+        expand: int = 1,
+        weight: Optional[FontWeight] = None,
+        color: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> None:
+        self.title = title
+        self.value = value
+        self.expand = expand
+        self.weight = weight
+        self.color = color
+
+
+class TableAction:
+    """Bouton d'action affiché dans la dernière colonne de chaque ligne"""
+
+    def __init__(
+        self,
+        icon: str,
+        tooltip: str,
+        on_click: Callable[[Any], None],
+        icon_color: str = Constants.PRIMARY_COLOR,
+    ) -> None:
+        self.icon = icon
+        self.tooltip = tooltip
+        self.on_click = on_click
+        self.icon_color = icon_color
+
+
+class _RowSlot:
+    """Ligne réutilisable : contrôles construits une fois, données rattachées"""
+
+    def __init__(self, container: Container, cells: List[Text]) -> None:
+        self.container = container
+        self.cells = cells
+        self.item: Any = None
+
+
+class VirtualTable:
+    """Tableau virtualisé construit sur un pool de lignes recyclées"""
+
+    def __init__(
+        self,
+        columns: Sequence[TableColumn],
+        actions: Sequence[TableAction] = (),
+        actions_title: str = "",
+        actions_expand: int = 1,
+        on_row_click: Optional[Callable[[Any], None]] = None,
+        empty_content: Optional[Control] = None,
+        row_height: int = 50,
+        max_visible_rows: int = 10,
+        row_colors: tuple[str, str] = ("#f8faff", "#ffffff"),
+        divider: bool = True,
+    ) -> None:
+        self.columns = list(columns)
+        self.actions = list(actions)
+        self.actions_title = actions_title
+        self.actions_expand = actions_expand
+        self.on_row_click = on_row_click
+        self.row_height = row_height
+        self.max_visible_rows = max(1, max_visible_rows)
+        self.row_colors = row_colors
+        self.divider = divider
+        self._pool: List[_RowSlot] = []
+
+        self.header = self._build_header()
+        self.list_view = ListView(
+            controls=[],
+            item_extent=row_height,
+            spacing=0,
+            height=0,
+        )
+        self.empty_content = empty_content or Container()
+        self.empty_content.visible = False
+        self.control = Column(
+            controls=[self.header, self.list_view, self.empty_content],
+            spacing=0,
+        )
+
+    # ------------------------------------------------------------------
+    # Construction (une seule fois)
+    def _build_header(self) -> Container:
+        cells = [
+            Container(
+                content=Text(column.title, weight=FontWeight.BOLD, color=Colors.WHITE),
+                expand=column.expand,
+                padding=Padding.all(10),
+            )
+            for column in self.columns
+        ]
+        if self.actions:
+            cells.append(
+                Container(
+                    content=Text(
+                        self.actions_title, weight=FontWeight.BOLD, color=Colors.WHITE
+                    ),
+                    expand=self.actions_expand,
+                    padding=Padding.all(10),
+                )
+            )
+        return Container(
+            content=Row(controls=cells, alignment=MainAxisAlignment.SPACE_BETWEEN),
+            bgcolor=Constants.PRIMARY_COLOR,
+            border_radius=BorderRadius.only(top_left=10, top_right=10),
+        )
+
+    def _build_slot(self, index: int) -> _RowSlot:
+        cells = [
+            Text("", size=14, weight=column.weight, no_wrap=True)
+            for column in self.columns
+        ]
+        controls: List[Control] = [
+            Container(content=cell, expand=column.expand, padding=Padding.all(10))
+            for cell, column in zip(cells, self.columns)
+        ]
+        if self.actions:
+            controls.append(
+                Container(
+                    content=Row(
+                        controls=[
+                            IconButton(
+                                icon=action.icon,
+                                icon_color=action.icon_color,
+                                tooltip=action.tooltip,
+                                on_click=lambda e, i=index, a=action: self._on_action(
+                                    i, a
+                                ),
+                            )
+                            for action in self.actions
+                        ],
+                        spacing=5,
+                    ),
+                    expand=self.actions_expand,
+                    padding=Padding.all(5),
+                )
+            )
+
+        container = Container(
+            content=Row(controls=controls, alignment=MainAxisAlignment.SPACE_BETWEEN),
+            height=self.row_height,
+            bgcolor=self.row_colors[index % 2],
+            border=(
+                Border(bottom=BorderSide(1, Colors.GREY_200)) if self.divider else None
+            ),
+            on_click=(
+                (lambda e, i=index: self._on_row_click(i))
+                if self.on_row_click
+                else None
+            ),
+            ink=self.on_row_click is not None,
+        )
+        return _RowSlot(container, cells)
+
+    def _ensure_pool(self, size: int) -> None:
+        """Agrandir le pool jusqu'à la plus grande page affichée"""
+        while len(self._pool) < size:
+            self._pool.append(self._build_slot(len(self._pool)))
+
+    # ------------------------------------------------------------------
+    # Liaison des données
+    def set_items(self, items: Sequence[Any]) -> None:
+        """Rattacher les lignes du pool aux éléments de la page courante"""
+        self._ensure_pool(len(items))
+        for slot, item in zip(self._pool, items):
+            self._bind(slot, item)
+        for slot in self._pool[len(items) :]:
+            slot.item = None
+
+        visible_slots = [slot.container for slot in self._pool[: len(items)]]
+        if [id(c) for c in self.list_view.controls] != [id(c) for c in visible_slots]:
+            self.list_view.controls = visible_slots
+        self.list_view.height = self.row_height * min(len(items), self.max_visible_rows)
+        self.list_view.visible = bool(items)
+        self.empty_content.visible = not items
+
+    def _bind(self, slot: _RowSlot, item: Any) -> None:
+        slot.item = item
+        for cell, column in zip(slot.cells, self.columns):
+            value = column.value(item)
+            if cell.value != value:
+                cell.value = value
+            if column.color is not None:
+                color = column.color(item)
+                if cell.color != color:
+                    cell.color = color
+
+    def update(self) -> None:
+        try:
+            self.control.update()
+        except Exception:
+            # Tableau pas encore ajouté à la page
+            pass
+
+    # ------------------------------------------------------------------
+    # Événements
+    def _on_row_click(self, index: int) -> None:
+        item = self._pool[index].item
+        if item is not None and self.on_row_click:
+            self.on_row_click(item)
+
+    def _on_action(self, index: int, action: TableAction) -> None:
+        item = self._pool[index].item
+        if item is not None:
+            action.on_click(item)
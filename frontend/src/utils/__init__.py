@@ -1,4 +1,5 @@
 from .storage_utils import StorageUtils
 from .utils import Utils
+from .debouncer import Debouncer
 
-__all__ = ["StorageUtils", "Utils"]
+__all__ = ["StorageUtils", "Utils", "Debouncer"]
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Callable, Optional
+
+
+class Debouncer:
+    """Debounced, cancellable search.
+
+    Every call cancels the pending task. After `delay` seconds without a new
+    keystroke, `query` runs in a worker thread (off the UI path) and `render`
+    receives its result on the event loop, only if no newer call arrived.
+    """
+
+    def __init__(self, delay: float = 0.3, run_in_thread: bool = True) -> None:
+        self.delay = delay
+        self.run_in_thread = run_in_thread
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def call(
+        self,
+        query: Callable[[], Any],
+        render: Callable[[Any], None],
+        delay: Optional[float] = None,
+    ) -> Optional[asyncio.Task]:
+        """Schedule `render(query())`, replacing any pending call"""
+        self.cancel()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): run immediately
+            render(query())
+            return None
+
+        self._task = asyncio.create_task(
+            self._run(query, render, self.delay if delay is None else delay)
+        )
+        return self._task
+
+    async def _run(
+        self, query: Callable[[], Any], render: Callable[[Any], None], delay: float
+    ) -> None:
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.run_in_thread:
+                result = await asyncio.to_thread(query)
+            else:
+                result = query()
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            print(f"Error during search: {e}")
+            return
+
+        # A newer keystroke may have replaced this task while the query ran
+        if self._task is not asyncio.current_task():
+            return
+        self._task = None
+        render(result)
@@ -1,5 +1,6 @@
 from src.data.api.fake_client import FakeApiClient
 import asyncio
+from datetime import datetime
 
 
 async def test_fake_api_client() -> None:
@@ -12,5 +13,40 @@ async def test_fake_api_client() -> None:
     await api.close()
 
 
+async def test_checkout_entries_month_bucket() -> None:
+    # Run with src on the path, like the application
+    from core import AppState
+    from screens.checkout.checkout_services import CheckoutServices
+
+    app_state = AppState()
+    app_state.current_user = (await app_state.api_client.list_users())[0]
+    services = CheckoutServices(app_state)
+    month = datetime.now().strftime("%Y-%m")
+
+    def months(rows):
+        return {row["month"]: row["entry_count"] for row in rows}
+
+    try:
+        sources = ("expense", "staff_payment")
+        before = months(
+            await app_state.api_client.get_financial_totals(
+                group_by=("month",), sources=sources
+            )
+        )
+        assert (await services.create_quick_expense("Test", 10.0))[0]
+        staff = (await app_state.api_client.list_staff())[0]
+        assert (await services.create_staff_payment(staff.id_staff, 10.0))[0]
+        after = months(
+            await app_state.api_client.get_financial_totals(
+                group_by=("month",), sources=sources
+            )
+        )
+        assert set(after) == set(before) | {month}, after
+        print(f"Checkout entries in {month}: {after[month] - before.get(month, 0)}")
+    finally:
+        await app_state.api_client.close()
+
+
 if __name__ == "__main__":
     asyncio.run(test_fake_api_client())
+    asyncio.run(test_checkout_entries_month_bucket())